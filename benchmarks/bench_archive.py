@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# benchmarks/bench_archive.py
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+# Allow running as `python benchmarks/bench_archive.py` from the repo root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.generate_data import generate_dataset
+from utils import archive, file_handler
+from utils.repository import Repository
+
+def timed(function, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def hot_load():
+    # What every task command pays: parsing the hot store into Task objects
+    return len(Repository().tasks)
+
+def main():
+    parser = argparse.ArgumentParser(description="Task loads before and after archiving closed tasks")
+    parser.add_argument("--tasks", type=int, default=100000, help="Dataset size in tasks")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement")
+    parser.add_argument("--seed", type=int, default=42, help="Dataset seed")
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp(prefix="pm-archive-")
+    try:
+        generate_dataset(data_dir, args.tasks, args.seed)
+        tasks_path = os.path.join(data_dir, 'tasks.json')
+        # The parse cache would hide the cost of a big file, so measure without it
+        with patch('utils.file_handler.DATA_DIR', data_dir), patch('utils.file_handler.CACHE_ENABLED', False):
+            before_size = os.path.getsize(tasks_path)
+            before, count = timed(hot_load, args.repeat)
+
+            # Generated tasks have no close events, so every closed one counts as old
+            start = time.perf_counter()
+            with file_handler.data_lock():
+                archived, remaining = archive.archive_tasks(archive.DEFAULT_DAYS)
+            archive_time = time.perf_counter() - start
+
+            after_size = os.path.getsize(tasks_path)
+            after, _ = timed(hot_load, args.repeat)
+            cold_size = os.path.getsize(os.path.join(data_dir, file_handler.ARCHIVE_FILE))
+            stream_time, streamed = timed(lambda: sum(1 for _ in archive.iter_archived()), args.repeat)
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    print(f"{count} tasks: archived {archived} closed tasks in {archive_time * 1000:.1f} ms, {remaining} stay hot")
+    print(f"{'':<16} {'tasks.json MB':>14} {'load ms':>9}")
+    print(f"{'before':<16} {before_size / 1e6:>14.2f} {before * 1000:>9.1f}")
+    print(f"{'after':<16} {after_size / 1e6:>14.2f} {after * 1000:>9.1f}   {before / after:.1f}x faster")
+    print(f"archive: {cold_size / 1e6:.2f} MB gzip, {streamed} tasks streamed in {stream_time * 1000:.1f} ms "
+          f"(--include-archived)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# benchmarks/bench_compression.py
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+# Allow running as `python benchmarks/bench_compression.py` from the repo root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.generate_data import generate_dataset
+from utils import file_handler
+
+# (label, compression, gzip level, zstd level)
+CONFIGURATIONS = [
+    ("plain", 'none', None, None),
+    ("gzip -1", 'gzip', 1, None),
+    ("gzip -6", 'gzip', 6, None),
+    ("zstd -1", 'zstd', None, 1),
+    ("zstd -3", 'zstd', None, 3),
+]
+# Sequential throughput, MB/s: network volume, HDD, SATA SSD, NVMe
+DISK_SPEEDS = [20, 100, 500, 2000]
+
+def timed(function, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def measure(records, compression, gzip_level, zstd_level, repeat):
+    # CPU cost of writing and reading tasks.json in one format, with the file in the
+    # page cache so no time goes to the disk itself
+    with patch('utils.file_handler.GZIP_LEVEL', gzip_level or file_handler.GZIP_LEVEL), \
+            patch('utils.file_handler.ZSTD_LEVEL', zstd_level or file_handler.ZSTD_LEVEL), \
+            patch('utils.file_handler.CACHE_ENABLED', False):
+        write_time = timed(lambda: file_handler._write_records('tasks.json', records, True, compression), repeat)
+        read_time = timed(lambda: file_handler._read_records_checked('tasks.json'), repeat)
+    size = os.path.getsize(os.path.join(file_handler.data_dir(), 'tasks.json'))
+    return size, write_time, read_time
+
+def main():
+    parser = argparse.ArgumentParser(description="Compressed storage: disk I/O saved vs CPU spent")
+    parser.add_argument("--tasks", type=int, default=100000, help="Dataset size in tasks")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement")
+    parser.add_argument("--seed", type=int, default=42, help="Dataset seed")
+    parser.add_argument("--disk-mbps", type=float, nargs="+", default=DISK_SPEEDS,
+                        help="Disk throughputs (MB/s) to model load times for")
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp(prefix="pm-compression-")
+    try:
+        generate_dataset(data_dir, args.tasks, args.seed)
+        with patch('utils.file_handler.DATA_DIR', data_dir):
+            records, _ = file_handler._read_records_checked('tasks.json')
+            results = []
+            for label, compression, gzip_level, zstd_level in CONFIGURATIONS:
+                if compression == 'zstd' and file_handler.zstandard is None:
+                    print(f"{label:<8} skipped: zstandard is not installed")
+                    continue
+                results.append((label, *measure(records, compression, gzip_level, zstd_level, args.repeat)))
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    # Load time on a cold cache is roughly decode CPU plus size / disk throughput; the
+    # break-even speed is where the bytes saved stop paying for the extra CPU
+    _, plain_size, _, plain_read = results[0]
+    print(f"\n{args.tasks} tasks, tasks.json")
+    header = f"{'format':<8} {'size MB':>9} {'ratio':>6} {'write ms':>9} {'read ms':>8} {'break-even':>11}"
+    print(header + "".join(f" {f'@{speed:g} MB/s':>12}" for speed in args.disk_mbps))
+    for label, size, write_time, read_time in results:
+        extra_cpu = read_time - plain_read
+        saved = plain_size - size
+        if label == "plain" or saved <= 0:
+            break_even = "-"
+        elif extra_cpu <= 0:
+            break_even = "always"
+        else:
+            break_even = f"{saved / extra_cpu / 1e6:.0f} MB/s"
+        loads = "".join(f" {(read_time + size / (speed * 1e6)) * 1000:>9.1f} ms" for speed in args.disk_mbps)
+        print(f"{label:<8} {size / 1e6:>9.2f} {plain_size / size:>5.1f}x {write_time * 1000:>9.1f} "
+              f"{read_time * 1000:>8.1f} {break_even:>11}{loads}")
+    print("\nColumns @N MB/s model a cold load: read CPU + size / N. Compression wins on disks "
+          "slower than its break-even speed.")
+
+if __name__ == "__main__":
+    main()
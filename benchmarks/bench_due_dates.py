@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# benchmarks/bench_due_dates.py
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import timedelta
+
+# Allow running as `python benchmarks/bench_due_dates.py` from the repo root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.generate_data import BASE_DATE
+from models.project import Project
+from utils.due_date_index import DueDateIndex
+
+def timed(function, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description="Overdue/upcoming queries: linear scan vs due-date index")
+    parser.add_argument("--projects", type=int, default=1000000, help="Number of projects")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per query")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    projects = [Project(f"Project {i}", "", BASE_DATE + timedelta(minutes=rng.randint(-525600, 525600)), 1)
+                for i in range(args.projects)]
+    now = BASE_DATE
+
+    build_time, index = timed(lambda: DueDateIndex(projects), 1)
+    print(f"build index over {args.projects} projects: {build_time * 1000:.1f} ms")
+
+    queries = [
+        ("overdue", lambda: [p for p in projects if p.due_date < now], lambda: index.overdue(now)),
+        ("due within 7", lambda: [p for p in projects if now <= p.due_date and (p.due_date - now).days <= 7],
+         lambda: index.due_within(7, now)),
+        ("due within 0", lambda: [p for p in projects if now <= p.due_date and (p.due_date - now).days <= 0],
+         lambda: index.due_within(0, now)),
+    ]
+    for name, scan, indexed in queries:
+        scan_time, scanned = timed(scan, args.repeat)
+        index_time, found = timed(indexed, args.repeat)
+        assert len(scanned) == len(found)
+        print(f"{name:<14} k={len(found):<8} scan {scan_time * 1000:9.2f} ms   "
+              f"index {index_time * 1000:9.3f} ms   {scan_time / index_time:8.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# benchmarks/bench_names.py
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+# Allow running as `python benchmarks/bench_names.py` from the repo root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.generate_data import ADJECTIVES, NOUNS, VERBS
+from models.task import Task
+from utils.name_index import NameIndex
+from utils.operations import MAX_CANDIDATES
+from utils.repository import Repository
+
+def typo(rng, text):
+    # One random substitution, deletion or transposition
+    position = rng.randrange(len(text) - 1)
+    kind = rng.choice(["substitute", "delete", "transpose"])
+    if kind == "substitute":
+        return text[:position] + rng.choice("abcdefghijklmnopqrstuvwxyz") + text[position + 1:]
+    if kind == "delete":
+        return text[:position] + text[position + 1:]
+    return text[:position] + text[position + 1] + text[position] + text[position + 2:]
+
+def latencies(function, queries):
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        function(query)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
+
+def one_shot_latencies(tasks, queries):
+    # A fresh repository per query, as in a one-shot CLI command; loading is not timed
+    timings = []
+    for query in queries:
+        repo = Repository()
+        repo._set_collection('tasks', tasks)
+        start = time.perf_counter()
+        repo.prefix('tasks', query, MAX_CANDIDATES)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
+
+def main():
+    parser = argparse.ArgumentParser(description="Name resolution latency on a large name index")
+    parser.add_argument("--names", type=int, default=300000, help="Number of task titles")
+    parser.add_argument("--queries", type=int, default=500, help="Queries per kind")
+    parser.add_argument("--one-shot", type=int, default=50, help="Fresh-repository lookups to time")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    tasks = [Task(f"{rng.choice(VERBS)} {rng.choice(ADJECTIVES).lower()} {rng.choice(NOUNS).lower()} {i}", "", 1)
+             for i in range(args.names)]
+
+    start = time.perf_counter()
+    index = NameIndex(tasks, lambda task: task.title)
+    build = time.perf_counter() - start
+    print(f"build over {args.names} names: {build * 1000:.0f} ms")
+
+    sample = [rng.choice(tasks).title for _ in range(args.queries)]
+    kinds = [
+        ("prefix (partial name)", index.prefix, [title[:rng.randint(4, len(title))] for title in sample]),
+        ("fuzzy (typo in partial)", index.fuzzy, [typo(rng, title[:rng.randint(8, len(title))]) for title in sample]),
+        ("fuzzy (no match)", index.fuzzy, ["qqxq " + title[-4:] for title in sample]),
+    ]
+    print("per lookup, index already built:")
+    for name, function, queries in kinds:
+        median, p95 = latencies(function, queries)
+        print(f"  {name:<24} median {median * 1000:8.3f} ms   p95 {p95 * 1000:8.3f} ms")
+
+    # End to end for a one-shot command, which starts without an index
+    print("per command, end to end:")
+    prefixes = kinds[0][2][:args.one_shot]
+    median, p95 = one_shot_latencies(tasks, prefixes)
+    print(f"  {'prefix (scan)':<32} median {median * 1000:8.3f} ms   p95 {p95 * 1000:8.3f} ms")
+    for name, function, queries in kinds:
+        median, p95 = latencies(function, queries)
+        print(f"  {name + ' + build':<32} median {(build + median) * 1000:8.3f} ms   "
+              f"p95 {(build + p95) * 1000:8.3f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# benchmarks/bench_output.py
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+# Allow running as `python benchmarks/bench_output.py` from the repo root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import main
+from benchmarks.generate_data import generate_dataset
+from benchmarks.run_benchmarks import silenced
+from models.task import Task
+from utils.renderers import OUTPUT_FORMATS, render
+from utils.repository import Repository
+
+def build_calls(count, project_count, task_count, seed):
+    # A mixed batch of project listings and task updates, parsed once up front
+    rng = random.Random(seed)
+    parser = main.build_parser()
+    calls = []
+    for _ in range(count):
+        if rng.random() < 0.5:
+            argv = ["list-tasks", "--project", str(rng.randint(1, project_count))]
+        else:
+            argv = ["update-task", "--task", str(rng.randint(1, task_count)),
+                    "--status", rng.choice(Task.VALID_STATUSES)]
+        calls.append(parser.parse_args(argv))
+    return calls
+
+def drive(calls, output):
+    # One shared repository; flushing is a no-op so only handler + render cost is timed
+    repo = Repository()
+    repo.load_all()
+    with patch.object(repo, 'flush'), silenced():
+        start = time.perf_counter()
+        for args in calls:
+            render(main.HANDLERS[args.command](args, repo), output)
+        return (time.perf_counter() - start) / len(calls)
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Per-call cost of each output renderer")
+    parser.add_argument("--tasks", type=int, default=20000, help="Dataset size in tasks")
+    parser.add_argument("--calls", type=int, default=2000, help="Operations per renderer")
+    parser.add_argument("--seed", type=int, default=42, help="Dataset and workload seed")
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp(prefix="pm-output-")
+    try:
+        sizes = generate_dataset(data_dir, args.tasks, args.seed)
+        calls = build_calls(args.calls, sizes['projects'], args.tasks, args.seed)
+        with patch('utils.file_handler.DATA_DIR', data_dir):
+            per_call = {output: drive(calls, output) for output in OUTPUT_FORMATS}
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    for output in OUTPUT_FORMATS:
+        speedup = per_call['table'] / per_call[output]
+        print(f"{output:<6} {per_call[output] * 1e6:10.1f} us/call  {speedup:5.1f}x vs table")
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# benchmarks/bench_tables.py
+import argparse
+import os
+import random
+import sys
+import time
+from unittest.mock import patch
+
+# Allow running as `python benchmarks/bench_tables.py` from the repo root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from rich.console import Console
+from rich.table import Table
+
+from models.task import Task
+from utils import cli_helpers
+
+def legacy_tasks_table(console, tasks, projects, users):
+    # The task table as it was rendered before: markup strings per row, id -> name dicts
+    # rebuilt on every call, and every cell measured by Rich
+    table = Table(title="Tasks")
+    table.add_column("ID", style="dim")
+    table.add_column("Title", style="bold")
+    table.add_column("Project")
+    table.add_column("Assigned To")
+    table.add_column("Status")
+
+    project_dict = {project_id: title for project_id, title in projects}
+    user_dict = {user_id: name for user_id, name in users}
+    for task in tasks:
+        project_name = project_dict.get(task.project_id, f"Project {task.project_id}")
+        if task.assigned_to:
+            assigned_name = user_dict.get(task.assigned_to, f"User {task.assigned_to}")
+        else:
+            assigned_name = "Unassigned"
+        if task.status == 'completed':
+            status_str = f"[bold green]{task.status}[/bold green]"
+        elif task.status == 'in_progress':
+            status_str = f"[bold blue]{task.status}[/bold blue]"
+        elif task.status == 'cancelled':
+            status_str = f"[bold red]{task.status}[/bold red]"
+        else:
+            status_str = f"[bold yellow]{task.status}[/bold yellow]"
+        table.add_row(str(task.id), task.title, project_name, assigned_name, status_str)
+    console.print(table)
+
+def make_tasks(rows, seed):
+    rng = random.Random(seed)
+    project_count = max(1, rows // 50)
+    projects = [(project_id, f"Project {project_id}") for project_id in range(1, project_count + 1)]
+    users = [(user_id, f"User {user_id}") for user_id in range(1, 201)]
+    tasks = []
+    for i in range(rows):
+        task = Task(f"Task {i} " + "x" * rng.randint(5, 40), "", rng.randint(1, project_count),
+                    rng.choice([None, rng.randint(1, 200)]))
+        task.status = rng.choice(Task.VALID_STATUSES)
+        tasks.append(task)
+    return tasks, projects, users
+
+def timed(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Task table rendering: previous Rich table vs precomputed vs plain")
+    parser.add_argument("--rows", type=int, default=100000, help="Tasks in the listing")
+    parser.add_argument("--width", type=int, default=200, help="Console width")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    args = parser.parse_args()
+
+    tasks, projects, users = make_tasks(args.rows, args.seed)
+    project_names, user_names = dict(projects), dict(users)
+
+    with open(os.devnull, 'w') as devnull:
+        # A colour terminal, so styling is paid for as it would be interactively
+        console = Console(file=devnull, width=args.width, force_terminal=True, color_system='truecolor')
+        with patch('utils.cli_helpers.console', console):
+            legacy = timed(lambda: legacy_tasks_table(console, tasks, projects, users))
+            with patch('utils.cli_helpers.PLAIN_TABLE_ROWS', float('inf')):
+                precomputed = timed(lambda: cli_helpers.print_tasks_table(tasks, project_names, user_names))
+            plain = timed(lambda: cli_helpers.print_tasks_table(tasks, project_names, user_names))
+
+    print(f"{args.rows} rows")
+    for name, seconds in (("previous Rich table", legacy), ("precomputed Rich table", precomputed),
+                          (f"plain (> {cli_helpers.PLAIN_TABLE_ROWS} rows)", plain)):
+        print(f"{name:<28} {seconds * 1000:10.1f} ms  {legacy / seconds:6.1f}x")
+
+if __name__ == "__main__":
+    main()
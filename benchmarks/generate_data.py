@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# benchmarks/generate_data.py
+import argparse
+import json
+import os
+import random
+from datetime import datetime, timedelta
+
+# Fixed reference date so generated due dates don't depend on when the script runs
+BASE_DATE = datetime(2025, 1, 1)
+
+FIRST_NAMES = ["Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jamie",
+               "Avery", "Quinn", "Drew", "Reese", "Parker", "Rowan", "Skyler", "Emerson"]
+LAST_NAMES = ["Smith", "Garcia", "Chen", "Patel", "Kim", "Nguyen", "Lopez", "Brown",
+              "Müller", "Rossi", "Silva", "Cohen", "Okafor", "Novak", "Ivanova", "Tanaka"]
+ADJECTIVES = ["Apollo", "Blue", "Rapid", "Quiet", "Golden", "Iron", "Northern", "Bright",
+              "Hidden", "Silver", "Crimson", "Lunar"]
+NOUNS = ["Migration", "Dashboard", "Pipeline", "Portal", "Refactor", "Launch", "Audit",
+         "Gateway", "Scheduler", "Importer", "Redesign", "Cleanup"]
+VERBS = ["Implement", "Review", "Fix", "Design", "Test", "Document", "Deploy", "Investigate",
+         "Refine", "Benchmark"]
+WORDS = ["the", "api", "user", "report", "cache", "schema", "deadline", "client", "legacy",
+         "config", "module", "support", "data", "sync", "edge", "case", "for", "with", "and"]
+
+# Rough shape of a mature tracker: most work is closed, a minority is open
+STATUS_WEIGHTS = [("pending", 25), ("in_progress", 20), ("completed", 45), ("cancelled", 10)]
+UNASSIGNED_RATIO = 0.15
+
+
+def default_sizes(task_count):
+    # Keep roughly 20 tasks per project and 10 projects per user
+    project_count = max(2, task_count // 20)
+    user_count = max(2, project_count // 10)
+    return user_count, project_count
+
+
+def skewed_counts(rng, total, buckets, exponent=0.8):
+    # Split `total` items over `buckets` following a Zipf-like curve, shuffled
+    # so the largest buckets aren't always the lowest ids
+    weights = [1.0 / (i + 1) ** exponent for i in range(buckets)]
+    rng.shuffle(weights)
+    weight_sum = sum(weights)
+    counts = [int(total * w / weight_sum) for w in weights]
+    remainder = total - sum(counts)
+    for i in range(remainder):
+        counts[i % buckets] += 1
+    return counts
+
+
+def _sentence(rng, low, high):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(low, high))).capitalize()
+
+
+def _write_array(path, records):
+    # Stream one record per line so 10M-task datasets never sit in memory
+    with open(path, 'w') as f:
+        f.write("[")
+        first = True
+        for record in records:
+            f.write("\n" if first else ",\n")
+            f.write(json.dumps(record))
+            first = False
+        f.write("\n]\n" if not first else "]\n")
+
+
+def generate_dataset(out_dir, task_count=1000, seed=42, user_count=None, project_count=None):
+    default_users, default_projects = default_sizes(task_count)
+    user_count = user_count or default_users
+    project_count = project_count or default_projects
+    rng = random.Random(seed)
+
+    os.makedirs(out_dir, exist_ok=True)
+
+    # Decide ownership and task counts up front; tasks get contiguous ids per project
+    owner_weights = skewed_counts(rng, project_count, user_count)
+    owners = []
+    for user_index, count in enumerate(owner_weights):
+        owners.extend([user_index + 1] * count)
+    rng.shuffle(owners)
+    tasks_per_project = skewed_counts(rng, task_count, project_count)
+
+    user_projects = [[] for _ in range(user_count)]
+    for project_id, owner in enumerate(owners, start=1):
+        user_projects[owner - 1].append(project_id)
+
+    def users():
+        for index in range(user_count):
+            first = FIRST_NAMES[index % len(FIRST_NAMES)]
+            last = LAST_NAMES[(index // len(FIRST_NAMES)) % len(LAST_NAMES)]
+            name = f"{first} {last}"
+            if index >= len(FIRST_NAMES) * len(LAST_NAMES):
+                name = f"{name} {index}"
+            email = f"{first.lower()}.{index}@example.com"
+            yield {"id": index + 1, "name": name, "email": email, "projects": user_projects[index]}
+
+    def projects():
+        next_task_id = 1
+        for index in range(project_count):
+            count = tasks_per_project[index]
+            due = BASE_DATE + timedelta(days=rng.randint(-180, 365))
+            yield {
+                "id": index + 1,
+                "title": f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {index + 1}",
+                "description": _sentence(rng, 4, 20),
+                "due_date": due.isoformat(),
+                "user_id": owners[index],
+                "tasks": list(range(next_task_id, next_task_id + count)),
+            }
+            next_task_id += count
+
+    def tasks():
+        statuses = [status for status, _ in STATUS_WEIGHTS]
+        weights = [weight for _, weight in STATUS_WEIGHTS]
+        task_id = 1
+        for project_index in range(project_count):
+            for n in range(tasks_per_project[project_index]):
+                assigned = None
+                if rng.random() >= UNASSIGNED_RATIO:
+                    assigned = rng.randint(1, user_count)
+                yield {
+                    "id": task_id,
+                    "title": f"{rng.choice(VERBS)} {rng.choice(NOUNS).lower()} #{n + 1}",
+                    "description": _sentence(rng, 0, 40),
+                    "status": rng.choices(statuses, weights)[0],
+                    "project_id": project_index + 1,
+                    "assigned_to": assigned,
+                }
+                task_id += 1
+
+    _write_array(os.path.join(out_dir, 'users.json'), users())
+    _write_array(os.path.join(out_dir, 'projects.json'), projects())
+    _write_array(os.path.join(out_dir, 'tasks.json'), tasks())
+
+    return {"users": user_count, "projects": project_count, "tasks": task_count, "seed": seed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic data/ directory")
+    parser.add_argument("--out", required=True, help="Directory to write users/projects/tasks JSON into")
+    parser.add_argument("--tasks", type=int, default=1000, help="Number of tasks (1k to 10M)")
+    parser.add_argument("--users", type=int, help="Number of users (default: derived from --tasks)")
+    parser.add_argument("--projects", type=int, help="Number of projects (default: derived from --tasks)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    args = parser.parse_args()
+
+    sizes = generate_dataset(args.out, args.tasks, args.seed, args.users, args.projects)
+    print(f"Generated {sizes['users']} users, {sizes['projects']} projects, "
+          f"{sizes['tasks']} tasks in {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# benchmarks/load_test.py
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+# Allow running as `python benchmarks/load_test.py` from the repo root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.generate_data import generate_dataset
+from models.task import Task
+from utils.async_service import AsyncTaskService
+from utils.operations import OperationError
+
+async def client(service, client_id, deadline, write_ratio, project_count, latencies, seed):
+    rng = random.Random(seed + client_id)
+    requests = 0
+    while time.perf_counter() < deadline:
+        project = str(rng.randint(1, project_count))
+        start = time.perf_counter()
+        try:
+            if rng.random() < write_ratio:
+                if rng.random() < 0.5:
+                    await service.add_task(project, f"Load task {client_id}-{requests}", "", "1")
+                else:
+                    await service.update_task(str(rng.randint(1, 1000)),
+                                              status=rng.choice(Task.VALID_STATUSES))
+            else:
+                await service.list_tasks(project)
+        except OperationError:
+            pass
+        latencies.append(time.perf_counter() - start)
+        requests += 1
+    return requests
+
+async def run_load(clients, duration, write_ratio, project_count, seed):
+    service = await AsyncTaskService.open()
+    latencies = []
+    deadline = time.perf_counter() + duration
+    start = time.perf_counter()
+    counts = await asyncio.gather(*[
+        client(service, i, deadline, write_ratio, project_count, latencies, seed)
+        for i in range(clients)
+    ])
+    await service.flush()
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": sum(counts),
+        "rps": sum(counts) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the async service API")
+    parser.add_argument("--tasks", type=int, default=10000, help="Dataset size in tasks")
+    parser.add_argument("--clients", type=int, default=100, help="Concurrent clients")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds to run")
+    parser.add_argument("--write-ratio", type=float, default=0.2, help="Fraction of requests that mutate")
+    parser.add_argument("--seed", type=int, default=42, help="Dataset and workload seed")
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp(prefix="pm-load-")
+    try:
+        sizes = generate_dataset(data_dir, args.tasks, args.seed)
+        with patch('utils.file_handler.DATA_DIR', data_dir):
+            result = asyncio.run(run_load(args.clients, args.duration, args.write_ratio,
+                                          sizes['projects'], args.seed))
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    print(f"{args.clients} clients, {result['requests']} requests: {result['rps']:.0f} req/s, "
+          f"p50 {result['p50_ms']:.2f} ms, p99 {result['p99_ms']:.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+# benchmarks/replay.py
+import argparse
+import io
+import json
+import os
+import resource
+import shlex
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stderr
+from unittest.mock import patch
+
+# Allow running as `python benchmarks/replay.py` from the repo root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import main
+from benchmarks.generate_data import generate_dataset
+from utils import file_handler, snapshot
+
+# Replays a recorded trace of CLI invocations (see PM_TRACE in main.py) against a scratch
+# data directory. Every command runs in its own process, like a real invocation, so
+# concurrent commands contend for the data lock and the disk the way production ones do.
+CHILD_FLAG = '--child'
+# Commands that never finish on their own ('watch --once' does). Shell sessions trace
+# each line they run, so load_trace() skips the session itself.
+UNREPLAYABLE = {'watch'}
+
+def parse_trace_line(line):
+    # A trace line is either what main.py records ({"time": ..., "argv": [...]}) or a
+    # hand-written shell-style command line; returns argv, or None for blanks/comments
+    line = line.strip()
+    if not line or line.startswith('#'):
+        return None
+    if line.startswith('{'):
+        return [str(arg) for arg in json.loads(line)['argv']]
+    argv = shlex.split(line)
+    # Allow pasting whole command lines
+    if argv[:2] == ['python', 'main.py'] or argv[:2] == ['python3', 'main.py']:
+        argv = argv[2:]
+    elif argv[:1] == ['main.py']:
+        argv = argv[1:]
+    return argv
+
+def load_trace(path):
+    # Returns (commands, skipped); each command is (subcommand, argv) and has already
+    # been parsed by main's argparse tree, so bad lines are reported before anything runs
+    parser = main.build_parser()
+    commands, skipped = [], []
+    with open(path, 'r') as f:
+        for number, line in enumerate(f, 1):
+            try:
+                argv = parse_trace_line(line)
+            except (ValueError, KeyError, TypeError) as e:
+                skipped.append((number, f"unreadable: {e}"))
+                continue
+            if argv is None:
+                continue
+            try:
+                with redirect_stderr(io.StringIO()):
+                    args = parser.parse_args(argv)
+            except SystemExit:
+                skipped.append((number, f"not a valid command: {shlex.join(argv)}"))
+                continue
+            if args.command is None:
+                skipped.append((number, "no subcommand"))
+            elif args.command == 'shell':
+                skipped.append((number, "shell sessions are replayed from the lines they traced"))
+            elif args.command in UNREPLAYABLE and not getattr(args, 'once', False):
+                skipped.append((number, f"{args.command} does not terminate"))
+            else:
+                commands.append((args.command, argv))
+    return commands, skipped
+
+def io_counters():
+    # Bytes read and written by this process. On Linux that is everything passed through
+    # read()/write() (page cache hits included, mmap reads not); elsewhere, block I/O.
+    try:
+        with open('/proc/self/io', 'r') as f:
+            fields = dict(line.split(': ') for line in f.read().splitlines())
+        return int(fields['rchar']), int(fields['wchar'])
+    except OSError:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        return usage.ru_inblock * 512, usage.ru_oublock * 512
+
+def run_child(data_dir, argv):
+    # Runs one command against data_dir and prints its measurements as one JSON line.
+    # Output is rendered into memory, so rendering cost counts but not terminal I/O.
+    statuses = []
+    real_render = main.render
+
+    def render(result, output='table'):
+        statuses.append(result.status)
+        real_render(result, output)
+
+    real_stdout = sys.stdout
+    with patch('utils.file_handler.DATA_DIR', data_dir), patch('main.render', render):
+        sys.stdout = io.StringIO()
+        try:
+            read_before, written_before = io_counters()
+            start = time.perf_counter()
+            main.main(argv)
+            seconds = time.perf_counter() - start
+            read_after, written_after = io_counters()
+        finally:
+            sys.stdout = real_stdout
+
+    print(json.dumps({
+        'seconds': seconds,
+        'ok': 'error' not in statuses,
+        'read_bytes': read_after - read_before,
+        'write_bytes': written_after - written_before,
+    }))
+
+def run_command(data_dir, argv):
+    # Replayed commands mustn't append to the trace being replayed
+    env = {name: value for name, value in os.environ.items() if name != main.TRACE_ENV}
+    try:
+        completed = subprocess.run([sys.executable, os.path.abspath(__file__), CHILD_FLAG, data_dir] + argv,
+                                   capture_output=True, text=True, env=env, stdin=subprocess.DEVNULL)
+        if completed.returncode == 0:
+            return json.loads(completed.stdout.splitlines()[-1])
+    except (OSError, ValueError, IndexError):
+        pass
+    # Crashed before it could report; counts as an error with no timing
+    return {'seconds': None, 'ok': False, 'read_bytes': 0, 'write_bytes': 0}
+
+def percentile(sorted_values, fraction):
+    # Nearest-rank percentile of an already sorted list
+    index = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+def summarize(commands, measurements, elapsed):
+    per_command = {}
+    for (name, _), measurement in zip(commands, measurements):
+        stats = per_command.setdefault(name, {'count': 0, 'errors': 0, 'read_bytes': 0,
+                                              'write_bytes': 0, 'latencies': []})
+        stats['count'] += 1
+        stats['errors'] += not measurement['ok']
+        stats['read_bytes'] += measurement['read_bytes']
+        stats['write_bytes'] += measurement['write_bytes']
+        if measurement['seconds'] is not None:
+            stats['latencies'].append(measurement['seconds'])
+
+    for stats in per_command.values():
+        latencies = sorted(stats.pop('latencies'))
+        if latencies:
+            stats.update({
+                'p50_ms': percentile(latencies, 0.50) * 1000,
+                'p90_ms': percentile(latencies, 0.90) * 1000,
+                'p99_ms': percentile(latencies, 0.99) * 1000,
+                'max_ms': latencies[-1] * 1000,
+            })
+
+    return {
+        'commands': len(measurements),
+        'errors': sum(not measurement['ok'] for measurement in measurements),
+        'elapsed': elapsed,
+        'throughput': len(measurements) / elapsed if elapsed else 0.0,
+        'read_bytes': sum(stats['read_bytes'] for stats in per_command.values()),
+        'write_bytes': sum(stats['write_bytes'] for stats in per_command.values()),
+        'subcommands': dict(sorted(per_command.items())),
+    }
+
+def replay(commands, data_dir, concurrency=1, rate=None):
+    # Issues commands in trace order, at most `concurrency` at a time and, with a rate,
+    # `rate` per second. The schedule is open loop: a slow command doesn't delay the
+    # ones after it; when every worker is busy they queue for the next free one.
+    measurements = [None] * len(commands)
+
+    def run(index, argv):
+        measurements[index] = run_command(data_dir, argv)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for index, (_, argv) in enumerate(commands):
+            if rate:
+                delay = start + index / rate - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            pool.submit(run, index, argv)
+    elapsed = time.perf_counter() - start
+
+    return summarize(commands, measurements, elapsed)
+
+def prepare_scratch(scratch, source=None, archive=None, tasks=None, shard=False):
+    # The candidate store: a copy of an existing data directory, a restored snapshot,
+    # a generated dataset, or nothing at all
+    if source:
+        shutil.copytree(source, scratch, dirs_exist_ok=True)
+    elif archive:
+        with patch('utils.file_handler.DATA_DIR', scratch):
+            snapshot.restore_snapshot(archive, force=True)
+    elif tasks:
+        generate_dataset(scratch, tasks)
+    if shard:
+        with patch('utils.file_handler.DATA_DIR', scratch):
+            with file_handler.data_lock():
+                file_handler.shard_tasks()
+
+def format_bytes(count):
+    for unit in ('B', 'KiB', 'MiB'):
+        if count < 1024:
+            return f"{count:.0f} {unit}"
+        count /= 1024
+    return f"{count:.1f} GiB"
+
+def print_summary(summary):
+    print(f"{'subcommand':<16} {'count':>6} {'errors':>6} {'p50 ms':>9} {'p90 ms':>9} "
+          f"{'p99 ms':>9} {'max ms':>9} {'read':>10} {'written':>10}")
+    for name, stats in summary['subcommands'].items():
+        timings = " ".join(f"{stats[key]:>9.2f}" if key in stats else f"{'-':>9}"
+                           for key in ('p50_ms', 'p90_ms', 'p99_ms', 'max_ms'))
+        print(f"{name:<16} {stats['count']:>6} {stats['errors']:>6} {timings} "
+              f"{format_bytes(stats['read_bytes']):>10} {format_bytes(stats['write_bytes']):>10}")
+    print(f"{summary['commands']} commands ({summary['errors']} errors) in {summary['elapsed']:.2f} s: "
+          f"{summary['throughput']:.1f} commands/s, read {format_bytes(summary['read_bytes'])}, "
+          f"wrote {format_bytes(summary['write_bytes'])}")
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Replay a recorded trace of CLI commands against a scratch data directory")
+    parser.add_argument("trace", help="Trace file: JSON lines recorded with PM_TRACE, or one command line per line")
+    parser.add_argument("--concurrency", type=int, default=1, help="Commands running at once")
+    parser.add_argument("--rate", type=float, help="Commands started per second (default: as fast as possible)")
+    seed = parser.add_mutually_exclusive_group()
+    seed.add_argument("--data", help="Start from a copy of this data directory")
+    seed.add_argument("--snapshot", help="Start from this snapshot archive")
+    seed.add_argument("--tasks", type=int, help="Start from a generated dataset of this many tasks")
+    parser.add_argument("--shard", action="store_true", help="Shard the task store before replaying")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch directory afterwards")
+    parser.add_argument("--output", help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.rate is not None and args.rate <= 0:
+        parser.error("--rate must be positive")
+
+    commands, skipped = load_trace(args.trace)
+    for number, reason in skipped:
+        print(f"Skipping line {number}: {reason}", file=sys.stderr)
+    if not commands:
+        print("Nothing to replay.", file=sys.stderr)
+        return 1
+
+    scratch = tempfile.mkdtemp(prefix="pm-replay-")
+    try:
+        prepare_scratch(scratch, args.data, args.snapshot, args.tasks, args.shard)
+        summary = replay(commands, scratch, args.concurrency, args.rate)
+    finally:
+        if args.keep:
+            print(f"Scratch data kept in {scratch}", file=sys.stderr)
+        else:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+    summary['skipped'] = len(skipped)
+    print_summary(summary)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(summary, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == CHILD_FLAG:
+        run_child(sys.argv[2], sys.argv[3:])
+    else:
+        sys.exit(main_cli())
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# benchmarks/run_benchmarks.py
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from unittest.mock import patch
+
+# Allow running as `python benchmarks/run_benchmarks.py` from the repo root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import main
+from benchmarks.generate_data import generate_dataset
+from utils import snapshot
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+DATA_FILES = ['users.json', 'projects.json', 'tasks.json']
+# Interactive, so there is nothing one-shot to time
+UNBENCHMARKED = {'shell'}
+
+
+def build_scenarios(task_count, scratch_dir):
+    # (name, argv, mutates_data) -- one or more scenarios per subcommand in main.py.
+    # scratch_dir holds files outside the data dir: snapshot.jsonl.gz is restored from
+    # and snapshots are written to out.jsonl.gz.
+    middle_task = str(max(1, task_count // 2))
+    return [
+        ("add-user", ["add-user", "--name", "Bench User", "--email", "bench@example.com"], True),
+        ("list-users", ["list-users"], False),
+        ("add-project", ["add-project", "--user", "1", "--title", "Bench Project",
+                         "--description", "Benchmark", "--due-date", "2025-06-01"], True),
+        ("list-projects", ["list-projects"], False),
+        ("list-projects --user", ["list-projects", "--user", "1"], False),
+        ("add-task", ["add-task", "--project", "1", "--title", "Bench Task",
+                      "--description", "Benchmark", "--assign", "1"], True),
+        ("list-tasks", ["list-tasks"], False),
+        ("list-tasks --project", ["list-tasks", "--project", "1"], False),
+        ("list-tasks --status", ["list-tasks", "--status", "pending"], False),
+        ("complete-task", ["complete-task", "--task", middle_task], True),
+        ("update-task", ["update-task", "--task", middle_task, "--status", "in_progress",
+                         "--assign", "2"], True),
+        ("index-tasks", ["index-tasks"], False),
+        ("shard-tasks", ["shard-tasks"], True),
+        ("report", ["report"], False),
+        ("watch --once", ["watch", "--once"], False),
+        ("validate", ["validate"], False),
+        ("snapshot", ["snapshot", "--file", os.path.join(scratch_dir, "out.jsonl.gz")], False),
+        ("restore", ["restore", "--file", os.path.join(scratch_dir, "snapshot.jsonl.gz"), "--force"], True),
+        ("compress-store", ["compress-store", "--format", "gzip"], True),
+        ("archive", ["archive", "--older-than", "30"], True),
+    ]
+
+
+@contextmanager
+def silenced():
+    # Rendering still happens, it just goes nowhere
+    with open(os.devnull, 'w') as devnull:
+        old_out = sys.stdout
+        sys.stdout = devnull
+        try:
+            yield
+        finally:
+            sys.stdout = old_out
+
+
+def restore_data(pristine_dir, work_dir):
+    # Start from the generated files alone: shards, archives, caches and the event log
+    # left by an earlier run would change what the next one measures
+    for name in os.listdir(work_dir):
+        path = os.path.join(work_dir, name)
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
+    for name in DATA_FILES:
+        shutil.copyfile(os.path.join(pristine_dir, name), os.path.join(work_dir, name))
+
+
+def time_scenario(argv, pristine_dir, work_dir, mutates, repeat):
+    timings = []
+    # Read-only scenarios share one copy, but not one a previous scenario changed
+    if not mutates:
+        restore_data(pristine_dir, work_dir)
+    for _ in range(repeat):
+        if mutates:
+            restore_data(pristine_dir, work_dir)
+        with patch('sys.argv', ['main.py'] + argv), silenced():
+            start = time.perf_counter()
+            main.main()
+            timings.append(time.perf_counter() - start)
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.mean(timings),
+        "runs": timings,
+    }
+
+
+def run_benchmarks(task_count, repeat, seed, only=None):
+    pristine_dir = tempfile.mkdtemp(prefix="pm-bench-data-")
+    work_dir = tempfile.mkdtemp(prefix="pm-bench-work-")
+    scratch_dir = tempfile.mkdtemp(prefix="pm-bench-scratch-")
+    try:
+        sizes = generate_dataset(pristine_dir, task_count, seed)
+        restore_data(pristine_dir, work_dir)
+
+        results = {}
+        with patch('utils.file_handler.DATA_DIR', work_dir):
+            snapshot.create_snapshot(os.path.join(scratch_dir, "snapshot.jsonl.gz"))
+            for name, argv, mutates in build_scenarios(task_count, scratch_dir):
+                if only and name.split()[0] not in only:
+                    continue
+                results[name] = time_scenario(argv, pristine_dir, work_dir, mutates, repeat)
+                print(f"{name:<24} median {results[name]['median'] * 1000:10.2f} ms", file=sys.stderr)
+    finally:
+        shutil.rmtree(pristine_dir, ignore_errors=True)
+        shutil.rmtree(work_dir, ignore_errors=True)
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+
+    return {
+        "meta": {
+            "scale": task_count,
+            "sizes": sizes,
+            "repeat": repeat,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": datetime.now().isoformat(),
+        },
+        "results": results,
+    }
+
+
+def compare_to_baseline(report, baseline, threshold):
+    # Returns a list of (scenario, baseline_median, current_median) that regressed
+    if baseline["meta"]["scale"] != report["meta"]["scale"]:
+        raise ValueError(f"Baseline was recorded at scale {baseline['meta']['scale']}, "
+                         f"not {report['meta']['scale']}")
+
+    regressions = []
+    for name, current in report["results"].items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            continue
+        if current["median"] > previous["median"] * (1 + threshold):
+            regressions.append((name, previous["median"], current["median"]))
+    return regressions
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Benchmark every CLI subcommand on synthetic data")
+    parser.add_argument("--tasks", type=int, default=1000, help="Dataset size in tasks (1k to 10M)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per scenario")
+    parser.add_argument("--seed", type=int, default=42, help="Dataset seed")
+    parser.add_argument("--only", nargs="*", help="Only run these subcommands")
+    parser.add_argument("--output", help="Write JSON results to this file")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.5,
+                        help="Allowed slowdown over the baseline median (0.5 = 50%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the baseline")
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.tasks, args.repeat, args.seed, args.only)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}", file=sys.stderr)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        return 0
+
+    with open(args.baseline, 'r') as f:
+        baseline = json.load(f)
+
+    try:
+        regressions = compare_to_baseline(report, baseline, args.threshold)
+    except ValueError as e:
+        print(f"Skipping baseline comparison: {e}", file=sys.stderr)
+        return 0
+
+    for name, before, after in regressions:
+        print(f"REGRESSION {name}: {before * 1000:.2f} ms -> {after * 1000:.2f} ms", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
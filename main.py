@@ -1,335 +1,450 @@
 #!/usr/bin/env python3
 # main.py
 import argparse
+import json
+import os
 import sys
-from datetime import datetime
-from dateutil import parser
+import time
+from contextlib import nullcontext
 
-from models.user import User
-from models.project import Project
 from models.task import Task
-from utils.file_handler import load_users, save_users, load_projects, save_projects, load_tasks, save_tasks
-from utils.cli_helpers import (
-    print_title, print_success, print_error, print_warning,
-    print_users_table, print_projects_table, print_tasks_table
-)
+from utils import archive, change_feed, file_handler, operations, snapshot, validation
+from utils.shell import Shell
+from utils.operations import OperationError, OperationWarning
+from utils.repository import Repository
+from utils.task_index import TaskIndex, StaleIndexError, build_task_index
+from utils.renderers import OUTPUT_FORMATS, render
+from utils.results import Result
 
-def get_user_by_name_or_id(users, identifier):
-    # Try to get by ID
+def handle_add_user(args, repo=None):
+    repo = repo or Repository()
     try:
-        user_id = int(identifier)
-        for user in users:
-            if user.id == user_id:
-                return user
-    except ValueError:
-        # Try to get by name
-        for user in users:
-            if user.name.lower() == identifier.lower():
-                return user
+        user = operations.add_user(repo, args.name, args.email)
+    except OperationError as e:
+        return Result.error(str(e))
+    repo.flush()
     
-    return None
+    return Result.success(f"User '{args.name}' added successfully with ID {user.id}.", user)
+
+def handle_list_users(args, repo=None):
+    repo = repo or Repository()
+    return Result.listing('users', operations.list_users(repo, args.id))
 
-def get_project_by_title_or_id(projects, identifier):
-    # Try to get by ID
+def handle_add_project(args, repo=None):
+    repo = repo or Repository()
     try:
-        project_id = int(identifier)
-        for project in projects:
-            if project.id == project_id:
-                return project
-    except ValueError:
-        # Try to get by title
-        for project in projects:
-            if project.title.lower() == identifier.lower():
-                return project
+        project = operations.add_project(repo, args.user, args.title, args.description, args.due_date)
+    except OperationError as e:
+        return Result.error(str(e))
+    repo.flush()
     
-    return None
+    return Result.success(f"Project '{args.title}' added successfully with ID {project.id}.", project)
 
-def get_task_by_title_or_id(tasks, identifier):
-    # Try to get by ID
+def handle_list_projects(args, repo=None):
+    repo = repo or Repository()
     try:
-        task_id = int(identifier)
-        for task in tasks:
-            if task.id == task_id:
-                return task
-    except ValueError:
-        # Try to get by title
-        for task in tasks:
-            if task.title.lower() == identifier.lower():
-                return task
-    
-    return None
+        if args.group_by:
+            projects = operations.iter_projects(repo, args.user, args.id, args.overdue, args.due_within)
+            groups = operations.group_projects(repo, projects, args.group_by, args.sort_by, args.top)
+            return Result.grouped('projects', groups, user_names=repo.id_names('users'))
+        projects = operations.list_projects(repo, args.user, args.id, args.overdue, args.due_within,
+                                            sort_by=args.sort_by, top=args.top)
+    except OperationError as e:
+        return Result.error(str(e))
+    
+    return Result.listing('projects', projects, user_names=repo.id_names('users'))
 
-def handle_add_user(args):
-    users = load_users()
-    
-    # Check if user with the same name already exists
-    for user in users:
-        if user.name.lower() == args.name.lower():
-            print_error(f"User with name '{args.name}' already exists.")
-            return
-    
-    user = User(args.name, args.email)
-    users.append(user)
-    save_users(users)
+def handle_add_task(args, repo=None):
+    repo = repo or Repository()
+    try:
+        task = operations.add_task(repo, args.project, args.title, args.description, args.assign, args.depends_on)
+    except OperationError as e:
+        return Result.error(str(e))
+    repo.flush()
     
-    print_success(f"User '{args.name}' added successfully with ID {user.id}.")
+    return Result.success(f"Task '{args.title}' added successfully with ID {task.id}.", task)
 
-def handle_list_users(args):
-    users = load_users()
-    
-    if args.id:
-        # Filter by ID
-        users = [user for user in users if user.id == args.id]
+def _task_listing(repo, args, tasks):
+    # Sort, cut and group a stream of tasks as --sort-by/--top/--group-by ask
+    names = dict(project_names=repo.id_names('projects'), user_names=repo.id_names('users'))
+    if args.group_by:
+        groups = operations.group_tasks(repo, tasks, args.group_by, args.sort_by, args.top)
+        return Result.grouped('tasks', groups, **names)
+    tasks = operations.arrange_tasks(repo, tasks, args.sort_by, args.top)
+    return Result.listing('tasks', tasks, **names)
+
+def handle_list_tasks(args, repo=None):
+    repo = repo or Repository()
+    if args.mmap:
+        if args.ready or args.blocked or args.critical_path:
+            return Result.error("--mmap can't be combined with dependency queries.")
+        return handle_list_tasks_mmap(args, repo)
     
-    print_users_table(users)
+    try:
+        if args.critical_path:
+            if not args.project:
+                return Result.error("--critical-path needs --project.")
+            if args.sort_by or args.group_by or args.top:
+                return Result.error("--critical-path is already in order; it can't be sorted, grouped or cut.")
+            tasks = operations.critical_path(repo, args.project)
+        else:
+            tasks = operations.iter_tasks(repo, args.project, args.status, args.ready, args.blocked,
+                                          args.include_archived)
+            return _task_listing(repo, args, tasks)
+    except OperationError as e:
+        return Result.error(str(e))
+    
+    return Result.listing('tasks', tasks, project_names=repo.id_names('projects'),
+                          user_names=repo.id_names('users'))
 
-def handle_add_project(args):
-    users = load_users()
-    projects = load_projects()
-    
-    # Find the user
-    user = get_user_by_name_or_id(users, args.user)
-    if not user:
-        print_error(f"User '{args.user}' not found.")
-        return
+def handle_list_tasks_mmap(args, repo):
+    # Read-only query mode: tasks are decoded from the mmapped index on demand
+    project_id = None
+    if args.project:
+        try:
+            project_id = operations.resolve_project(repo, args.project).id
+        except OperationError as e:
+            return Result.error(str(e))
     
-    # Check if project with the same title already exists
-    for project in projects:
-        if project.title.lower() == args.title.lower():
-            print_error(f"Project with title '{args.title}' already exists.")
-            return
+    if args.status and args.status not in Task.VALID_STATUSES:
+        return Result.error(f"Invalid status: '{args.status}'. Valid statuses are: {', '.join(Task.VALID_STATUSES)}.")
     
-    # Parse due date
     try:
-        due_date = parser.parse(args.due_date) if args.due_date else datetime.now()
+        index = TaskIndex()
+    except FileNotFoundError:
+        return Result.error("No task index found. Run 'index-tasks' first.")
+    except StaleIndexError:
+        return Result.error("Task index is out of date. Run 'index-tasks' to rebuild it.")
+    
+    # Decoded tasks stream straight into the sort/group, so only the kept ones are held
+    with index:
+        tasks = index.find(project_id, args.status)
+        if args.include_archived:
+            tasks = operations.with_archived(tasks, project_id, args.status)
+        try:
+            return _task_listing(repo, args, tasks)
+        except OperationError as e:
+            return Result.error(str(e))
+
+def handle_index_tasks(args, repo=None):
+    try:
+        count = build_task_index()
+    except FileNotFoundError:
+        return Result.error("No tasks found to index.")
     except ValueError:
-        print_error(f"Invalid due date format: '{args.due_date}'.")
-        return
+        return Result.error("Tasks file could not be parsed.")
     
-    # Create project
-    project = Project(args.title, args.description or "", due_date, user.id)
-    projects.append(project)
-    save_projects(projects)
-    
-    # Update user's projects
-    user.add_project(project.id)
-    save_users(users)
-    
-    print_success(f"Project '{args.title}' added successfully with ID {project.id}.")
+    return Result.success(f"Indexed {count} tasks for read-only queries.")
 
-def handle_list_projects(args):
-    users = load_users()
-    projects = load_projects()
-    
-    if args.user:
-        # Find the user
-        user = get_user_by_name_or_id(users, args.user)
-        if not user:
-            print_error(f"User '{args.user}' not found.")
-            return
-        
-        # Filter projects by user
-        projects = [project for project in projects if project.user_id == user.id]
-    
-    if args.id:
-        # Filter by ID
-        projects = [project for project in projects if project.id == args.id]
+def handle_shard_tasks(args, repo=None):
+    if file_handler.is_sharded():
+        return Result.warning("Tasks are already sharded by project.")
+    try:
+        with file_handler.data_lock():
+            count = file_handler.shard_tasks()
+    except ValueError:
+        return Result.error("Tasks file could not be parsed.")
     
-    print_projects_table(projects, users)
+    return Result.success(f"Split tasks into {count} project shards.")
 
-def handle_add_task(args):
-    users = load_users()
-    projects = load_projects()
-    tasks = load_tasks()
-    
-    # Find the project
-    project = get_project_by_title_or_id(projects, args.project)
-    if not project:
-        print_error(f"Project '{args.project}' not found.")
-        return
+def handle_complete_task(args, repo=None):
+    repo = repo or Repository()
+    try:
+        task = operations.complete_task(repo, args.task)
+    except OperationWarning as e:
+        return Result.warning(str(e))
+    except OperationError as e:
+        return Result.error(str(e))
+    repo.flush()
+    
+    return Result.success(f"Task '{task.title}' marked as completed.", task)
+
+def handle_update_task(args, repo=None):
+    repo = repo or Repository()
+    try:
+        task = operations.update_task(repo, args.task, args.title, args.description, args.status, args.assign,
+                                      args.depends_on, args.remove_dependency)
+    except OperationError as e:
+        return Result.error(str(e))
+    repo.flush()
     
-    # Check if task with the same title already exists in the project
-    for task in tasks:
-        if task.project_id == project.id and task.title.lower() == args.title.lower():
-            print_error(f"Task with title '{args.title}' already exists in project '{project.title}'.")
-            return
-    
-    # Find the assigned user if provided
-    assigned_user_id = None
-    if args.assign:
-        assigned_user = get_user_by_name_or_id(users, args.assign)
-        if not assigned_user:
-            print_error(f"User '{args.assign}' not found.")
-            return
-        assigned_user_id = assigned_user.id
-    
-    # Create task
-    task = Task(args.title, args.description or "", project.id, assigned_user_id)
-    tasks.append(task)
-    save_tasks(tasks)
-    
-    # Update project's tasks
-    project.add_task(task.id)
-    save_projects(projects)
-    
-    print_success(f"Task '{args.title}' added successfully with ID {task.id}.")
+    return Result.success(f"Task '{task.title}' updated successfully.", task)
 
-def handle_list_tasks(args):
-    users = load_users()
-    projects = load_projects()
-    tasks = load_tasks()
+def handle_report(args, repo=None):
+    repo = repo or Repository()
+    try:
+        report = operations.report(repo, args.days, args.since, args.until)
+    except OperationError as e:
+        return Result.error(str(e))
     
-    if args.project:
-        # Find the project
-        project = get_project_by_title_or_id(projects, args.project)
-        if not project:
-            print_error(f"Project '{args.project}' not found.")
-            return
-        
-        # Filter tasks by project
-        tasks = [task for task in tasks if task.project_id == project.id]
-    
-    if args.status:
-        # Validate status
-        if args.status not in Task.VALID_STATUSES:
-            print_error(f"Invalid status: '{args.status}'. Valid statuses are: {', '.join(Task.VALID_STATUSES)}.")
-            return
+    return Result.report('report', report, user_names=repo.id_names('users'))
+
+def handle_watch(args, repo=None):
+    try:
+        if args.once:
+            changes, cursor = change_feed.read_changes(args.cursor or 0)
+            return Result.report('changes', {'changes': changes, 'cursor': cursor})
         
-        # Filter tasks by status
-        tasks = [task for task in tasks if task.status == args.status]
-    
-    print_tasks_table(tasks, projects, users)
+        # Stream batches as they are committed; each is rendered on its own
+        cursor = args.cursor
+        for changes, cursor in change_feed.watch(cursor, args.interval):
+            render(Result.report('changes', {'changes': changes, 'cursor': cursor}), args.output)
+            sys.stdout.flush()
+    except change_feed.CursorError as e:
+        return Result.error(str(e))
+    except KeyboardInterrupt:
+        pass
+    
+    return Result.success(f"Stopped watching at cursor {cursor if cursor is not None else change_feed.end_cursor()}.")
 
-def handle_complete_task(args):
-    tasks = load_tasks()
-    
-    # Find the task
-    task = get_task_by_title_or_id(tasks, args.task)
-    if not task:
-        print_error(f"Task '{args.task}' not found.")
-        return
-    
-    # Check if already completed
-    if task.status == 'completed':
-        print_warning(f"Task '{task.title}' is already completed.")
-        return
-    
-    # Update task status
-    task.mark_completed()
-    save_tasks(tasks)
-    
-    print_success(f"Task '{task.title}' marked as completed.")
+def handle_validate(args, repo=None):
+    return Result.report('validation', validation.validate_store())
 
-def handle_update_task(args):
-    users = load_users()
-    tasks = load_tasks()
-    
-    # Find the task
-    task = get_task_by_title_or_id(tasks, args.task)
-    if not task:
-        print_error(f"Task '{args.task}' not found.")
-        return
+def handle_snapshot(args, repo=None):
+    path = args.file or snapshot.default_filename()
+    try:
+        counts = snapshot.create_snapshot(path)
+    except (OSError, ValueError) as e:
+        return Result.error(f"Snapshot failed: {e}")
     
-    # Update title if provided
-    if args.title:
-        task.title = args.title
-    
-    # Update description if provided
-    if args.description:
-        task.description = args.description
-    
-    # Update status if provided
-    if args.status:
-        if args.status not in Task.VALID_STATUSES:
-            print_error(f"Invalid status: '{args.status}'. Valid statuses are: {', '.join(Task.VALID_STATUSES)}.")
-            return
-        task.status = args.status
-    
-    # Update assigned user if provided
-    if args.assign:
-        if args.assign.lower() == 'none':
-            task.assigned_to = None
-        else:
-            assigned_user = get_user_by_name_or_id(users, args.assign)
-            if not assigned_user:
-                print_error(f"User '{args.assign}' not found.")
-                return
-            task.assigned_to = assigned_user.id
+    return Result.success(f"Snapshot written to {path} ({snapshot.describe_counts(counts)}).")
+
+def handle_restore(args, repo=None):
+    try:
+        if args.check:
+            trailer = snapshot.verify_snapshot(args.file)
+            return Result.success(f"Snapshot {args.file} is valid ({snapshot.describe_counts(trailer['counts'])}).")
+        counts = snapshot.restore_snapshot(args.file, force=args.force)
+    except snapshot.SnapshotError as e:
+        return Result.error(str(e))
+    except OSError as e:
+        return Result.error(f"Restore failed: {e}")
+    
+    return Result.success(f"Restored {snapshot.describe_counts(counts)} from {args.file}.")
+
+def handle_compress_store(args, repo=None):
+    try:
+        with file_handler.data_lock():
+            count, before, after = file_handler.compress_store(args.format)
+    except file_handler.CompressionError as e:
+        return Result.error(str(e))
+    except ValueError:
+        return Result.error("A data file could not be parsed.")
     
-    save_tasks(tasks)
+    return Result.success(f"Rewrote {count} files as {args.format}: {before:,} -> {after:,} bytes.")
+
+def handle_archive(args, repo=None):
+    try:
+        with file_handler.data_lock():
+            archived, remaining = archive.archive_tasks(args.older_than)
+    except archive.ArchiveError as e:
+        return Result.error(str(e))
+    except ValueError:
+        return Result.error("Tasks file could not be parsed.")
     
-    print_success(f"Task '{task.title}' updated successfully.")
+    if not archived:
+        return Result.warning(f"No tasks closed more than {args.older_than} days ago to archive.")
+    return Result.success(f"Archived {archived} closed tasks; {remaining} tasks remain in the hot store.")
+
+def handle_shell(args, repo=None):
+    try:
+        problem = Shell(build_parser(), HANDLERS, output=args.output, record=record_invocation).run()
+    except (OSError, file_handler.CompressionError) as e:
+        return Result.error(f"Shell closed, but pending changes could not be saved: {e}")
+    result = Result.success("Shell closed; all changes saved.")
+    return result.warn(problem) if problem else result
+
+HANDLERS = {
+    "add-user": handle_add_user,
+    "list-users": handle_list_users,
+    "add-project": handle_add_project,
+    "list-projects": handle_list_projects,
+    "add-task": handle_add_task,
+    "list-tasks": handle_list_tasks,
+    "index-tasks": handle_index_tasks,
+    "shard-tasks": handle_shard_tasks,
+    "complete-task": handle_complete_task,
+    "update-task": handle_update_task,
+    "report": handle_report,
+    "watch": handle_watch,
+    "validate": handle_validate,
+    "snapshot": handle_snapshot,
+    "restore": handle_restore,
+    "compress-store": handle_compress_store,
+    "archive": handle_archive,
+    "shell": handle_shell,
+}
 
-def main():
+# Commands that rewrite the files they read; their cold loads don't fill the parse cache
+WRITE_COMMANDS = {'add-user', 'add-project', 'add-task', 'complete-task', 'update-task', 'shard-tasks',
+                  'compress-store', 'archive', 'restore'}
+
+def build_parser():
     parser = argparse.ArgumentParser(description="Project Management CLI")
     subparsers = parser.add_subparsers(dest="command", help="Command to run")
     
+    # Options shared by every command
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--output", choices=OUTPUT_FORMATS, default="table",
+                        help="Output format: Rich tables, or JSON/JSON lines for scripts")
+    common.add_argument("--workspace", help=f"Workspace to use (default ${file_handler.WORKSPACE_ENV} or 'default')")
+    
     # Add user command
-    add_user_parser = subparsers.add_parser("add-user", help="Add a new user")
+    add_user_parser = subparsers.add_parser("add-user", parents=[common], help="Add a new user")
     add_user_parser.add_argument("--name", required=True, help="User name")
     add_user_parser.add_argument("--email", required=True, help="User email")
     
     # List users command
-    list_users_parser = subparsers.add_parser("list-users", help="List all users")
+    list_users_parser = subparsers.add_parser("list-users", parents=[common], help="List all users")
     list_users_parser.add_argument("--id", type=int, help="Filter by user ID")
     
     # Add project command
-    add_project_parser = subparsers.add_parser("add-project", help="Add a new project")
+    add_project_parser = subparsers.add_parser("add-project", parents=[common], help="Add a new project")
     add_project_parser.add_argument("--user", required=True, help="User name or ID")
     add_project_parser.add_argument("--title", required=True, help="Project title")
     add_project_parser.add_argument("--description", help="Project description")
     add_project_parser.add_argument("--due-date", help="Project due date (YYYY-MM-DD)")
     
     # List projects command
-    list_projects_parser = subparsers.add_parser("list-projects", help="List all projects")
+    list_projects_parser = subparsers.add_parser("list-projects", parents=[common], help="List all projects")
     list_projects_parser.add_argument("--user", help="Filter by user name or ID")
     list_projects_parser.add_argument("--id", type=int, help="Filter by project ID")
+    due_group = list_projects_parser.add_mutually_exclusive_group()
+    due_group.add_argument("--overdue", action="store_true", help="Only projects past their due date")
+    due_group.add_argument("--due-within", type=int, metavar="DAYS", help="Only projects due in the next DAYS days")
+    list_projects_parser.add_argument("--sort-by", choices=operations.PROJECT_SORTS, help="Order projects by this field")
+    list_projects_parser.add_argument("--group-by", choices=operations.PROJECT_GROUPS, help="One table per owner")
+    list_projects_parser.add_argument("--top", type=int, metavar="N", help="Only the first N projects (per group when grouped)")
     
     # Add task command
-    add_task_parser = subparsers.add_parser("add-task", help="Add a new task")
+    add_task_parser = subparsers.add_parser("add-task", parents=[common], help="Add a new task")
     add_task_parser.add_argument("--project", required=True, help="Project title or ID")
     add_task_parser.add_argument("--title", required=True, help="Task title")
     add_task_parser.add_argument("--description", help="Task description")
     add_task_parser.add_argument("--assign", help="Assign to user (name or ID)")
+    add_task_parser.add_argument("--depends-on", action="append", help="Task (title or ID) this one depends on; repeatable")
     
     # List tasks command
-    list_tasks_parser = subparsers.add_parser("list-tasks", help="List all tasks")
+    list_tasks_parser = subparsers.add_parser("list-tasks", parents=[common], help="List all tasks")
     list_tasks_parser.add_argument("--project", help="Filter by project title or ID")
     list_tasks_parser.add_argument("--status", help="Filter by status")
+    list_tasks_parser.add_argument("--mmap", action="store_true", help="Query the read-only task index instead of loading tasks.json")
+    dependency_group = list_tasks_parser.add_mutually_exclusive_group()
+    dependency_group.add_argument("--ready", action="store_true", help="Only open tasks whose dependencies are all done")
+    dependency_group.add_argument("--blocked", action="store_true", help="Only open tasks waiting on another task")
+    dependency_group.add_argument("--critical-path", action="store_true",
+                                  help="The project's longest chain of open dependent tasks, in order")
+    list_tasks_parser.add_argument("--include-archived", action="store_true",
+                                   help="Also list tasks moved to the archive, read after the live ones")
+    list_tasks_parser.add_argument("--sort-by", choices=operations.TASK_SORTS, help="Order tasks by this field")
+    list_tasks_parser.add_argument("--group-by", choices=operations.TASK_GROUPS, help="One table per project, assignee or status")
+    list_tasks_parser.add_argument("--top", type=int, metavar="N", help="Only the first N tasks (per group when grouped)")
+    
+    # Index tasks command
+    subparsers.add_parser("index-tasks", parents=[common], help="Build the read-only, memory-mapped task index")
+    
+    # Shard tasks command
+    subparsers.add_parser("shard-tasks", parents=[common], help="Split the task store into one file per project")
     
     # Complete task command
-    complete_task_parser = subparsers.add_parser("complete-task", help="Mark a task as completed")
+    complete_task_parser = subparsers.add_parser("complete-task", parents=[common], help="Mark a task as completed")
     complete_task_parser.add_argument("--task", required=True, help="Task title or ID")
     
     # Update task command
-    update_task_parser = subparsers.add_parser("update-task", help="Update a task")
+    update_task_parser = subparsers.add_parser("update-task", parents=[common], help="Update a task")
     update_task_parser.add_argument("--task", required=True, help="Task title or ID")
     update_task_parser.add_argument("--title", help="New task title")
     update_task_parser.add_argument("--description", help="New task description")
     update_task_parser.add_argument("--status", help="New task status")
     update_task_parser.add_argument("--assign", help="Assign to user (name or ID, or 'none' to unassign)")
-    
-    args = parser.parse_args()
+    update_task_parser.add_argument("--depends-on", action="append", help="Add a dependency (task title or ID); repeatable")
+    update_task_parser.add_argument("--remove-dependency", action="append", help="Remove a dependency (task title or ID); repeatable")
+    
+    # Report command
+    report_parser = subparsers.add_parser("report", parents=[common], help="Task throughput report from the event log")
+    report_parser.add_argument("--days", type=int, default=30, help="Report on the last DAYS days (default 30)")
+    report_parser.add_argument("--since", help="Window start date (overrides --days)")
+    report_parser.add_argument("--until", help="Window end date (default now)")
+    
+    # Watch command
+    watch_parser = subparsers.add_parser("watch", parents=[common], help="Stream changes as they are committed")
+    watch_parser.add_argument("--cursor", type=int, help="Resume after this cursor (default: only new changes)")
+    watch_parser.add_argument("--once", action="store_true", help="Print changes after --cursor (default 0) and exit")
+    watch_parser.add_argument("--interval", type=float, default=change_feed.POLL_INTERVAL,
+                              help="Seconds between checks for new changes")
+    
+    # Validate command
+    subparsers.add_parser("validate", parents=[common], help="Check the whole store and report every problem found")
+    
+    # Snapshot command
+    snapshot_parser = subparsers.add_parser("snapshot", parents=[common], help="Write a consistent, compressed backup of all data")
+    snapshot_parser.add_argument("--file", help="Archive path (default snapshot-<timestamp>.jsonl.gz)")
+    
+    # Restore command
+    restore_parser = subparsers.add_parser("restore", parents=[common], help="Replace all data with a snapshot")
+    restore_parser.add_argument("--file", required=True, help="Archive written by the snapshot command")
+    restore_parser.add_argument("--force", action="store_true", help="Replace existing data")
+    restore_parser.add_argument("--check", action="store_true", help="Only verify the archive")
+    
+    # Compress store command
+    compress_parser = subparsers.add_parser("compress-store", parents=[common],
+                                            help="Rewrite the data files gzip/zstd-compressed (or uncompressed)")
+    compress_parser.add_argument("--format", required=True, choices=file_handler.COMPRESSION_FORMATS,
+                                 help="Compression to use; reads detect the format automatically")
+    
+    # Archive command
+    archive_parser = subparsers.add_parser("archive", parents=[common],
+                                           help="Move long-closed tasks to the compressed, append-only archive")
+    archive_parser.add_argument("--older-than", type=int, default=archive.DEFAULT_DAYS, metavar="DAYS",
+                                help=f"Archive tasks closed more than DAYS days ago (default {archive.DEFAULT_DAYS})")
+    
+    # Shell command
+    subparsers.add_parser("shell", parents=[common], help="Interactive shell that keeps data loaded between commands")
+    
+    return parser
+
+# Set PM_TRACE to a file to append every command to it, one JSON line each, for
+# benchmarks/replay.py
+TRACE_ENV = 'PM_TRACE'
+
+def record_invocation(argv):
+    path = os.environ.get(TRACE_ENV)
+    if not path:
+        return
+    line = json.dumps({'time': time.time(), 'argv': argv}) + "\n"
+    # One append per command, so concurrent invocations don't interleave
+    with open(path, 'a') as f:
+        f.write(line)
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command is not None:
+        record_invocation(sys.argv[1:] if argv is None else list(argv))
     
     # Handle commands
-    if args.command == "add-user":
-        handle_add_user(args)
-    elif args.command == "list-users":
-        handle_list_users(args)
-    elif args.command == "add-project":
-        handle_add_project(args)
-    elif args.command == "list-projects":
-        handle_list_projects(args)
-    elif args.command == "add-task":
-        handle_add_task(args)
-    elif args.command == "list-tasks":
-        handle_list_tasks(args)
-    elif args.command == "complete-task":
-        handle_complete_task(args)
-    elif args.command == "update-task":
-        handle_update_task(args)
-    else:
+    handler = HANDLERS.get(args.command)
+    if handler is None:
         parser.print_help()
+        return
+    
+    try:
+        # Validates both --workspace and $PM_WORKSPACE
+        workspace = file_handler.check_workspace(args.workspace or file_handler.current_workspace())
+    except ValueError as e:
+        render(Result.error(str(e)), args.output)
+        return
+    
+    cache_fill = file_handler.skip_cache_fill() if args.command in WRITE_COMMANDS else nullcontext()
+    with file_handler.workspace(workspace), cache_fill:
+        repo = Repository()
+        try:
+            result = handler(args, repo)
+        except file_handler.CompressionError as e:
+            result = Result.error(str(e))
+        if repo.archive_error is not None:
+            result.warn(f"Automatic archiving failed: {repo.archive_error}")
+        render(result, args.output)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
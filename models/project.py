@@ -91,7 +91,7 @@ class Project:
             'description': self._description,
             'due_date': self._due_date.isoformat(),
             'user_id': self._user_id,
-            'tasks': self._tasks
+            'tasks': list(self._tasks)
         }
     
     @classmethod
@@ -111,6 +111,23 @@ class Project:
             
         return project
     
+    @classmethod
+    def from_trusted_dicts(cls, records):
+        # As User.from_trusted_dicts; due dates are always written as ISO 8601, so
+        # fromisoformat is enough
+        new = cls.__new__
+        fromisoformat = datetime.fromisoformat
+        projects = []
+        for data in records:
+            project = new(cls)
+            project.__dict__ = {'_id': data['id'], '_title': data['title'], '_description': data['description'],
+                                '_user_id': data['user_id'], '_tasks': data['tasks'],
+                                '_due_date': fromisoformat(data['due_date'])}
+            projects.append(project)
+        if projects:
+            cls._next_id = max(cls._next_id, max(data['id'] for data in records) + 1)
+        return projects
+    
     def __str__(self):
         return f"Project(id={self._id}, title={self._title}, due_date={self._due_date.strftime('%Y-%m-%d')}, tasks={len(self._tasks)})"
     
@@ -14,6 +14,8 @@ class Task:
         self._project_id = project_id
         self._assigned_to = assigned_to
         self._status = status
+        # IDs of tasks that must be finished before this one
+        self._depends_on = []
         
         if not title or not isinstance(title, str):
             raise ValueError("Title must be a non-empty string")
@@ -67,6 +69,18 @@ class Task:
             raise ValueError(f"Status must be one of: {', '.join(Task.VALID_STATUSES)}")
         self._status = value
     
+    @property
+    def depends_on(self):
+        return self._depends_on
+    
+    def add_dependency(self, task_id):
+        if task_id not in self._depends_on:
+            self._depends_on.append(task_id)
+    
+    def remove_dependency(self, task_id):
+        if task_id in self._depends_on:
+            self._depends_on.remove(task_id)
+    
     def mark_completed(self):
         self._status = 'completed'
     
@@ -77,7 +91,8 @@ class Task:
             'description': self._description,
             'status': self._status,
             'project_id': self._project_id,
-            'assigned_to': self._assigned_to
+            'assigned_to': self._assigned_to,
+            'depends_on': list(self._depends_on)
         }
     
     @classmethod
@@ -90,6 +105,8 @@ class Task:
             data['status']
         )
         task._id = data['id']
+        # Older files have no dependencies
+        task._depends_on = list(data.get('depends_on', []))
         
         # Update next_id to avoid ID collisions
         if task._id >= cls._next_id:
@@ -97,6 +114,27 @@ class Task:
             
         return task
     
+    @classmethod
+    def from_trusted_dicts(cls, records):
+        # As User.from_trusted_dicts; records from before dependencies have no depends_on
+        new = cls.__new__
+        tasks = []
+        for data in records:
+            task = new(cls)
+            task.__dict__ = {'_id': data['id'], '_title': data['title'], '_description': data['description'],
+                             '_project_id': data['project_id'], '_assigned_to': data['assigned_to'],
+                             '_status': data['status'], '_depends_on': list(data.get('depends_on', ()))}
+            tasks.append(task)
+        if tasks:
+            cls._next_id = max(cls._next_id, max(data['id'] for data in records) + 1)
+        return tasks
+    
+    @classmethod
+    def from_trusted_dict(cls, data):
+        # One record read back from a store we wrote (the archive, the task index);
+        # from_dict would validate it again and use up an ID
+        return cls.from_trusted_dicts([data])[0]
+    
     def __str__(self):
         return f"Task(id={self._id}, title={self._title}, status={self._status})"
     
@@ -51,7 +51,7 @@ class User:
             'id': self._id,
             'name': self._name,
             'email': self._email,
-            'projects': self._projects
+            'projects': list(self._projects)
         }
     
     @classmethod
@@ -66,6 +66,21 @@ class User:
             
         return user
     
+    @classmethod
+    def from_trusted_dicts(cls, records):
+        # Bulk load of records this program wrote itself: skips the constructor's
+        # validation and bumps the ID counter once instead of per record
+        new = cls.__new__
+        users = []
+        for data in records:
+            user = new(cls)
+            user.__dict__ = {'_id': data['id'], '_name': data['name'], '_email': data['email'],
+                             '_projects': data['projects']}
+            users.append(user)
+        if users:
+            cls._next_id = max(cls._next_id, max(data['id'] for data in records) + 1)
+        return users
+    
     def __str__(self):
         return f"User(id={self._id}, name={self._name}, email={self._email}, projects={len(self._projects)})"
     
@@ -0,0 +1,166 @@
+# tests/test_archive.py
+import unittest
+import asyncio
+import os
+import json
+import tempfile
+import shutil
+import sys
+import time
+from unittest.mock import patch
+from contextlib import redirect_stdout
+from io import StringIO
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.task import Task
+from utils import archive, file_handler, snapshot, validation
+from utils.async_service import AsyncTaskService
+from utils.shell import Shell
+import main
+
+class TestArchive(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.patcher = patch('utils.file_handler.DATA_DIR', self.temp_dir)
+        self.patcher.start()
+
+        self.cli('add-user', '--name', 'Ann', '--email', 'ann@example.com')
+        self.cli('add-project', '--user', 'Ann', '--title', 'Website')
+        for title in ('Done', 'Dropped', 'Base', 'Open'):
+            self.cli('add-task', '--project', 'Website', '--title', title)
+        self.cli('add-task', '--project', 'Website', '--title', 'Later', '--depends-on', 'Base')
+        self.cli('complete-task', '--task', 'Done')
+        self.cli('update-task', '--task', 'Dropped', '--status', 'cancelled')
+        self.cli('complete-task', '--task', 'Base')
+
+    def tearDown(self):
+        self.patcher.stop()
+        shutil.rmtree(self.temp_dir)
+
+    def cli(self, *argv):
+        with redirect_stdout(StringIO()) as out:
+            main.main(list(argv) + ['--output', 'json'])
+        return json.loads(out.getvalue().splitlines()[0])
+
+    def titles(self, result):
+        return [task['title'] for task in result['items']]
+
+    def archived_titles(self):
+        return [record['title'] for record in file_handler.iter_archive_records()]
+
+    def test_archive_and_list(self):
+        result = self.cli('archive', '--older-than', '0')
+        self.assertEqual(result['status'], 'success')
+        # Base is closed, but Later still depends on it
+        self.assertEqual(self.archived_titles(), ['Done', 'Dropped'])
+        self.assertEqual(self.titles(self.cli('list-tasks')), ['Base', 'Open', 'Later'])
+        self.assertEqual(self.titles(self.cli('list-tasks', '--include-archived')),
+                         ['Base', 'Open', 'Later', 'Done', 'Dropped'])
+        self.assertEqual(self.titles(self.cli('list-tasks', '--include-archived', '--status', 'cancelled')),
+                         ['Dropped'])
+        self.assertEqual(self.titles(self.cli('list-tasks', '--include-archived', '--sort-by', 'title', '--top', '2')),
+                         ['Base', 'Done'])
+
+        # Nothing left to archive
+        self.assertEqual(self.cli('archive', '--older-than', '0')['status'], 'warning')
+        self.assertEqual(validation.validate_store()['violations'], [])
+
+    def test_archived_ids_stay_taken(self):
+        last = self.cli('add-task', '--project', 'Website', '--title', 'Last')['item']['id']
+        self.cli('complete-task', '--task', 'Last')
+        self.cli('archive', '--older-than', '0')
+        # As in a new process, where only the hot store has been read
+        with patch.object(Task, '_next_id', 1):
+            self.assertEqual(self.cli('add-task', '--project', 'Website', '--title', 'New')['item']['id'], last + 1)
+
+    def test_recent_and_reopened_tasks_stay_hot(self):
+        self.assertEqual(self.cli('archive', '--older-than', '30')['status'], 'warning')
+        self.cli('update-task', '--task', 'Dropped', '--status', 'pending')
+        with file_handler.data_lock():
+            archived, remaining = archive.archive_tasks(30, now=time.time() + 31 * 86400)
+        self.assertEqual((archived, remaining), (1, 4))
+        self.assertEqual(self.archived_titles(), ['Done'])
+
+    def test_sharded_store(self):
+        self.cli('shard-tasks')
+        self.cli('archive', '--older-than', '0')
+        self.assertEqual(self.titles(self.cli('list-tasks', '--project', 'Website')), ['Base', 'Open', 'Later'])
+        self.assertEqual(len(self.cli('list-tasks', '--project', 'Website', '--include-archived')['items']), 5)
+
+    def test_torn_append_is_ignored(self):
+        self.cli('archive', '--older-than', '0')
+        # A pass that died mid-write, before committing to the manifest
+        with open(os.path.join(self.temp_dir, file_handler.ARCHIVE_FILE), 'ab') as f:
+            f.write(b'\x1f\x8b\x08 torn')
+        self.assertEqual(self.archived_titles(), ['Done', 'Dropped'])
+
+        self.cli('update-task', '--task', 'Later', '--remove-dependency', 'Base')
+        self.cli('archive', '--older-than', '0')
+        self.assertEqual(self.archived_titles(), ['Done', 'Dropped', 'Base'])
+
+    def test_automatic_policy(self):
+        with patch.dict(os.environ, {archive.ARCHIVE_AFTER_ENV: '0'}):
+            self.cli('complete-task', '--task', 'Open')
+            self.assertEqual(self.archived_titles(), ['Done', 'Dropped', 'Open'])
+            # The next pass isn't due for another ARCHIVE_INTERVAL
+            self.cli('update-task', '--task', 'Later', '--status', 'cancelled')
+            self.assertEqual(len(self.archived_titles()), 3)
+            with patch('utils.archive.ARCHIVE_INTERVAL', 0):
+                self.cli('add-task', '--project', 'Website', '--title', 'Next')
+            self.assertEqual(self.archived_titles(), ['Done', 'Dropped', 'Open', 'Base', 'Later'])
+
+        with patch.dict(os.environ, {archive.ARCHIVE_AFTER_ENV: 'soon'}):
+            with self.assertRaises(archive.ArchiveError):
+                archive.auto_archive()
+            # The task is still saved; the failure rides along in the command's one result
+            with redirect_stdout(StringIO()) as out:
+                main.main(['add-task', '--project', 'Website', '--title', 'Saved', '--output', 'json'])
+            lines = out.getvalue().splitlines()
+            self.assertEqual(len(lines), 1)
+            result = json.loads(lines[0])
+            self.assertEqual(result['status'], 'warning')
+            self.assertIn("Automatic archiving failed", result['message'])
+            self.assertEqual(result['item']['title'], 'Saved')
+    
+    def test_automatic_policy_in_shell(self):
+        shell = Shell(main.build_parser(), main.HANDLERS, output='json', idle_flush=60)
+        with patch.dict(os.environ, {archive.ARCHIVE_AFTER_ENV: '0'}), redirect_stdout(StringIO()):
+            shell.onecmd('complete-task --task Open')
+            if shell._timer is not None:
+                shell._timer.cancel()
+            shell.commit()
+            self.assertEqual(self.archived_titles(), ['Done', 'Dropped', 'Open'])
+            # The archived tasks are gone from the shell's memory too, so saving doesn't bring them back
+            shell.onecmd('add-task --project Website --title Next')
+            shell.commit()
+        self.assertEqual(self.titles(self.cli('list-tasks')), ['Base', 'Later', 'Next'])
+    
+    def test_automatic_policy_in_async_service(self):
+        async def scenario():
+            service = await AsyncTaskService.open()
+            await service.complete_task('Open')
+            await service._writer
+            await service.add_task('Website', 'Next')
+            await service._writer
+            return [task.title for task in await service.list_tasks()]
+        
+        with patch.dict(os.environ, {archive.ARCHIVE_AFTER_ENV: '0'}):
+            titles = asyncio.run(scenario())
+        self.assertEqual(titles, ['Base', 'Later', 'Next'])
+        self.assertEqual(self.archived_titles(), ['Done', 'Dropped', 'Open'])
+        self.assertEqual(self.titles(self.cli('list-tasks')), ['Base', 'Later', 'Next'])
+
+    def test_snapshot_round_trip(self):
+        self.cli('archive', '--older-than', '0')
+        path = os.path.join(self.temp_dir, 'backup.jsonl.gz')
+        counts = snapshot.create_snapshot(path)
+        self.assertEqual((counts['tasks'], counts['archived']), (3, 2))
+
+        snapshot.restore_snapshot(path, force=True)
+        self.assertEqual(self.archived_titles(), ['Done', 'Dropped'])
+        self.assertEqual(self.titles(self.cli('list-tasks')), ['Base', 'Open', 'Later'])
+
+if __name__ == "__main__":
+    unittest.main()
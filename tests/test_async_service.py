@@ -0,0 +1,81 @@
+# tests/test_async_service.py
+import unittest
+import asyncio
+import os
+import json
+import tempfile
+import shutil
+import sys
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils import change_feed, file_handler
+from utils.async_service import AsyncTaskService
+from utils.operations import OperationError, OperationWarning
+
+class TestAsyncTaskService(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.patcher = patch('utils.file_handler.DATA_DIR', self.temp_dir)
+        self.patcher.start()
+        self.service = await AsyncTaskService.open()
+        await self.service.add_user("Async User", "async@example.com")
+        await self.service.add_project("Async User", "Async Project", "", "2030-01-01")
+    
+    async def asyncTearDown(self):
+        self.patcher.stop()
+        shutil.rmtree(self.temp_dir)
+    
+    def read_tasks(self):
+        with open(os.path.join(self.temp_dir, 'tasks.json'), 'r') as f:
+            return json.load(f)
+    
+    async def test_concurrent_adds_are_all_persisted(self):
+        await asyncio.gather(*[
+            self.service.add_task("Async Project", f"Task {i}", "", "Async User")
+            for i in range(50)
+        ])
+        
+        tasks = await self.service.list_tasks("Async Project")
+        self.assertEqual(len(tasks), 50)
+        self.assertEqual(len({task.id for task in tasks}), 50)
+        self.assertEqual(len(self.read_tasks()), 50)
+    
+    async def test_update_and_complete(self):
+        task = await self.service.add_task("Async Project", "Ship", "", None)
+        await self.service.update_task(str(task.id), status="in_progress")
+        await self.service.complete_task("Ship")
+        
+        self.assertEqual(self.read_tasks()[0]['status'], 'completed')
+        with self.assertRaises(OperationWarning):
+            await self.service.complete_task("Ship")
+    
+    async def test_watch(self):
+        feed = self.service.watch(change_feed.end_cursor(), interval=0.01)
+        await self.service.add_task("Async Project", "Watched", "", None)
+        
+        changes, cursor = await asyncio.wait_for(feed.__anext__(), 5)
+        self.assertEqual([change['event'] for change in changes], ['task_created'])
+        await feed.aclose()
+    
+    async def test_errors_do_not_persist(self):
+        with self.assertRaises(OperationError):
+            await self.service.add_task("Missing Project", "Nope")
+        
+        tasks = await self.service.list_tasks()
+        self.assertEqual(tasks, [])
+    
+    async def test_failed_write_is_reported_and_retried(self):
+        failure = file_handler.CompressionError("no zstandard")
+        with patch('utils.repository.Repository.write_snapshot', side_effect=failure):
+            with self.assertRaises(file_handler.CompressionError):
+                await asyncio.wait_for(self.service.add_task("Async Project", "Pending"), 5)
+        
+        # Still pending, so the next write saves it
+        await asyncio.wait_for(self.service.add_task("Async Project", "Next"), 5)
+        self.assertEqual([task['title'] for task in self.read_tasks()], ["Pending", "Next"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+# tests/test_benchmarks.py
+import unittest
+import os
+import tempfile
+import shutil
+import sys
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.generate_data import generate_dataset
+from benchmarks.replay import load_trace, percentile, replay
+from benchmarks.run_benchmarks import UNBENCHMARKED, build_scenarios, compare_to_baseline
+from utils.file_handler import load_users, load_projects, load_tasks
+from utils.shell import Shell
+import main
+
+class TestGenerateData(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def read_all(self, directory):
+        contents = {}
+        for name in ['users.json', 'projects.json', 'tasks.json']:
+            with open(os.path.join(directory, name), 'r') as f:
+                contents[name] = f.read()
+        return contents
+    
+    def test_same_seed_same_data(self):
+        other_dir = os.path.join(self.temp_dir, 'other')
+        generate_dataset(self.temp_dir, 500, seed=7)
+        generate_dataset(other_dir, 500, seed=7)
+        self.assertEqual(self.read_all(self.temp_dir), self.read_all(other_dir))
+    
+    def test_data_dir_compatible(self):
+        sizes = generate_dataset(self.temp_dir, 500, seed=1)
+        
+        with patch('utils.file_handler.DATA_DIR', self.temp_dir):
+            users = load_users()
+            projects = load_projects()
+            tasks = load_tasks()
+        
+        self.assertEqual(len(users), sizes['users'])
+        self.assertEqual(len(projects), sizes['projects'])
+        self.assertEqual(len(tasks), 500)
+        
+        # Every task is listed by exactly the project it points to
+        project_tasks = {project.id: set(project.tasks) for project in projects}
+        for task in tasks:
+            self.assertIn(task.id, project_tasks[task.project_id])
+        self.assertEqual(sum(len(project.tasks) for project in projects), 500)
+
+class TestBaselineComparison(unittest.TestCase):
+    def make_report(self, median):
+        return {"meta": {"scale": 1000}, "results": {"list-tasks": {"median": median}}}
+    
+    def test_regression_detected(self):
+        regressions = compare_to_baseline(self.make_report(2.0), self.make_report(1.0), 0.5)
+        self.assertEqual(regressions, [("list-tasks", 1.0, 2.0)])
+    
+    def test_within_threshold(self):
+        self.assertEqual(compare_to_baseline(self.make_report(1.2), self.make_report(1.0), 0.5), [])
+    
+    def test_scale_mismatch(self):
+        baseline = self.make_report(1.0)
+        baseline["meta"]["scale"] = 10000
+        with self.assertRaises(ValueError):
+            compare_to_baseline(self.make_report(1.0), baseline, 0.5)
+    
+    def test_every_subcommand_has_a_scenario(self):
+        covered = {argv[0] for _, argv, _ in build_scenarios(1000, '/tmp')}
+        self.assertEqual(covered | UNBENCHMARKED, set(main.HANDLERS))
+
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.trace = os.path.join(self.temp_dir, 'trace.jsonl')
+        self.data_dir = os.path.join(self.temp_dir, 'data')
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def test_recorded_trace(self):
+        with patch('utils.file_handler.DATA_DIR', self.data_dir), \
+                patch.dict(os.environ, {main.TRACE_ENV: self.trace}), patch('sys.stdout'):
+            main.main(['add-user', '--name', 'Alex', '--email', 'alex@example.com'])
+            main.main(['list-users', '--output', 'json'])
+            # Lines run inside a shell session are traced one by one
+            shell = Shell(main.build_parser(), main.HANDLERS, record=main.record_invocation)
+            shell.execute(['list-users'])
+        with open(self.trace, 'a') as f:
+            f.write('# by hand\n')
+            f.write('python main.py list-projects --user "Alex"\n')
+            f.write('watch\n')
+            f.write('shell\n')
+            f.write('no-such-command\n')
+        
+        commands, skipped = load_trace(self.trace)
+        self.assertEqual(commands, [
+            ('add-user', ['add-user', '--name', 'Alex', '--email', 'alex@example.com']),
+            ('list-users', ['list-users', '--output', 'json']),
+            ('list-users', ['list-users']),
+            ('list-projects', ['list-projects', '--user', 'Alex']),
+        ])
+        self.assertEqual([number for number, _ in skipped], [6, 7, 8])
+    
+    def test_replay(self):
+        commands = [
+            ('add-user', ['add-user', '--name', 'Alex', '--email', 'alex@example.com']),
+            ('list-users', ['list-users']),
+            ('list-users', ['list-users', '--id', '1']),
+            ('complete-task', ['complete-task', '--task', 'missing']),
+        ]
+        os.makedirs(self.data_dir)
+        summary = replay(commands, self.data_dir, concurrency=1)
+        
+        self.assertEqual(summary['commands'], 4)
+        self.assertEqual(summary['errors'], 1)
+        self.assertEqual(summary['subcommands']['list-users']['count'], 2)
+        self.assertEqual(summary['subcommands']['complete-task']['errors'], 1)
+        self.assertGreater(summary['subcommands']['add-user']['write_bytes'], 0)
+        self.assertIn('p99_ms', summary['subcommands']['add-user'])
+        # The scratch directory got the writes
+        with patch('utils.file_handler.DATA_DIR', self.data_dir):
+            self.assertEqual([user.name for user in load_users()], ["Alex"])
+    
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 0.5), 50)
+        self.assertEqual(percentile(values, 0.99), 99)
+        self.assertEqual(percentile([7], 0.99), 7)
+
+if __name__ == "__main__":
+    unittest.main()
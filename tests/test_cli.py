@@ -136,5 +136,203 @@ class TestCLI(unittest.TestCase):
         self.assertEqual(tasks_data[0]['description'], 'Updated Description')
         self.assertEqual(tasks_data[0]['status'], 'in_progress')
 
+    def test_list_tasks_mmap(self):
+        with patch('sys.argv', ['main.py', 'list-tasks', '--mmap']):
+            with capture_output() as (out, err):
+                main.main()
+        self.assertIn("index-tasks", out.getvalue())
+        
+        with patch('sys.argv', ['main.py', 'index-tasks']):
+            with capture_output() as (out, err):
+                main.main()
+        
+        with patch('sys.argv', ['main.py', 'list-tasks', '--mmap', '--project', 'Test Project']):
+            with capture_output() as (out, err):
+                main.main()
+        self.assertIn("Test Task", out.getvalue())
+
+    def test_shard_tasks(self):
+        with patch('sys.argv', ['main.py', 'shard-tasks']):
+            with capture_output() as (out, err):
+                main.main()
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir, 'tasks.json')))
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir, 'tasks', f'project-{self.test_project.id}.json')))
+        
+        with patch('sys.argv', ['main.py', 'add-task', '--project', 'Test Project', '--title', 'Sharded Task']):
+            with capture_output() as (out, err):
+                main.main()
+        
+        with patch('sys.argv', ['main.py', 'list-tasks', '--project', 'Test Project']):
+            with capture_output() as (out, err):
+                main.main()
+        self.assertIn("Test Task", out.getvalue())
+        self.assertIn("Sharded Task", out.getvalue())
+
+    def test_json_output(self):
+        with patch('sys.argv', ['main.py', 'list-tasks', '--output', 'json']):
+            with capture_output() as (out, err):
+                main.main()
+        
+        result = json.loads(out.getvalue())
+        self.assertEqual(result['status'], 'ok')
+        self.assertEqual(result['kind'], 'tasks')
+        self.assertEqual([task['title'] for task in result['items']], ['Test Task'])
+    
+    def test_jsonl_error_output(self):
+        with patch('sys.argv', ['main.py', 'complete-task', '--task', 'Missing', '--output', 'jsonl']):
+            with capture_output() as (out, err):
+                main.main()
+        
+        result = json.loads(out.getvalue())
+        self.assertEqual(result['status'], 'error')
+        self.assertIn("Missing", result['message'])
+    
+    def test_handlers_return_results(self):
+        args = main.build_parser().parse_args(['add-user', '--name', 'Quiet User', '--email', 'quiet@example.com'])
+        result = main.handle_add_user(args)
+        self.assertTrue(result.ok)
+        self.assertEqual(result.item.name, 'Quiet User')
+
+    def test_list_projects_overdue(self):
+        # The fixture project was due 2023-12-31
+        with patch('sys.argv', ['main.py', 'list-projects', '--overdue', '--output', 'json']):
+            with capture_output() as (out, err):
+                main.main()
+        self.assertEqual([p['title'] for p in json.loads(out.getvalue())['items']], ['Test Project'])
+        
+        with patch('sys.argv', ['main.py', 'list-projects', '--due-within', '7', '--output', 'json']):
+            with capture_output() as (out, err):
+                main.main()
+        self.assertEqual(json.loads(out.getvalue())['items'], [])
+
+    def test_prefix_and_fuzzy_names(self):
+        # A unique prefix resolves, by scanning rather than building the name index
+        with patch('sys.argv', ['main.py', 'complete-task', '--task', 'test t']), \
+                patch('utils.repository.NameIndex', side_effect=AssertionError("built the index")):
+            with capture_output() as (out, err):
+                main.main()
+        with open(os.path.join(self.temp_dir, 'tasks.json'), 'r') as f:
+            self.assertEqual(json.load(f)[0]['status'], 'completed')
+        
+        # A typo gets a suggestion instead of a bare "not found"
+        with patch('sys.argv', ['main.py', 'list-projects', '--user', 'Tset User', '--output', 'json']):
+            with capture_output() as (out, err):
+                main.main()
+        result = json.loads(out.getvalue())
+        self.assertEqual(result['status'], 'error')
+        self.assertIn("Did you mean: Test User", result['message'])
+    
+    def test_ambiguous_prefix(self):
+        with patch('sys.argv', ['main.py', 'add-user', '--name', 'Test Userson', '--email', 'tu@example.com']):
+            with capture_output() as (out, err):
+                main.main()
+        
+        with patch('sys.argv', ['main.py', 'list-projects', '--user', 'test', '--output', 'json']):
+            with capture_output() as (out, err):
+                main.main()
+        result = json.loads(out.getvalue())
+        self.assertEqual(result['status'], 'error')
+        self.assertIn("ambiguous", result['message'])
+        self.assertIn("Test Userson", result['message'])
+
+    def test_report(self):
+        for argv in (['update-task', '--task', 'Test Task', '--status', 'in_progress'],
+                     ['complete-task', '--task', 'Test Task'],
+                     ['report', '--days', '1', '--output', 'json']):
+            with patch('sys.argv', ['main.py'] + argv):
+                with capture_output() as (out, err):
+                    main.main()
+        
+        report = json.loads(out.getvalue())['data']
+        self.assertEqual(sum(report['completions_per_day'].values()), 1)
+        self.assertEqual(report['completions_by_assignee'], {str(self.test_user.id): 1})
+        self.assertIn('in_progress', report['average_time_in_status'])
+
+    def test_dependencies(self):
+        def run(*argv):
+            with patch('sys.argv', ['main.py'] + list(argv) + ['--output', 'json']):
+                with capture_output() as (out, err):
+                    main.main()
+            return json.loads(out.getvalue())
+        
+        run('add-task', '--project', 'Test Project', '--title', 'Release', '--depends-on', 'Test Task')
+        self.assertEqual([task['title'] for task in run('list-tasks', '--ready')['items']], ['Test Task'])
+        self.assertEqual([task['title'] for task in run('list-tasks', '--blocked')['items']], ['Release'])
+        self.assertEqual([task['title'] for task in run('list-tasks', '--project', 'Test Project', '--critical-path')['items']],
+                         ['Test Task', 'Release'])
+        
+        result = run('update-task', '--task', 'Test Task', '--depends-on', 'Release')
+        self.assertEqual(result['status'], 'error')
+        self.assertIn("cycle", result['message'])
+        
+        run('complete-task', '--task', 'Test Task')
+        self.assertEqual([task['title'] for task in run('list-tasks', '--ready')['items']], ['Release'])
+        
+        run('update-task', '--task', 'Release', '--remove-dependency', 'Test Task')
+        with open(os.path.join(self.temp_dir, 'tasks.json'), 'r') as f:
+            self.assertEqual([task['depends_on'] for task in json.load(f)], [[], []])
+
+    def test_sort_group_and_top(self):
+        def run(*argv):
+            with patch('sys.argv', ['main.py'] + list(argv) + ['--output', 'json']):
+                with capture_output() as (out, err):
+                    main.main()
+            return json.loads(out.getvalue())
+        
+        def titles(result):
+            return [task['title'] for task in result['items']]
+        
+        run('add-project', '--user', 'Test User', '--title', 'Another Project', '--due-date', '2023-06-30')
+        run('add-task', '--project', 'Another Project', '--title', 'Beta')
+        run('add-task', '--project', 'Test Project', '--title', 'Alpha', '--assign', 'Test User')
+        run('update-task', '--task', 'Alpha', '--status', 'in_progress')
+        
+        self.assertEqual(titles(run('list-tasks', '--sort-by', 'title')), ['Alpha', 'Beta', 'Test Task'])
+        self.assertEqual(titles(run('list-tasks', '--sort-by', 'title', '--top', '2')), ['Alpha', 'Beta'])
+        self.assertEqual(titles(run('list-tasks', '--sort-by', 'due-date')), ['Beta', 'Test Task', 'Alpha'])
+        self.assertEqual(titles(run('list-tasks', '--sort-by', 'assignee')), ['Test Task', 'Alpha', 'Beta'])
+        self.assertEqual(titles(run('list-tasks', '--top', '1')), ['Test Task'])
+        
+        result = run('list-tasks', '--group-by', 'status', '--sort-by', 'title', '--top', '1')
+        self.assertEqual(result['data']['groups'], [{'group': 'pending', 'count': 1, 'total': 2},
+                                                    {'group': 'in_progress', 'count': 1, 'total': 1}])
+        self.assertEqual(titles(result), ['Beta', 'Alpha'])
+        
+        result = run('list-projects', '--sort-by', 'due-date', '--top', '1')
+        self.assertEqual([project['title'] for project in result['items']], ['Another Project'])
+        result = run('list-projects', '--group-by', 'owner')
+        self.assertEqual(result['data']['groups'], [{'group': 'Test User', 'count': 2, 'total': 2}])
+        
+        self.assertEqual(run('list-tasks', '--top', '0')['status'], 'error')
+        self.assertEqual(run('list-tasks', '--project', 'Test Project', '--critical-path', '--top', '1')['status'], 'error')
+        
+        # Grouped tables get one table per group
+        with patch('sys.argv', ['main.py', 'list-tasks', '--group-by', 'project', '--top', '1']):
+            with capture_output() as (out, err):
+                main.main()
+        self.assertIn("Tasks: Another Project (1)", out.getvalue())
+        self.assertIn("Tasks: Test Project (1 of 2)", out.getvalue())
+
+    def test_table_output(self):
+        def run(*argv):
+            with patch('sys.argv', ['main.py'] + list(argv)):
+                with capture_output() as (out, err):
+                    main.main()
+            return out.getvalue()
+        
+        run('add-task', '--project', 'Test Project', '--title', 'Release')
+        output = run('list-tasks')
+        for text in ("Test Task", "Release", "Test Project", "Test User", "Unassigned", "pending"):
+            self.assertIn(text, output)
+        
+        # Long listings are laid out without Rich
+        with patch('utils.cli_helpers.PLAIN_TABLE_ROWS', 1):
+            lines = run('list-tasks').splitlines()
+        header = lines.index(next(line for line in lines if line.startswith("ID")))
+        self.assertEqual(lines[header].split(), ["ID", "Title", "Project", "Assigned", "To", "Status"])
+        self.assertTrue(lines[header + 2].startswith(f"{self.test_task.id} "))
+        self.assertIn("Test User", lines[header + 2])
+        self.assertEqual(len(lines[header + 2]), len(lines[header + 1]))
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,140 @@
+# tests/test_event_log.py
+import unittest
+import os
+import tempfile
+import shutil
+import sys
+import json
+import threading
+from datetime import datetime
+from io import StringIO
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils import change_feed, event_log, operations
+from utils.repository import Repository
+from utils.event_log import TASK_CREATED, STATUS_CHANGED, REASSIGNED, NONE, status_code
+from utils.reports import throughput_report
+
+DAY = 86400
+
+class TestEventLog(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.patcher = patch('utils.file_handler.DATA_DIR', self.temp_dir)
+        self.patcher.start()
+    
+    def tearDown(self):
+        self.patcher.stop()
+        shutil.rmtree(self.temp_dir)
+    
+    def test_append_and_stream(self):
+        events = [event_log.make_event(STATUS_CHANGED, i, 0, 2, timestamp=float(i)) for i in range(10000)]
+        event_log.append_events(events[:6000])
+        event_log.append_events(events[6000:])
+        
+        self.assertEqual(event_log.count_events(), 10000)
+        self.assertEqual(list(event_log.iter_events()), events)
+        self.assertEqual(list(event_log.iter_events(start=9998)), events[9998:])
+    
+    def test_partial_record_ignored(self):
+        event_log.append_events([event_log.make_event(TASK_CREATED, 1, NONE, 1, timestamp=1.0)])
+        with open(os.path.join(self.temp_dir, event_log.EVENTS_FILE), 'ab') as f:
+            f.write(b'\x00' * 5)
+        self.assertEqual(len(list(event_log.iter_events())), 1)
+        
+        # The next append replaces the torn record instead of landing after it
+        second = event_log.make_event(TASK_CREATED, 2, NONE, 1, timestamp=2.0)
+        event_log.append_events([second])
+        self.assertEqual(event_log.count_events(), 2)
+        self.assertEqual(list(event_log.iter_events())[1], second)
+    
+    def test_missing_log(self):
+        self.assertEqual(list(event_log.iter_events()), [])
+        self.assertEqual(event_log.count_events(), 0)
+
+class TestThroughputReport(unittest.TestCase):
+    def test_report(self):
+        start = datetime(2024, 6, 1).timestamp()
+        pending, in_progress, completed = (status_code(s) for s in ('pending', 'in_progress', 'completed'))
+        events = [
+            (start, 1, TASK_CREATED, NONE, 1),
+            (start, 1, REASSIGNED, NONE, 7),
+            (start + DAY, 1, STATUS_CHANGED, pending, in_progress),
+            (start + 3 * DAY, 1, STATUS_CHANGED, in_progress, completed),
+            (start, 2, TASK_CREATED, NONE, 1),
+            (start + 2 * DAY, 2, STATUS_CHANGED, pending, completed),
+            # Task 3 predates the log: no creation event, assignee from the fallback
+            (start + 3 * DAY + 60, 3, STATUS_CHANGED, in_progress, completed),
+            # Outside the window
+            (start + 30 * DAY, 2, STATUS_CHANGED, completed, pending),
+        ]
+        
+        report = throughput_report(events, start, start + 10 * DAY, lambda task_id: 9)
+        
+        self.assertEqual(report['completions_per_day'], {'2024-06-03': 1, '2024-06-04': 2})
+        self.assertEqual(report['average_time_in_status'], {'pending': 1.5 * DAY, 'in_progress': 2 * DAY})
+        self.assertEqual(report['completions_by_assignee'], {9: 2, 7: 1})
+
+class TestChangeFeed(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.patcher = patch('utils.file_handler.DATA_DIR', self.temp_dir)
+        self.patcher.start()
+        
+        repo = Repository()
+        self.user = operations.add_user(repo, "Alex", "alex@example.com")
+        self.project = operations.add_project(repo, "Alex", "Website")
+        self.task = operations.add_task(repo, "Website", "Design")
+        repo.flush()
+        self.repo = repo
+    
+    def tearDown(self):
+        self.patcher.stop()
+        shutil.rmtree(self.temp_dir)
+    
+    def test_read_and_resume(self):
+        changes, cursor = change_feed.read_changes()
+        self.assertEqual([change['event'] for change in changes], ['project_added', 'task_created'])
+        self.assertEqual(changes[0]['project_id'], self.project.id)
+        self.assertEqual(changes[1]['cursor'], cursor)
+        
+        operations.update_task(self.repo, "Design", status="in_progress", assign="Alex")
+        self.repo.flush()
+        changes, cursor = change_feed.read_changes(cursor)
+        self.assertEqual(changes[0]['old_status'], 'pending')
+        self.assertEqual(changes[0]['new_status'], 'in_progress')
+        self.assertEqual(changes[1]['new_assignee'], self.user.id)
+        self.assertEqual(change_feed.read_changes(cursor), ([], cursor))
+        
+        with self.assertRaises(change_feed.CursorError):
+            change_feed.read_changes(cursor + 1)
+    
+    def test_watch(self):
+        received = []
+        
+        def write():
+            for status in ('in_progress', 'completed'):
+                operations.update_task(self.repo, "Design", status=status)
+                self.repo.flush()
+        
+        start = change_feed.end_cursor()
+        writer = threading.Thread(target=write)
+        writer.start()
+        for changes, cursor in change_feed.watch(start, interval=0.01, stop=lambda: len(received) >= 2):
+            received.extend(changes)
+        writer.join()
+        self.assertEqual([change['new_status'] for change in received], ['in_progress', 'completed'])
+    
+    def test_cli_once(self):
+        import main
+        with patch('sys.stdout', new=StringIO()) as out:
+            main.main(['watch', '--once', '--cursor', '1', '--output', 'jsonl'])
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([line['event'] for line in lines], ['task_created'])
+        self.assertEqual(lines[0]['task_id'], self.task.id)
+
+if __name__ == "__main__":
+    unittest.main()
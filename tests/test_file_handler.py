@@ -0,0 +1,223 @@
+# tests/test_file_handler.py
+import unittest
+import gzip
+import os
+import tempfile
+import shutil
+import sys
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.user import User
+from models.task import Task
+from models.project import Project
+from datetime import datetime
+from utils import file_handler
+from utils.file_handler import load_users, save_users, load_tasks, save_tasks
+from utils.repository import Repository
+from utils import operations
+
+class TestReadCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.patcher = patch('utils.file_handler.DATA_DIR', self.temp_dir)
+        self.patcher.start()
+        save_users([User("Cached User", "cached@example.com")])
+    
+    def tearDown(self):
+        self.patcher.stop()
+        shutil.rmtree(self.temp_dir)
+    
+    def test_warm_load_skips_json(self):
+        load_users()
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir, '.cache', 'users.json.cache')))
+        
+        with patch('utils.file_handler.json.load', side_effect=AssertionError("parsed JSON")):
+            users = load_users()
+        
+        self.assertEqual([user.name for user in users], ["Cached User"])
+    
+    def test_cache_invalidated_on_change(self):
+        load_users()
+        users = load_users()
+        users.append(User("Second User", "second@example.com"))
+        save_users(users)
+        
+        self.assertEqual(len(load_users()), 2)
+    
+    def test_corrupt_cache_is_ignored(self):
+        load_users()
+        with open(os.path.join(self.temp_dir, '.cache', 'users.json.cache'), 'wb') as f:
+            f.write(b'garbage')
+        
+        self.assertEqual(len(load_users()), 1)
+    
+    def test_cache_disabled(self):
+        # Saving writes the cache too; start without one
+        shutil.rmtree(os.path.join(self.temp_dir, '.cache'))
+        with patch('utils.file_handler.CACHE_ENABLED', False):
+            load_users()
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir, '.cache')))
+    
+    def test_write_commands_skip_cache_fill(self):
+        shutil.rmtree(os.path.join(self.temp_dir, '.cache'))
+        with file_handler.skip_cache_fill():
+            users = load_users()
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir, '.cache')))
+        
+        # Saving still leaves an entry for the next read
+        save_users(users)
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir, '.cache', 'users.json.cache')))
+    
+    def test_own_writes_load_trusted(self):
+        # Saved by us: loads straight from the write-through cache without validating
+        with patch('models.user.User.from_dict', side_effect=AssertionError("validated")):
+            users = load_users()
+        self.assertEqual([user.email for user in users], ["cached@example.com"])
+        
+        # Edited by hand: validated again
+        with open(os.path.join(self.temp_dir, 'users.json'), 'w') as f:
+            f.write('[{"id": 7, "name": "Edited", "email": "x@example.com", "projects": []}]')
+        with patch('models.user.User.from_dict', wraps=User.from_dict) as from_dict:
+            load_users()
+        self.assertEqual(from_dict.call_count, 1)
+    
+    def test_missing_file(self):
+        self.assertEqual(load_tasks(), [])
+
+class TestShardedTasks(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.patcher = patch('utils.file_handler.DATA_DIR', self.temp_dir)
+        self.patcher.start()
+        
+        projects = [Project(f"Project {i}", "", datetime.now(), 1) for i in range(3)]
+        file_handler.save_projects(projects)
+        tasks = [Task(f"Task {i}", "", projects[i % 3].id) for i in range(9)]
+        save_tasks(tasks)
+        self.ids = [task.id for task in tasks]
+        self.project_ids = [project.id for project in projects]
+        file_handler.shard_tasks()
+    
+    def tearDown(self):
+        self.patcher.stop()
+        shutil.rmtree(self.temp_dir)
+    
+    def shard_path(self, project_id):
+        return os.path.join(self.temp_dir, 'tasks', f'project-{project_id}.json')
+    
+    def test_layout(self):
+        self.assertTrue(file_handler.is_sharded())
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir, 'tasks.json')))
+        self.assertEqual(sorted(file_handler.task_shards()), self.project_ids)
+    
+    def test_fan_out_merges_in_id_order(self):
+        self.assertEqual([task.id for task in load_tasks()], self.ids)
+        second = self.project_ids[1]
+        self.assertEqual([task.project_id for task in load_tasks([second])], [second] * 3)
+    
+    def test_project_scoped_write_touches_one_shard(self):
+        first, second, third = self.project_ids
+        before = {pid: os.stat(self.shard_path(pid)).st_mtime_ns for pid in self.project_ids}
+        
+        repo = Repository()
+        with patch('utils.file_handler._read_shard', wraps=file_handler._read_shard) as read_shard:
+            task = operations.add_task(repo, "Project 1", "New Task")
+        repo.flush()
+        self.assertEqual([call.args[0] for call in read_shard.call_args_list], [str(second)])
+        
+        after = {pid: os.stat(self.shard_path(pid)).st_mtime_ns for pid in self.project_ids}
+        self.assertNotEqual(before[second], after[second])
+        self.assertEqual(before[first], after[first])
+        self.assertEqual(before[third], after[third])
+        
+        # New ids continue after every shard, not just the loaded one
+        self.assertGreater(task.id, max(self.ids))
+        self.assertIn(task.id, [t.id for t in load_tasks([second])])
+    
+    def test_new_project_shard(self):
+        repo = Repository()
+        repo.add('tasks', Task("Elsewhere", "", 7))
+        repo.flush()
+        self.assertIn(7, file_handler.task_shards())
+        self.assertEqual(len(load_tasks()), 10)
+
+class TestCompression(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.patcher = patch('utils.file_handler.DATA_DIR', self.temp_dir)
+        self.patcher.start()
+        self.users = [User(f"User {i}", f"user{i}@example.com") for i in range(50)]
+    
+    def tearDown(self):
+        self.patcher.stop()
+        shutil.rmtree(self.temp_dir)
+    
+    def path(self, filename='users.json'):
+        return os.path.join(self.temp_dir, filename)
+    
+    def test_gzip_round_trip(self):
+        with patch('utils.file_handler.COMPRESSION', 'gzip'):
+            save_users(self.users)
+        self.assertEqual(file_handler.stored_format(self.path()), 'gzip')
+        with gzip.open(self.path(), 'rt') as f:
+            self.assertIn('"User 0"', f.read())
+        
+        # Detected on load, with and without the read cache
+        self.assertEqual(len(load_users()), 50)
+        with patch('utils.file_handler.CACHE_ENABLED', False):
+            self.assertEqual(len(load_users()), 50)
+        self.assertEqual(len(list(file_handler.iter_records('users.json'))), 50)
+    
+    def test_rewrite_keeps_format(self):
+        with patch('utils.file_handler.COMPRESSION', 'gzip'):
+            save_users(self.users)
+        save_users(self.users[:10])
+        self.assertEqual(file_handler.stored_format(self.path()), 'gzip')
+        # New files are plain unless PM_COMPRESSION says otherwise
+        save_tasks([Task("Task", "", None)])
+        self.assertEqual(file_handler.stored_format(self.path('tasks.json')), 'none')
+    
+    def test_compress_store(self):
+        save_users(self.users)
+        file_handler.save_projects([Project("Project", "", datetime.now(), 1)])
+        save_tasks([Task("Task", "", None)])
+        file_handler.shard_tasks()
+        plain_size = os.path.getsize(self.path())
+        
+        count, before, after = file_handler.compress_store('gzip')
+        self.assertEqual(count, 3)
+        self.assertLess(after, before)
+        self.assertLess(os.path.getsize(self.path()), plain_size)
+        self.assertEqual(file_handler.stored_format(self.path('tasks/project-none.json')), 'gzip')
+        self.assertEqual([task.title for task in load_tasks()], ["Task"])
+        
+        # Files created later, like a new project's shard, follow the store's format
+        file_handler.save_task_records({7: [Task("Other", "", 7).to_dict()]})
+        self.assertEqual(file_handler.stored_format(self.path('tasks/project-7.json')), 'gzip')
+        
+        file_handler.compress_store('none')
+        self.assertEqual(os.path.getsize(self.path()), plain_size)
+        with self.assertRaises(file_handler.CompressionError):
+            file_handler.compress_store('lz4')
+    
+    @unittest.skipIf(file_handler.zstandard is not None, "zstandard is installed")
+    def test_zstd_needs_zstandard(self):
+        with open(self.path(), 'wb') as f:
+            f.write(b'\x28\xb5\x2f\xfd' + b'\x00' * 16)
+        # Not mistaken for an empty store
+        with self.assertRaises(file_handler.CompressionError):
+            load_users()
+    
+    @unittest.skipIf(file_handler.zstandard is None, "zstandard is not installed")
+    def test_zstd_round_trip(self):
+        with patch('utils.file_handler.COMPRESSION', 'zstd'):
+            save_users(self.users)
+        self.assertEqual(file_handler.stored_format(self.path()), 'zstd')
+        with patch('utils.file_handler.CACHE_ENABLED', False):
+            self.assertEqual(len(load_users()), 50)
+
+if __name__ == "__main__":
+    unittest.main()
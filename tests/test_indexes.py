@@ -0,0 +1,147 @@
+# tests/test_indexes.py
+import unittest
+import os
+import sys
+from datetime import datetime
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.project import Project
+from models.task import Task
+from models.user import User
+from utils.dependency_graph import CycleError, DependencyGraph
+from utils.due_date_index import DueDateIndex
+from utils.name_index import NameIndex
+
+class TestDueDateIndex(unittest.TestCase):
+    def setUp(self):
+        self.now = datetime(2024, 6, 1, 12, 0)
+        self.late = Project("Late", "", "2024-05-01", 1)
+        self.today = Project("Today", "", "2024-06-01T18:00", 1)
+        self.week = Project("Week", "", "2024-06-08", 1)
+        self.later = Project("Later", "", "2024-09-01", 1)
+        self.index = DueDateIndex([self.later, self.week, self.late, self.today])
+    
+    def titles(self, projects):
+        return [project.title for project in projects]
+    
+    def test_overdue(self):
+        self.assertEqual(self.titles(self.index.overdue(self.now)), ["Late"])
+    
+    def test_due_within(self):
+        self.assertEqual(self.titles(self.index.due_within(0, self.now)), ["Today"])
+        self.assertEqual(self.titles(self.index.due_within(7, self.now)), ["Today", "Week"])
+    
+    def test_add_and_remove(self):
+        soon = Project("Soon", "", "2024-06-03", 1)
+        self.index.add(soon)
+        self.assertEqual(self.titles(self.index.due_within(7, self.now)), ["Today", "Soon", "Week"])
+        
+        self.index.remove(self.week)
+        self.assertEqual(self.titles(self.index.due_within(7, self.now)), ["Today", "Soon"])
+        self.assertEqual(len(self.index), 4)
+        
+        with self.assertRaises(KeyError):
+            self.index.remove(self.week)
+
+class TestNameIndex(unittest.TestCase):
+    def setUp(self):
+        self.users = [User(name, f"{i}@example.com") for i, name in
+                      enumerate(["Alex Smith", "Alexa Jones", "Sam Lee", "Samantha Fox", "Jordan Kim"])]
+        self.index = NameIndex(self.users, lambda user: user.name)
+    
+    def names(self, users):
+        return [user.name for user in users]
+    
+    def test_prefix(self):
+        self.assertEqual(self.names(self.index.prefix("ALEX")), ["Alex Smith", "Alexa Jones"])
+        self.assertEqual(self.names(self.index.prefix("jor")), ["Jordan Kim"])
+        self.assertEqual(self.index.prefix("zed"), [])
+        self.assertEqual(self.index.count_prefix("sam"), 2)
+    
+    def test_fuzzy(self):
+        # Substitution, transposition and a typo in a partial name
+        self.assertEqual(self.names(self.index.fuzzy("Jordon Kim")), ["Jordan Kim"])
+        self.assertEqual(self.names(self.index.fuzzy("Smantha")), ["Samantha Fox"])
+        self.assertEqual(self.names(self.index.fuzzy("Jrodan")), ["Jordan Kim"])
+        self.assertEqual(self.index.fuzzy("Xyzzy Plugh"), [])
+    
+    def test_add_and_remove(self):
+        extra = User("Alexis Park", "alexis@example.com")
+        self.index.add(extra)
+        self.assertEqual(self.index.count_prefix("alex"), 3)
+        
+        self.index.remove(extra)
+        self.assertEqual(self.index.count_prefix("alex"), 2)
+        with self.assertRaises(KeyError):
+            self.index.remove(extra)
+
+class TestDependencyGraph(unittest.TestCase):
+    def setUp(self):
+        # design -> build -> ship, and docs -> ship
+        self.design = Task("Design", "", 1)
+        self.build = Task("Build", "", 1)
+        self.docs = Task("Docs", "", 1)
+        self.ship = Task("Ship", "", 1)
+        self.build.add_dependency(self.design.id)
+        self.ship.add_dependency(self.build.id)
+        self.ship.add_dependency(self.docs.id)
+        self.graph = DependencyGraph([self.design, self.build, self.docs, self.ship])
+    
+    def titles(self, tasks):
+        return [task.title for task in tasks]
+    
+    def ready(self):
+        return [task.title for task in (self.design, self.build, self.docs, self.ship) if self.graph.is_ready(task)]
+    
+    def test_ready_and_blocked(self):
+        self.assertEqual(self.ready(), ["Design", "Docs"])
+        self.assertTrue(self.graph.is_blocked(self.ship))
+        self.assertEqual(self.graph.open_dependencies(self.ship.id), 2)
+    
+    def test_completion_unblocks_dependents(self):
+        self.design.mark_completed()
+        self.graph.status_changed(self.design, 'pending')
+        self.assertEqual(self.ready(), ["Build", "Docs"])
+        
+        # Reopening blocks again
+        self.design.status = 'in_progress'
+        self.graph.status_changed(self.design, 'completed')
+        self.assertEqual(self.ready(), ["Design", "Docs"])
+    
+    def test_cycles_are_rejected(self):
+        with self.assertRaises(CycleError) as caught:
+            self.graph.add_edge(self.design, self.ship.id)
+        self.assertEqual(caught.exception.path, [self.design.id, self.ship.id, self.build.id, self.design.id])
+        with self.assertRaises(CycleError):
+            self.graph.add_edge(self.docs, self.docs.id)
+        self.assertEqual(self.design.depends_on, [])
+    
+    def test_add_and_remove_edges(self):
+        self.graph.add_edge(self.docs, self.design.id)
+        self.assertTrue(self.graph.is_blocked(self.docs))
+        self.graph.remove_edge(self.docs, self.design.id)
+        self.assertTrue(self.graph.is_ready(self.docs))
+        self.assertEqual(self.titles(self.graph.dependents(self.design.id)), ["Build"])
+    
+    def test_readding_an_edge(self):
+        self.graph.add_edge(self.ship, self.docs.id)
+        self.assertEqual(self.graph.open_dependencies(self.ship.id), 2)
+        self.graph.remove_edge(self.ship, self.docs.id)
+        self.graph.remove_edge(self.ship, self.build.id)
+        self.assertTrue(self.graph.is_ready(self.ship))
+        self.assertEqual(self.graph.dependents(self.docs.id), [])
+    
+    def test_critical_path(self):
+        tasks = [self.design, self.build, self.docs, self.ship]
+        self.assertEqual(self.titles(self.graph.critical_path(tasks)), ["Design", "Build", "Ship"])
+        
+        # Finished tasks drop out of the path
+        self.design.mark_completed()
+        self.graph.status_changed(self.design, 'pending')
+        self.assertEqual(self.titles(self.graph.critical_path(tasks)), ["Build", "Ship"])
+        self.assertEqual(self.graph.critical_path([]), [])
+
+if __name__ == "__main__":
+    unittest.main()
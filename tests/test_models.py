@@ -176,6 +176,17 @@ class TestTask(unittest.TestCase):
         self.assertEqual(task.project_id, 1)
         self.assertEqual(task.assigned_to, 2)
         self.assertEqual(task.status, "in_progress")
+        self.assertEqual(task.depends_on, [])
+    
+    def test_task_dependencies(self):
+        task = Task("Test Task", "Test Description", 1)
+        task.add_dependency(3)
+        task.add_dependency(3)
+        task.add_dependency(5)
+        self.assertEqual(task.to_dict()["depends_on"], [3, 5])
+        
+        task.remove_dependency(3)
+        self.assertEqual(Task.from_dict(task.to_dict()).depends_on, [5])
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,42 @@
+# tests/test_ordering.py
+import unittest
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.ordering import TopK, arrange, group
+
+class TestOrdering(unittest.TestCase):
+    def test_top_k_matches_sorting(self):
+        values = [7, 3, 9, 1, 3, 8, 2, 6]
+        top = TopK(3, lambda value: value)
+        for value in values:
+            top.push(value)
+        self.assertEqual(top.items(), sorted(values)[:3])
+    
+    def test_top_k_keeps_ties_in_arrival_order(self):
+        top = TopK(2, lambda word: len(word))
+        for word in ["bb", "aa", "cc", "d"]:
+            top.push(word)
+        self.assertEqual(top.items(), ["d", "bb"])
+    
+    def test_arrange(self):
+        values = [5, 1, 4, 2, 3]
+        self.assertEqual(arrange(iter(values)), values)
+        self.assertEqual(arrange(iter(values), top=2), [5, 1])
+        self.assertEqual(arrange(iter(values), key=lambda value: value), [1, 2, 3, 4, 5])
+        self.assertEqual(arrange(iter(values), key=lambda value: -value, top=2), [5, 4])
+    
+    def test_group_counts_everything_but_keeps_top(self):
+        words = ["pear", "apple", "plum", "avocado", "peach", "apricot"]
+        groups = group(iter(words), lambda word: word[0], key=len, top=2)
+        self.assertEqual(groups, {'p': (["pear", "plum"], 3), 'a': (["apple", "avocado"], 3)})
+        self.assertEqual(group(iter(words), lambda word: word[0], top=1),
+                         {'p': (["pear"], 3), 'a': (["apple"], 3)})
+        self.assertEqual(group(iter(words), lambda word: word[0], key=len)['a'],
+                         (["apple", "avocado", "apricot"], 3))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+# tests/test_shell.py
+import unittest
+import os
+import json
+import tempfile
+import shutil
+import sys
+import time
+from unittest.mock import patch
+from io import StringIO
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils import file_handler
+from utils.shell import Shell
+import main
+
+class TestShell(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.patcher = patch('utils.file_handler.DATA_DIR', self.temp_dir)
+        self.patcher.start()
+        self.shell = Shell(main.build_parser(), main.HANDLERS, output='json', idle_flush=60)
+    
+    def tearDown(self):
+        if self.shell._timer is not None:
+            self.shell._timer.cancel()
+        self.patcher.stop()
+        shutil.rmtree(self.temp_dir)
+    
+    def run_line(self, line):
+        with patch('sys.stdout', new=StringIO()) as out:
+            self.shell.onecmd(line)
+        return out.getvalue()
+    
+    def saved_users(self):
+        return [user.name for user in file_handler.load_users()]
+    
+    def test_writes_are_deferred(self):
+        self.assertIn('"success"', self.run_line('add-user --name "Alex Kim" --email alex@example.com'))
+        self.assertEqual(self.saved_users(), [])
+        # The in-memory state already has it
+        items = json.loads(self.run_line('list-users'))['items']
+        self.assertEqual([item['name'] for item in items], ["Alex Kim"])
+        
+        self.shell.commit()
+        self.assertEqual(self.saved_users(), ["Alex Kim"])
+    
+    def test_explicit_output_wins(self):
+        self.run_line('add-user --name Alex --email alex@example.com')
+        line = self.run_line('list-users --output=jsonl')
+        self.assertEqual(json.loads(line)['name'], "Alex")
+        self.assertNotIn('items', line)
+    
+    def test_file_commands_see_pending_writes(self):
+        self.run_line('add-user --name Alex --email alex@example.com')
+        result = json.loads(self.run_line('validate'))
+        self.assertEqual(result['data']['checked']['users'], 1)
+    
+    def test_cached_names_stay_current(self):
+        self.run_line('add-user --name Alex --email alex@example.com')
+        self.run_line('add-project --user Alex --title Website')
+        self.assertIn("Alex", self.run_line('list-projects --output table'))
+        # Added after the id -> name map was built
+        self.run_line('add-user --name Sam --email sam@example.com')
+        self.run_line('add-project --user Sam --title Docs')
+        self.assertIn("Sam", self.run_line('list-projects --output table'))
+    
+    def test_idle_flush(self):
+        self.shell.idle_flush = 0.05
+        self.run_line('add-user --name Alex --email alex@example.com')
+        deadline = time.time() + 5
+        while not self.saved_users() and time.time() < deadline:
+            time.sleep(0.02)
+        self.assertEqual(self.saved_users(), ["Alex"])
+    
+    def test_failed_commit_is_retried(self):
+        self.run_line('add-user --name Alex --email alex@example.com')
+        with patch('utils.repository.Repository.write_snapshot', side_effect=OSError("disk full")):
+            with patch('sys.stdout', new=StringIO()) as out:
+                self.shell._idle_commit()
+        self.assertIn("disk full", out.getvalue())
+        self.assertTrue(self.shell.repository().dirty)
+        
+        self.shell.commit()
+        self.assertEqual(self.saved_users(), ["Alex"])
+    
+    def test_session(self):
+        script = StringIO(
+            'add-user --name Alex --email alex@example.com\n'
+            'add-project --user Alex --title "CLI Tool"\n'
+            'no-such-command\n'
+            'shell\n'
+            'add-task --project "CLI Tool" --title Parser\n'
+        )
+        shell = Shell(main.build_parser(), main.HANDLERS, output='jsonl', stdin=script, stdout=StringIO())
+        shell.use_rawinput = False
+        with patch('sys.stdout', new=StringIO()) as out, patch('sys.stderr', new=StringIO()):
+            shell.run()
+        # End of input exits and writes everything
+        self.assertIn("can't be run from the shell", out.getvalue())
+        self.assertEqual([task.title for task in file_handler.load_tasks()], ["Parser"])
+    
+    def test_completion(self):
+        self.run_line('add-user --name Alex --email alex@example.com')
+        self.run_line('add-project --user Alex --title "CLI Tool"')
+        self.run_line('add-project --user Alex --title "Website"')
+        complete = lambda line: self.shell.completedefault(line.split(' ')[-1].split('"')[-1], line, 0, len(line))
+        
+        self.assertEqual(self.shell.completenames('list-'), ['list-projects', 'list-tasks', 'list-users'])
+        self.assertEqual(complete('add-task --pro'), ['--project'])
+        self.assertEqual(complete('list-tasks --project c'), ['"CLI Tool"'])
+        self.assertEqual(complete('list-tasks --project w'), ['Website'])
+        # Inside quotes, only the rest of the word is completed
+        self.assertEqual(complete('list-tasks --project "CLI T'), ['Tool"'])
+        self.assertEqual(complete('add-task --assign '), ['Alex'])
+        self.assertEqual(complete('add-task --title '), [])
+
+if __name__ == "__main__":
+    unittest.main()
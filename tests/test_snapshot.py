@@ -0,0 +1,125 @@
+# tests/test_snapshot.py
+import unittest
+import os
+import gzip
+import tempfile
+import shutil
+import sys
+import threading
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils import file_handler, operations, snapshot
+from utils.repository import Repository
+from utils.snapshot import SnapshotError
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.data_dir = os.path.join(self.temp_dir, 'data')
+        self.archive = os.path.join(self.temp_dir, 'backup.jsonl.gz')
+        self.patcher = patch('utils.file_handler.DATA_DIR', self.data_dir)
+        self.patcher.start()
+
+        repo = Repository()
+        operations.add_user(repo, "Alex", "alex@example.com")
+        operations.add_project(repo, "Alex", "Website", due_date="2030-01-01")
+        operations.add_project(repo, "Alex", "CLI Tool", due_date="2030-01-01")
+        operations.add_task(repo, "Website", "Design", assign="Alex")
+        operations.add_task(repo, "CLI Tool", "Parser")
+        operations.complete_task(repo, "Design")
+        repo.flush()
+
+    def tearDown(self):
+        self.patcher.stop()
+        shutil.rmtree(self.temp_dir)
+
+    def read_data(self):
+        return {name: open(os.path.join(self.data_dir, name), 'rb').read()
+                for name in ('users.json', 'projects.json', 'tasks.json', 'events.log')}
+
+    def test_round_trip(self):
+        before = self.read_data()
+        counts = snapshot.create_snapshot(self.archive)
+        self.assertEqual(counts, {'users': 1, 'projects': 2, 'tasks': 2, 'events': 6})
+
+        # Existing data is only replaced on request
+        with self.assertRaises(SnapshotError):
+            snapshot.restore_snapshot(self.archive)
+
+        shutil.rmtree(self.data_dir)
+        self.assertEqual(snapshot.restore_snapshot(self.archive), counts)
+        self.assertEqual(self.read_data(), before)
+
+    def test_sharded_round_trip(self):
+        with file_handler.data_lock():
+            file_handler.shard_tasks()
+        snapshot.create_snapshot(self.archive)
+        shutil.rmtree(self.data_dir)
+
+        snapshot.restore_snapshot(self.archive)
+        self.assertTrue(file_handler.is_sharded())
+        self.assertEqual([task.title for task in file_handler.load_tasks()], ["Design", "Parser"])
+
+    def test_compressed_round_trip(self):
+        with file_handler.data_lock():
+            file_handler.compress_store('gzip')
+        snapshot.create_snapshot(self.archive)
+        shutil.rmtree(self.data_dir)
+        
+        snapshot.restore_snapshot(self.archive)
+        self.assertEqual([task.title for task in file_handler.load_tasks()], ["Design", "Parser"])
+
+    def test_corrupt_archive_is_rejected(self):
+        snapshot.create_snapshot(self.archive)
+        with gzip.open(self.archive, 'rb') as f:
+            lines = f.readlines()
+        before = self.read_data()
+
+        tampered = [line.replace(b'"Design"', b'"Designs"') for line in lines]
+        with gzip.open(self.archive, 'wb') as f:
+            f.writelines(tampered)
+        with self.assertRaises(SnapshotError):
+            snapshot.verify_snapshot(self.archive)
+        with self.assertRaises(SnapshotError):
+            snapshot.restore_snapshot(self.archive, force=True)
+
+        with gzip.open(self.archive, 'wb') as f:
+            f.writelines(lines[:-1])
+        with self.assertRaises(SnapshotError):
+            snapshot.restore_snapshot(self.archive, force=True)
+
+        # A failed restore leaves the data alone
+        self.assertEqual(self.read_data(), before)
+
+    def test_consistent_while_writing(self):
+        # Every task a snapshot contains must be listed by its project and vice versa,
+        # even though a writer keeps committing tasks + projects while it runs
+        def write():
+            repo = Repository()
+            for i in range(150):
+                operations.add_task(repo, "Website", f"Task {i}")
+                repo.flush()
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        snapshots = 0
+        while writer.is_alive() or not snapshots:
+            snapshot.create_snapshot(self.archive)
+            snapshots += 1
+
+            archive = snapshot.read_archive(self.archive)
+            next(archive)
+            listed, tasks = set(), set()
+            for kind, record in archive:
+                if kind == 'projects':
+                    listed.update(record['tasks'])
+                elif kind == 'tasks':
+                    tasks.add(record['id'])
+            self.assertEqual(listed, tasks)
+        writer.join()
+
+if __name__ == "__main__":
+    unittest.main()
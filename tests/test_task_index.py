@@ -0,0 +1,78 @@
+# tests/test_task_index.py
+import unittest
+import os
+import tempfile
+import shutil
+import sys
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.task import Task
+from utils.file_handler import save_tasks
+from utils.task_index import TaskIndex, StaleIndexError, build_task_index
+
+class TestTaskIndex(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.patcher = patch('utils.file_handler.DATA_DIR', self.temp_dir)
+        self.patcher.start()
+        
+        self.tasks = [
+            Task("Write docs", "Docs", 2, 1, "pending"),
+            Task("Fix bug", "Bug", 1, None, "completed"),
+            Task("Ship it", "Ship", 2, 2, "completed"),
+            Task("Plan", "Plan", 1, 1, "in_progress"),
+        ]
+        save_tasks(self.tasks)
+        build_task_index()
+    
+    def tearDown(self):
+        self.patcher.stop()
+        shutil.rmtree(self.temp_dir)
+    
+    def test_get_by_id(self):
+        with TaskIndex() as index:
+            self.assertEqual(len(index), 4)
+            task = index.get(self.tasks[2].id)
+            self.assertEqual(task.title, "Ship it")
+            self.assertIsNone(index.get(999999))
+    
+    def test_reads_leave_ids_alone(self):
+        next_id = Task._next_id
+        with TaskIndex() as index:
+            list(index.find())
+        self.assertEqual(Task("New", "", 1).id, next_id)
+    
+    def test_find_by_project_and_status(self):
+        with TaskIndex() as index:
+            titles = [task.title for task in index.find(project_id=2)]
+            self.assertEqual(titles, ["Write docs", "Ship it"])
+            
+            titles = [task.title for task in index.find(status="completed")]
+            self.assertEqual(sorted(titles), ["Fix bug", "Ship it"])
+            
+            self.assertEqual(list(index.find(project_id=3)), [])
+    
+    def test_positions_are_project_ordered(self):
+        with TaskIndex() as index:
+            self.assertEqual([index.at(i).project_id for i in range(len(index))], [1, 1, 2, 2])
+            with self.assertRaises(IndexError):
+                index.at(4)
+    
+    def test_stale_index(self):
+        self.tasks.append(Task("Later", "", 1))
+        save_tasks(self.tasks)
+        with self.assertRaises(StaleIndexError):
+            TaskIndex()
+    
+    def test_empty_store(self):
+        save_tasks([])
+        build_task_index()
+        with TaskIndex() as index:
+            self.assertEqual(len(index), 0)
+            self.assertEqual(list(index.find()), [])
+
+if __name__ == "__main__":
+    unittest.main()
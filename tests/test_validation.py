@@ -0,0 +1,84 @@
+# tests/test_validation.py
+import unittest
+import os
+import json
+import tempfile
+import shutil
+import sys
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils import operations
+from utils.repository import Repository
+from utils.validation import validate_store
+
+class TestValidateStore(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.patcher = patch('utils.file_handler.DATA_DIR', self.temp_dir)
+        self.patcher.start()
+        
+        repo = Repository()
+        self.user = operations.add_user(repo, "Alex", "alex@example.com")
+        self.project = operations.add_project(repo, "Alex", "Website", due_date="2030-01-01")
+        self.design = operations.add_task(repo, "Website", "Design")
+        self.build = operations.add_task(repo, "Website", "Build", depends_on=["Design"])
+        repo.flush()
+    
+    def tearDown(self):
+        self.patcher.stop()
+        shutil.rmtree(self.temp_dir)
+    
+    def edit(self, filename, change):
+        path = os.path.join(self.temp_dir, filename)
+        with open(path, 'r') as f:
+            records = json.load(f)
+        change(records)
+        with open(path, 'w') as f:
+            json.dump(records, f)
+    
+    def problems(self):
+        return {(v['kind'], v['id'], v['field']) for v in validate_store()['violations']}
+    
+    def test_clean_store(self):
+        report = validate_store()
+        self.assertEqual(report['violations'], [])
+        self.assertEqual(report['checked'], {'users': 1, 'projects': 1, 'tasks': 2})
+    
+    def test_reports_every_violation(self):
+        def break_tasks(tasks):
+            tasks[0]['status'] = 'done'
+            tasks[0]['assigned_to'] = 99
+            tasks[0]['depends_on'] = [self.build.id]
+            tasks[1]['title'] = ""
+            tasks.append({'id': self.design.id, 'title': "Copy"})
+        
+        def break_projects(projects):
+            projects[0]['due_date'] = "someday"
+            projects[0]['user_id'] = 42
+        
+        self.edit('tasks.json', break_tasks)
+        self.edit('projects.json', break_projects)
+        
+        self.assertEqual(self.problems(), {
+            ('tasks', self.design.id, 'status'),
+            ('tasks', self.design.id, 'assigned_to'),
+            ('tasks', self.design.id, 'depends_on'),
+            ('tasks', self.build.id, 'depends_on'),
+            ('tasks', self.build.id, 'title'),
+            ('tasks', self.design.id, 'description, status, project_id, assigned_to'),
+            ('projects', self.project.id, 'due_date'),
+            ('projects', self.project.id, 'user_id'),
+        })
+    
+    def test_unreadable_file(self):
+        with open(os.path.join(self.temp_dir, 'users.json'), 'w') as f:
+            f.write('[{"id": 1,')
+        problems = validate_store()['violations']
+        self.assertEqual(problems[0]['kind'], 'users')
+        self.assertIn("not valid JSON", problems[0]['problem'])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+# tests/test_workspaces.py
+import unittest
+import os
+import json
+import tempfile
+import shutil
+import sys
+from unittest.mock import patch
+from io import StringIO
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils import file_handler, operations
+from utils.repository import Repository
+from utils.workspaces import WorkspacePool
+import main
+
+class TestWorkspaces(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.patcher = patch('utils.file_handler.DATA_DIR', self.temp_dir)
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+        shutil.rmtree(self.temp_dir)
+
+    def run_cli(self, *argv):
+        with patch('sys.stdout', new=StringIO()) as out:
+            main.main(list(argv) + ['--output', 'json'])
+        return json.loads(out.getvalue())
+
+    def test_cli_isolation(self):
+        self.run_cli('add-user', '--name', 'Alex', '--email', 'alex@example.com', '--workspace', 'team-a')
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir, 'workspaces', 'team-a', 'users.json')))
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir, 'users.json')))
+
+        self.assertEqual(self.run_cli('list-users')['items'], [])
+        self.assertEqual(len(self.run_cli('list-users', '--workspace', 'team-a')['items']), 1)
+        with patch.dict(os.environ, {file_handler.WORKSPACE_ENV: 'team-a'}):
+            self.assertEqual(len(self.run_cli('list-users')['items']), 1)
+            # The option beats the environment
+            self.assertEqual(self.run_cli('list-users', '--workspace', 'default')['items'], [])
+
+        self.assertEqual(file_handler.list_workspaces(), ['default', 'team-a'])
+
+    def test_invalid_name(self):
+        result = self.run_cli('list-users', '--workspace', '../elsewhere')
+        self.assertEqual(result['status'], 'error')
+        with patch.dict(os.environ, {file_handler.WORKSPACE_ENV: '.hidden'}):
+            self.assertEqual(self.run_cli('list-users')['status'], 'error')
+
+    def test_pool_reuses_hot_workspaces(self):
+        pool = WorkspacePool(capacity=2)
+        with patch('utils.file_handler.load_users', wraps=file_handler.load_users) as load_users:
+            for _ in range(3):
+                for name in ('a', 'b'):
+                    pool.get(name).users
+        self.assertEqual(load_users.call_count, 2)
+        self.assertEqual((pool.hits, pool.misses), (4, 2))
+
+        # A third workspace evicts the least recently used one, saving it first
+        operations.add_user(pool.get('a'), "Alex", "alex@example.com")
+        pool.get('b')
+        pool.get('c')
+        self.assertNotIn('a', pool)
+        with file_handler.workspace('a'):
+            self.assertEqual([user.name for user in file_handler.load_users()], ["Alex"])
+
+    def test_pool_reloads_after_external_write(self):
+        pool = WorkspacePool()
+        repo = pool.get('a')
+        operations.add_user(repo, "Alex", "alex@example.com")
+        repo.flush()
+        # Our own writes don't make the workspace look stale
+        self.assertIs(pool.get('a'), repo)
+
+        other = Repository('a')
+        operations.add_user(other, "Sam", "sam@example.com")
+        other.flush()
+        fresh = pool.get('a')
+        self.assertIsNot(fresh, repo)
+        self.assertEqual(len(fresh.users), 2)
+
+if __name__ == "__main__":
+    unittest.main()
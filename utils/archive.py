@@ -0,0 +1,120 @@
+# utils/archive.py
+import os
+import time
+
+from models.task import Task
+from utils import event_log, file_handler
+from utils.dependency_graph import DONE_STATUSES
+
+# Tiering for closed tasks: completed and cancelled tasks that have been closed for
+# longer than a threshold move from the hot task store into the compressed, append-only
+# archive (see file_handler.append_archive), so everyday commands only load live work.
+#
+# Set PM_ARCHIVE_AFTER_DAYS to archive automatically: commits that write tasks then
+# run an archive pass, at most once per ARCHIVE_INTERVAL (see Repository.commit).
+ARCHIVE_AFTER_ENV = 'PM_ARCHIVE_AFTER_DAYS'
+ARCHIVE_INTERVAL = 24 * 3600
+DEFAULT_DAYS = 30
+
+class ArchiveError(Exception):
+    pass
+
+def closed_times():
+    # When each task was last closed, from the event log; reopened tasks drop out
+    done_codes = {event_log.status_code(status) for status in DONE_STATUSES}
+    closed = {}
+    for timestamp, task_id, kind, old, new in event_log.iter_events():
+        if kind != event_log.STATUS_CHANGED:
+            continue
+        if new in done_codes:
+            closed[task_id] = timestamp
+        else:
+            closed.pop(task_id, None)
+    return closed
+
+def archivable(records, cutoff, closed_at):
+    # Ids of closed tasks closed at or before cutoff. A closed task with no close event
+    # was closed before the event log existed, so it counts as old.
+    chosen = set()
+    for record in records:
+        if record['status'] in DONE_STATUSES and closed_at.get(record['id'], cutoff) <= cutoff:
+            chosen.add(record['id'])
+    # Tasks that something staying hot depends on stay hot as well, so dependencies
+    # never point into the archive
+    while chosen:
+        needed = {dependency_id for record in records if record['id'] not in chosen
+                  for dependency_id in record.get('depends_on', ()) if dependency_id in chosen}
+        if not needed:
+            break
+        chosen -= needed
+    return chosen
+
+def archive_tasks(days, now=None):
+    # One archive pass; callers hold data_lock(). Returns (tasks archived, tasks left).
+    chosen, remaining = _archive(days, now)
+    return len(chosen), remaining
+
+def _archive(days, now=None):
+    # archive_tasks(), returning the ids archived
+    if days < 0:
+        raise ArchiveError("--older-than must be zero or more days.")
+    now = time.time() if now is None else now
+    try:
+        records, trusted = file_handler.load_task_records(with_trust=True)
+    except FileNotFoundError:
+        records, trusted = [], True
+    chosen = archivable(records, now - days * 86400, closed_times())
+    archived = [record for record in records if record['id'] in chosen]
+
+    # Archive first, then drop from the hot store: an interrupted pass leaves tasks in
+    # both tiers, which readers skip, rather than in neither
+    file_handler.append_archive(archived, checked_at=now)
+    if archived:
+        kept = [record for record in records if record['id'] not in chosen]
+        if file_handler.is_sharded():
+            groups = file_handler.group_by_project(kept)
+            touched = {record['project_id'] for record in archived}
+            file_handler.save_task_records({project_id: groups.get(project_id, []) for project_id in touched},
+                                           trusted=trusted)
+        else:
+            file_handler.save_records('tasks.json', kept, trusted)
+    return chosen, len(records) - len(archived)
+
+def archive_after_days():
+    value = os.environ.get(ARCHIVE_AFTER_ENV)
+    if not value:
+        return None
+    try:
+        days = int(value)
+    except ValueError:
+        days = -1
+    if days < 0:
+        raise ArchiveError(f"{ARCHIVE_AFTER_ENV} must be a whole number of days, not '{value}'.")
+    return days
+
+def auto_archive(now=None):
+    # The automatic policy. Returns the ids of the tasks archived, or None when no pass
+    # was due.
+    days = archive_after_days()
+    if days is None:
+        return None
+    now = time.time() if now is None else now
+    with file_handler.data_lock():
+        manifest = file_handler.read_archive_manifest()
+        if manifest and now - manifest.get('checked_at', 0) < ARCHIVE_INTERVAL:
+            return None
+        return _archive(days, now)[0]
+
+def iter_archived(project_id=None, status=None, exclude=()):
+    # Archived tasks, decoded one at a time. Ids in exclude (the hot store's) and
+    # repeats are skipped, since an interrupted pass can leave a task in both tiers.
+    seen = set()
+    for record in file_handler.iter_archive_records():
+        if project_id is not None and record['project_id'] != project_id:
+            continue
+        if status and record['status'] != status:
+            continue
+        if record['id'] in exclude or record['id'] in seen:
+            continue
+        seen.add(record['id'])
+        yield Task.from_trusted_dict(record)
@@ -0,0 +1,136 @@
+# utils/async_service.py
+import asyncio
+
+from utils import archive, change_feed, operations
+from utils.repository import Repository
+
+class AsyncTaskService:
+    # Coroutine API over one shared, in-memory Repository for embedding in an asyncio app.
+    #
+    # Operations run on the event loop under a single lock, so mutations are applied one
+    # at a time and reads never see a half-applied change. Disk I/O happens in worker
+    # threads: a single writer coroutine serializes dirty collections on the loop and
+    # writes them off it, and concurrent mutations that land while a write is in flight
+    # are committed together by the next write.
+
+    def __init__(self, repository):
+        self._repo = repository
+        self._lock = asyncio.Lock()
+        self._changed = asyncio.Condition()
+        self._version = 0
+        self._written_version = 0
+        self._writer = None
+        self._write_error = None
+        # Why the last automatic archive pass failed, if it did; it doesn't fail the write
+        self.archive_error = None
+
+    @classmethod
+    async def open(cls, workspace=None):
+        repository = await asyncio.to_thread(lambda: Repository(workspace).load_all())
+        return cls(repository)
+
+    async def _mutate(self, operation, *args):
+        async with self._lock:
+            result = operation(self._repo, *args)
+            self._version += 1
+            version = self._version
+        await self._wait_written(version)
+        return result
+
+    async def _read(self, operation, *args):
+        async with self._lock:
+            return operation(self._repo, *args)
+
+    async def _wait_written(self, version):
+        async with self._changed:
+            if self._writer is None or self._writer.done():
+                self._write_error = None
+                self._writer = asyncio.create_task(self._write_loop())
+            await self._changed.wait_for(lambda: self._written_version >= version or self._write_error)
+            if self._written_version < version:
+                raise self._write_error
+
+    async def _write_loop(self):
+        while self._written_version < self._version:
+            async with self._lock:
+                version = self._version
+                records = self._repo.snapshot()
+            try:
+                await asyncio.to_thread(Repository.write_snapshot, records, self._repo.workspace)
+                error = None
+            except Exception as e:
+                # Any failure (disk, a missing compression library, ...) must reach the
+                # waiting mutations, or they would wait forever
+                error = e
+            async with self._changed:
+                if error:
+                    # Leave the collections dirty so the next write retries them
+                    self._repo.mark_unsaved(records)
+                    self._write_error = error
+                    self._changed.notify_all()
+                    return
+                self._write_error = None
+                self._written_version = version
+                self._changed.notify_all()
+            await self._archive_pass(records)
+
+    async def _archive_pass(self, records):
+        # The automatic archive policy, as in Repository.commit(). Mutations wait for it,
+        # so none can touch a task between it being archived and being dropped from memory.
+        async with self._lock:
+            try:
+                ids = await asyncio.to_thread(Repository.archive_pass, records, self._repo.workspace)
+            except (archive.ArchiveError, ValueError, OSError) as e:
+                self.archive_error = e
+                return
+            self.archive_error = None
+            self._repo.archived(ids)
+
+    async def flush(self):
+        await self._wait_written(self._version)
+
+    async def add_user(self, name, email):
+        return await self._mutate(operations.add_user, name, email)
+
+    async def list_users(self, user_id=None):
+        return await self._read(operations.list_users, user_id)
+
+    async def add_project(self, user, title, description=None, due_date=None):
+        return await self._mutate(operations.add_project, user, title, description, due_date)
+
+    async def list_projects(self, user=None, project_id=None, overdue=False, due_within=None):
+        return await self._read(operations.list_projects, user, project_id, overdue, due_within)
+
+    async def add_task(self, project, title, description=None, assign=None, depends_on=None):
+        return await self._mutate(operations.add_task, project, title, description, assign, depends_on)
+
+    async def list_tasks(self, project=None, status=None, ready=False, blocked=False):
+        return await self._read(operations.list_tasks, project, status, ready, blocked)
+
+    async def critical_path(self, project):
+        return await self._read(operations.critical_path, project)
+
+    async def complete_task(self, task):
+        return await self._mutate(operations.complete_task, task)
+
+    async def update_task(self, task, title=None, description=None, status=None, assign=None,
+                          depends_on=None, remove_dependencies=None):
+        return await self._mutate(operations.update_task, task, title, description, status, assign,
+                                  depends_on, remove_dependencies)
+
+    async def report(self, days=30, since=None, until=None):
+        # Streams the event log from disk, so it runs in a worker thread
+        async with self._lock:
+            return await asyncio.to_thread(operations.report, self._repo, days, since, until)
+
+    async def watch(self, cursor=None, interval=change_feed.POLL_INTERVAL):
+        # Async iterator of (changes, cursor) batches as they are committed, by this
+        # or any other process; see utils/change_feed.py
+        if cursor is None:
+            cursor = await asyncio.to_thread(change_feed.end_cursor)
+        while True:
+            changes, cursor = await asyncio.to_thread(change_feed.read_changes, cursor, change_feed.BATCH_SIZE)
+            if changes:
+                yield changes, cursor
+            else:
+                await asyncio.sleep(interval)
@@ -0,0 +1,71 @@
+# utils/change_feed.py
+import time
+from datetime import datetime
+
+from models.task import Task
+from utils import event_log
+from utils.event_log import TASK_CREATED, STATUS_CHANGED, REASSIGNED, PROJECT_ADDED, NONE
+
+# Committed changes, read back from the event log. A cursor is a record number in the
+# log: consumers keep the cursor of the last change they handled and resume from it,
+# so they only ever read deltas. Each change carries the cursor to resume from after it.
+POLL_INTERVAL = 0.5
+BATCH_SIZE = 1000
+
+EVENT_NAMES = {
+    TASK_CREATED: 'task_created',
+    STATUS_CHANGED: 'status_changed',
+    REASSIGNED: 'reassigned',
+    PROJECT_ADDED: 'project_added',
+}
+
+class CursorError(ValueError):
+    pass
+
+def _user(value):
+    return None if value == NONE else value
+
+def describe(cursor, event):
+    timestamp, subject_id, kind, old, new = event
+    change = {
+        'cursor': cursor,
+        'time': datetime.fromtimestamp(timestamp).isoformat(),
+        'event': EVENT_NAMES.get(kind, str(kind)),
+    }
+    if kind == PROJECT_ADDED:
+        change.update(project_id=subject_id, user_id=_user(new))
+    elif kind == TASK_CREATED:
+        change.update(task_id=subject_id, project_id=new)
+    elif kind == STATUS_CHANGED:
+        change.update(task_id=subject_id, old_status=Task.VALID_STATUSES[old], new_status=Task.VALID_STATUSES[new])
+    elif kind == REASSIGNED:
+        change.update(task_id=subject_id, old_assignee=_user(old), new_assignee=_user(new))
+    return change
+
+def end_cursor():
+    return event_log.count_events()
+
+def read_changes(cursor=0, limit=None):
+    # Changes after cursor, oldest first, and the cursor to resume from
+    end = event_log.count_events()
+    if not 0 <= cursor <= end:
+        # e.g. the data was restored from an older snapshot
+        raise CursorError(f"Cursor {cursor} is outside the change log (0-{end}).")
+    if limit is not None:
+        end = min(end, cursor + limit)
+    changes = [describe(cursor + offset + 1, event)
+               for offset, event in enumerate(event_log.iter_events(cursor, end))]
+    return changes, cursor + len(changes)
+
+def watch(cursor=None, interval=POLL_INTERVAL, stop=None):
+    # Yields (changes, cursor) batches as they are committed, starting at cursor (or
+    # at the current end), until stop() returns true. Writers only ever append to the
+    # log, so waiting is one stat() per interval rather than a re-read.
+    if cursor is None:
+        cursor = end_cursor()
+    while stop is None or not stop():
+        changes, cursor = read_changes(cursor, BATCH_SIZE)
+        if changes:
+            yield changes, cursor
+        else:
+            time.sleep(interval)
@@ -1,7 +1,9 @@
 # utils/cli_helpers.py
+from rich.cells import cell_len
 from rich.console import Console
 from rich.table import Table
-from datetime import datetime
+from rich.text import Span, Text
+from datetime import datetime, timedelta
 
 console = Console()
 
@@ -17,110 +19,218 @@ def print_error(message):
 def print_warning(message):
     console.print(f"[bold yellow]![/bold yellow] {message}")
 
+# Listings longer than this skip Rich tables for a plain fixed-width layout
+PLAIN_TABLE_ROWS = 2000
+
+STATUS_STYLES = {
+    'completed': "bold green",
+    'in_progress': "bold blue",
+    'cancelled': "bold red",
+    'pending': "bold yellow",
+}
+OVERDUE_STYLE = "bold red"
+DUE_SOON_STYLE = "bold yellow"
+
+def _text_width(text):
+    return len(text) if text.isascii() else cell_len(text)
+
+def _pad(text, width, justify):
+    padding = " " * (width - _text_width(text))
+    return padding + text if justify == "right" else text + padding
+
+def _print_table(title, columns, rows, cell_styles=None):
+    # columns are (header, justify, style); rows are lists of plain strings; cell_styles
+    # maps a column index to one style (or None) per row.
+    #
+    # Column widths are worked out here in one pass over the plain strings. When the
+    # table fits the console they are handed to Rich as fixed widths, which saves it
+    # measuring every cell again; very long listings skip Rich altogether.
+    widths = [_text_width(header) for header, _, _ in columns]
+    for row in rows:
+        for index, value in enumerate(row):
+            width = _text_width(value)
+            if width > widths[index]:
+                widths[index] = width
+
+    if len(rows) > PLAIN_TABLE_ROWS:
+        _print_plain_table(title, columns, rows, widths)
+        return
+
+    # Each column has one space of padding either side, plus one border per column and one more
+    fits = sum(widths) + 3 * len(widths) + 1 <= console.width
+    table = Table(title=title)
+    for (header, justify, style), width in zip(columns, widths):
+        table.add_column(header, justify=justify, style=style, width=width if fits else None)
+
+    cell_styles = cell_styles or {}
+    for row_index, row in enumerate(rows):
+        for index, styles in cell_styles.items():
+            style = styles[row_index]
+            if style:
+                # A span, like markup would give, so the padding stays unstyled
+                value = row[index]
+                row[index] = Text(value, spans=[Span(0, len(value), style)])
+        table.add_row(*row)
+
+    console.print(table)
+
+def _print_plain_table(title, columns, rows, widths):
+    justify = [column_justify for _, column_justify, _ in columns]
+    lines = [
+        "  ".join(_pad(header, width, "left") for (header, _, _), width in zip(columns, widths)),
+        "  ".join("-" * width for width in widths),
+    ]
+    for row in rows:
+        lines.append("  ".join(_pad(value, width, how) for value, width, how in zip(row, widths, justify)))
+    print_title(title)
+    console.file.write("\n".join(lines) + "\n")
+
 def print_users_table(users):
     if not users:
         print_warning("No users found.")
         return
     
-    table = Table(title="Users")
-    table.add_column("ID", style="dim")
-    table.add_column("Name", style="bold")
-    table.add_column("Email")
-    table.add_column("Projects", justify="right")
-    
-    for user in users:
-        table.add_row(
-            str(user.id),
-            user.name,
-            user.email,
-            str(len(user.projects))
-        )
-    
-    console.print(table)
+    columns = [("ID", "left", "dim"), ("Name", "left", "bold"), ("Email", "left", None),
+               ("Projects", "right", None)]
+    rows = [[str(user.id), user.name, user.email, str(len(user.projects))] for user in users]
+    _print_table("Users", columns, rows)
 
-def print_projects_table(projects, users=None):
+def print_projects_table(projects, user_names=None, title="Projects"):
     if not projects:
         print_warning("No projects found.")
         return
     
-    table = Table(title="Projects")
-    table.add_column("ID", style="dim")
-    table.add_column("Title", style="bold")
-    table.add_column("Owner")
-    table.add_column("Due Date")
-    table.add_column("Tasks", justify="right")
+    user_names = user_names or {}
     
-    user_dict = {}
-    if users:
-        user_dict = {user.id: user.name for user in users}
+    # Highlight due dates relative to one fixed "now" for the whole table
+    now = datetime.now()
+    soon = now + timedelta(days=8)
     
+    rows = []
+    due_styles = []
     for project in projects:
-        owner_name = user_dict.get(project.user_id, f"User {project.user_id}")
-        due_date = project.due_date.strftime("%Y-%m-%d")
-        
-        # Highlight due dates
-        now = datetime.now()
-        if project.due_date < now:
-            due_date_str = f"[bold red]{due_date}[/bold red]"
-        elif (project.due_date - now).days <= 7:
-            due_date_str = f"[bold yellow]{due_date}[/bold yellow]"
+        owner_name = user_names.get(project.user_id)
+        if owner_name is None:
+            owner_name = f"User {project.user_id}"
+        due_date = project.due_date
+        rows.append([str(project.id), project.title, owner_name, due_date.strftime("%Y-%m-%d"),
+                     str(len(project.tasks))])
+        # Same as (due_date - now).days <= 7
+        if due_date < now:
+            due_styles.append(OVERDUE_STYLE)
+        elif due_date < soon:
+            due_styles.append(DUE_SOON_STYLE)
         else:
-            due_date_str = due_date
-        
-        table.add_row(
-            str(project.id),
-            project.title,
-            owner_name,
-            due_date_str,
-            str(len(project.tasks))
-        )
+            due_styles.append(None)
     
-    console.print(table)
+    columns = [("ID", "left", "dim"), ("Title", "left", "bold"), ("Owner", "left", None),
+               ("Due Date", "left", None), ("Tasks", "right", None)]
+    _print_table(title, columns, rows, {3: due_styles})
 
-def print_tasks_table(tasks, projects=None, users=None):
+def print_tasks_table(tasks, project_names=None, user_names=None, title="Tasks"):
     if not tasks:
         print_warning("No tasks found.")
         return
     
-    table = Table(title="Tasks")
-    table.add_column("ID", style="dim")
-    table.add_column("Title", style="bold")
-    table.add_column("Project")
-    table.add_column("Assigned To")
-    table.add_column("Status")
-    
-    project_dict = {}
-    if projects:
-        project_dict = {project.id: project.title for project in projects}
-    
-    user_dict = {}
-    if users:
-        user_dict = {user.id: user.name for user in users}
+    project_names = project_names or {}
+    user_names = user_names or {}
+    # Only shown when some listed task has dependencies
+    show_dependencies = any(task.depends_on for task in tasks)
     
+    rows = []
     for task in tasks:
-        project_name = project_dict.get(task.project_id, f"Project {task.project_id}")
-        
+        project_name = project_names.get(task.project_id)
+        if project_name is None:
+            project_name = f"Project {task.project_id}"
         if task.assigned_to:
-            assigned_name = user_dict.get(task.assigned_to, f"User {task.assigned_to}")
+            assigned_name = user_names.get(task.assigned_to)
+            if assigned_name is None:
+                assigned_name = f"User {task.assigned_to}"
         else:
             assigned_name = "Unassigned"
-        
-        # Color status
-        if task.status == 'completed':
-            status_str = f"[bold green]{task.status}[/bold green]"
-        elif task.status == 'in_progress':
-            status_str = f"[bold blue]{task.status}[/bold blue]"
-        elif task.status == 'cancelled':
-            status_str = f"[bold red]{task.status}[/bold red]"
+        row = [str(task.id), task.title, project_name, assigned_name, task.status]
+        if show_dependencies:
+            row.append(", ".join(str(task_id) for task_id in task.depends_on))
+        rows.append(row)
+    
+    columns = [("ID", "left", "dim"), ("Title", "left", "bold"), ("Project", "left", None),
+               ("Assigned To", "left", None), ("Status", "left", None)]
+    if show_dependencies:
+        columns.append(("Depends On", "left", None))
+    # Anything that isn't completed/in progress/cancelled shows as pending does
+    status_styles = [STATUS_STYLES.get(task.status, STATUS_STYLES['pending']) for task in tasks]
+    _print_table(title, columns, rows, {4: status_styles})
+
+def format_duration(seconds):
+    days, rest = divmod(int(seconds), 86400)
+    hours, rest = divmod(rest, 3600)
+    minutes = rest // 60
+    if days:
+        return f"{days}d {hours}h"
+    if hours:
+        return f"{hours}h {minutes}m"
+    return f"{minutes}m"
+
+def print_report(report, user_names=None):
+    print_title(f"Report {report['start'][:10]} to {report['end'][:10]}")
+    
+    table = Table(title="Completions per day")
+    table.add_column("Day")
+    table.add_column("Completed", justify="right")
+    for day, count in report['completions_per_day'].items():
+        table.add_row(day, str(count))
+    console.print(table)
+    
+    table = Table(title="Average time in status")
+    table.add_column("Status")
+    table.add_column("Average", justify="right")
+    for status, seconds in report['average_time_in_status'].items():
+        table.add_row(status, format_duration(seconds))
+    console.print(table)
+    
+    user_names = user_names or {}
+    
+    table = Table(title="Completions by assignee")
+    table.add_column("Assignee")
+    table.add_column("Completed", justify="right")
+    for user_id, count in report['completions_by_assignee'].items():
+        name = user_names.get(user_id, f"User {user_id}") if user_id is not None else "Unassigned"
+        table.add_row(name, str(count))
+    console.print(table)
+
+def print_changes(changes):
+    # One line per change, so watch output can scroll
+    for change in changes:
+        event = change['event']
+        if event == 'project_added':
+            detail = f"Project {change['project_id']} added by user {change['user_id']}"
+        elif event == 'task_created':
+            detail = f"Task {change['task_id']} created in project {change['project_id']}"
+        elif event == 'status_changed':
+            detail = f"Task {change['task_id']} {change['old_status']} → {change['new_status']}"
+        elif event == 'reassigned':
+            old = change['old_assignee'] if change['old_assignee'] is not None else "unassigned"
+            new = change['new_assignee'] if change['new_assignee'] is not None else "unassigned"
+            detail = f"Task {change['task_id']} reassigned {old} → {new}"
         else:
-            status_str = f"[bold yellow]{task.status}[/bold yellow]"
-        
-        table.add_row(
-            str(task.id),
-            task.title,
-            project_name,
-            assigned_name,
-            status_str
-        )
+            detail = event
+        console.print(f"[dim]{change['time'][:19]} #{change['cursor']}[/dim] {detail}")
+
+def print_validation(report):
+    checked = ", ".join(f"{count} {kind}" for kind, count in report['checked'].items())
+    violations = report['violations']
+    if not violations:
+        print_success(f"No problems found ({checked}).")
+        return
     
-    console.print(table)
\ No newline at end of file
+    table = Table(title="Problems")
+    table.add_column("Kind")
+    table.add_column("ID", style="dim")
+    table.add_column("Field")
+    table.add_column("Problem")
+    for violation in violations:
+        record_id = violation['id']
+        table.add_row(violation['kind'], "" if record_id is None else str(record_id),
+                      violation['field'] or "", violation['problem'])
+    console.print(table)
+    print_error(f"{len(violations)} problems found ({checked}).")
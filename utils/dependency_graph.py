@@ -0,0 +1,141 @@
+# utils/dependency_graph.py
+from collections import deque
+
+# Finished tasks no longer hold up their dependents; a cancelled task never will be
+# done, so it doesn't block either
+DONE_STATUSES = ('completed', 'cancelled')
+
+class CycleError(ValueError):
+    def __init__(self, path):
+        # Task IDs along the cycle, starting and ending with the same task
+        self.path = path
+        super().__init__(" -> ".join(str(task_id) for task_id in path))
+
+class DependencyGraph:
+    # Task dependencies as adjacency lists in both directions, plus for every task the
+    # number of its dependencies that are still open (its in-degree among open tasks).
+    #
+    # ready/blocked are O(1) checks of that count. It is kept current incrementally:
+    # a status change touches only the dependents of the task that changed, and adding
+    # or removing an edge touches one count.
+
+    def __init__(self, tasks):
+        self._tasks = {}
+        self._dependents = {}
+        self._open_dependencies = {}
+        for task in tasks:
+            self._tasks[task.id] = task
+        for task in self._tasks.values():
+            for dependency_id in task.depends_on:
+                self._link(task.id, dependency_id)
+
+    def _is_open(self, task_id):
+        # Unknown tasks don't block anything
+        task = self._tasks.get(task_id)
+        return task is not None and task.status not in DONE_STATUSES
+
+    def _link(self, task_id, dependency_id):
+        self._dependents.setdefault(dependency_id, []).append(task_id)
+        if self._is_open(dependency_id):
+            self._open_dependencies[task_id] = self._open_dependencies.get(task_id, 0) + 1
+
+    def add_task(self, task):
+        # New tasks have no dependents yet, only dependencies
+        self._tasks[task.id] = task
+        for dependency_id in task.depends_on:
+            self._link(task.id, dependency_id)
+
+    def open_dependencies(self, task_id):
+        return self._open_dependencies.get(task_id, 0)
+
+    def dependents(self, task_id):
+        return [self._tasks[dependent_id] for dependent_id in self._dependents.get(task_id, ())
+                if dependent_id in self._tasks]
+
+    def is_ready(self, task):
+        return task.status not in DONE_STATUSES and not self._open_dependencies.get(task.id)
+
+    def is_blocked(self, task):
+        return task.status not in DONE_STATUSES and bool(self._open_dependencies.get(task.id))
+
+    def check_edge(self, task_id, dependency_id):
+        # Raises CycleError if task_id depending on dependency_id would close a cycle,
+        # i.e. if dependency_id already (transitively) depends on task_id
+        if task_id == dependency_id:
+            raise CycleError([task_id, task_id])
+        parents = {dependency_id: None}
+        stack = [dependency_id]
+        while stack:
+            current = stack.pop()
+            if current == task_id:
+                chain = []
+                while current is not None:
+                    chain.append(current)
+                    current = parents[current]
+                raise CycleError([task_id] + chain[::-1])
+            task = self._tasks.get(current)
+            if task is None:
+                continue
+            for next_id in task.depends_on:
+                if next_id not in parents:
+                    parents[next_id] = current
+                    stack.append(next_id)
+
+    def add_edge(self, task, dependency_id):
+        # Already there: linking again would count the dependency twice
+        if dependency_id in task.depends_on:
+            return
+        self.check_edge(task.id, dependency_id)
+        task.add_dependency(dependency_id)
+        self._link(task.id, dependency_id)
+
+    def remove_edge(self, task, dependency_id):
+        if dependency_id not in task.depends_on:
+            return
+        task.remove_dependency(dependency_id)
+        self._dependents[dependency_id].remove(task.id)
+        if self._is_open(dependency_id):
+            self._open_dependencies[task.id] -= 1
+
+    def status_changed(self, task, old_status):
+        # O(dependents): only the tasks waiting on this one change count
+        was_open = old_status not in DONE_STATUSES
+        if was_open == (task.status not in DONE_STATUSES):
+            return
+        delta = -1 if was_open else 1
+        for dependent_id in self._dependents.get(task.id, ()):
+            self._open_dependencies[dependent_id] = self._open_dependencies.get(dependent_id, 0) + delta
+
+    def critical_path(self, tasks):
+        # Longest chain of open tasks among `tasks` (e.g. one project's), in the order
+        # they have to be done. Kahn's algorithm over just those tasks: O(tasks + edges).
+        open_ids = [task.id for task in tasks if task.status not in DONE_STATUSES]
+        in_degree = dict.fromkeys(open_ids, 0)
+        for task_id in open_ids:
+            for dependency_id in self._tasks[task_id].depends_on:
+                if dependency_id in in_degree:
+                    in_degree[task_id] += 1
+
+        length = dict.fromkeys(open_ids, 1)
+        previous = {}
+        queue = deque(task_id for task_id in open_ids if in_degree[task_id] == 0)
+        while queue:
+            current = queue.popleft()
+            for dependent_id in self._dependents.get(current, ()):
+                if dependent_id not in in_degree:
+                    continue
+                if length[current] + 1 > length[dependent_id]:
+                    length[dependent_id] = length[current] + 1
+                    previous[dependent_id] = current
+                in_degree[dependent_id] -= 1
+                if in_degree[dependent_id] == 0:
+                    queue.append(dependent_id)
+
+        if not length:
+            return []
+        current = max(length, key=length.get)
+        path = [current]
+        while current in previous:
+            current = previous[current]
+            path.append(current)
+        return [self._tasks[task_id] for task_id in reversed(path)]
@@ -0,0 +1,47 @@
+# utils/due_date_index.py
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from operator import attrgetter
+
+class DueDateIndex:
+    # Projects kept sorted by due date in two parallel arrays, so "overdue" and
+    # "due within N days" are a bisect plus a slice: O(log n + k).
+
+    def __init__(self, projects=()):
+        ordered = sorted(projects, key=attrgetter('due_date', 'id'))
+        self._dates = [project.due_date for project in ordered]
+        self._projects = ordered
+
+    def __len__(self):
+        return len(self._projects)
+
+    def add(self, project):
+        position = bisect_right(self._dates, project.due_date)
+        self._dates.insert(position, project.due_date)
+        self._projects.insert(position, project)
+
+    def remove(self, project, due_date=None):
+        # Pass the old due date if it has already been changed on the project
+        due_date = due_date or project.due_date
+        position = bisect_left(self._dates, due_date)
+        while position < len(self._projects) and self._dates[position] == due_date:
+            if self._projects[position] is project:
+                del self._dates[position]
+                del self._projects[position]
+                return
+            position += 1
+        raise KeyError(project.id)
+
+    def between(self, start=None, end=None):
+        # Projects with start <= due_date < end, earliest first
+        low = 0 if start is None else bisect_left(self._dates, start)
+        high = len(self._dates) if end is None else bisect_left(self._dates, end)
+        return self._projects[low:high]
+
+    def overdue(self, now=None):
+        return self.between(end=now or datetime.now())
+
+    def due_within(self, days, now=None):
+        # Same rule the projects table uses for highlighting: (due_date - now).days <= days
+        now = now or datetime.now()
+        return self.between(now, now + timedelta(days=days + 1))
@@ -0,0 +1,78 @@
+# utils/event_log.py
+import os
+import struct
+import time
+from models.task import Task
+from utils import file_handler
+
+# Append-only log of changes, stored as fixed-width binary records:
+# (timestamp, id, kind, old, new). Fixed width keeps it compact, lets readers
+# stream it in chunks and lets a record number double as a position in the log.
+# id is the task id, except for PROJECT_ADDED where it is the project id.
+#
+#   TASK_CREATED   old = NONE,           new = project_id
+#   STATUS_CHANGED old/new = index into Task.VALID_STATUSES
+#   REASSIGNED     old/new = user id, or NONE for unassigned
+#   PROJECT_ADDED  old = NONE,           new = owner's user id
+EVENTS_FILE = 'events.log'
+RECORD = struct.Struct('<dQBqq')
+
+TASK_CREATED = 1
+STATUS_CHANGED = 2
+REASSIGNED = 3
+PROJECT_ADDED = 4
+NONE = -1
+
+_CHUNK_RECORDS = 4096
+
+def _path():
+    return os.path.join(file_handler.data_dir(), EVENTS_FILE)
+
+def status_code(status):
+    return Task.VALID_STATUSES.index(status)
+
+def user_code(user_id):
+    return NONE if user_id is None else user_id
+
+def make_event(kind, task_id, old, new, timestamp=None):
+    return (time.time() if timestamp is None else timestamp, task_id, kind, old, new)
+
+def append_events(events):
+    if not events:
+        return
+    file_handler.ensure_data_dir()
+    # One write per batch, in append mode, so concurrent writers don't interleave records
+    with open(_path(), 'ab') as f:
+        # Callers hold data_lock(), so a partial record at the end was left by a writer that
+        # died mid-append; cut it off, or every record after it would be misaligned
+        size = os.fstat(f.fileno()).st_size
+        if size % RECORD.size:
+            f.truncate(size - size % RECORD.size)
+        f.write(b''.join(RECORD.pack(*event) for event in events))
+
+def count_events():
+    try:
+        return os.path.getsize(_path()) // RECORD.size
+    except FileNotFoundError:
+        return 0
+
+def iter_events(start=0, stop=None, path=None):
+    # Stream events from record number `start` (up to `stop`) without reading the whole log
+    try:
+        f = open(path or _path(), 'rb')
+    except FileNotFoundError:
+        return
+    with f:
+        f.seek(start * RECORD.size)
+        remaining = None if stop is None else max(stop - start, 0)
+        while remaining is None or remaining > 0:
+            wanted = _CHUNK_RECORDS if remaining is None else min(_CHUNK_RECORDS, remaining)
+            chunk = f.read(RECORD.size * wanted)
+            # Ignore a trailing partial record from a write still in progress
+            usable = len(chunk) - len(chunk) % RECORD.size
+            if usable:
+                yield from RECORD.iter_unpack(chunk[:usable])
+            if remaining is not None:
+                remaining -= usable // RECORD.size
+            if len(chunk) < RECORD.size * wanted:
+                return
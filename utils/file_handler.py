@@ -1,58 +1,667 @@
 # utils/file_handler.py
+import gzip
+import heapq
+import io
 import json
+import marshal
+import mmap
+import contextvars
 import os
+import re
+import struct
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from models.user import User
 from models.project import Project
 from models.task import Task
 
+try:
+    import fcntl
+except ImportError:
+    # No cross-process locking on platforms without fcntl (Windows)
+    fcntl = None
+
+try:
+    import zstandard
+except ImportError:
+    # zstd-compressed stores need the optional zstandard package; gzip always works
+    zstandard = None
+
 # Define data directory
 DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
 
+# Decoded records are cached next to the data, keyed on the source file's mtime, size and inode.
+# The payload is marshal (no pickle), read straight out of an mmap of the cache file.
+# Entries written along with the data file itself are flagged trusted: the records came
+# from our own models, so loading them can skip per-record validation. PM_TRUSTED_LOAD
+# trusts every file.
+CACHE_DIR_NAME = '.cache'
+CACHE_ENABLED = os.environ.get('PM_NO_CACHE') is None
+TRUSTED_LOAD = os.environ.get('PM_TRUSTED_LOAD') is not None
+_CACHE_MAGIC = b'PMC2'
+_CACHE_HEADER = struct.Struct('<4sHBxQQQ')
+# A miss fills the cache, except under skip_cache_fill(): write commands mostly replace
+# the files they read, and saving a file writes its cache entry anyway
+_cache_fill = contextvars.ContextVar('cache_fill', default=True)
+
+# Each workspace is an isolated store. The default workspace is DATA_DIR itself, so
+# existing data stays where it is; named ones live under DATA_DIR/workspaces/<name>.
+# The current workspace is context-local, so one process can serve several of them.
+WORKSPACE_ENV = 'PM_WORKSPACE'
+WORKSPACES_DIR = 'workspaces'
+DEFAULT_WORKSPACE = 'default'
+_WORKSPACE_NAME = re.compile(r'[A-Za-z0-9][A-Za-z0-9_.-]{0,63}')
+_workspace = contextvars.ContextVar('workspace', default=None)
+
+def check_workspace(name):
+    if not name or name == DEFAULT_WORKSPACE:
+        return DEFAULT_WORKSPACE
+    if not _WORKSPACE_NAME.fullmatch(name):
+        raise ValueError(f"Invalid workspace name: '{name}'.")
+    return name
+
+def current_workspace():
+    name = _workspace.get()
+    return check_workspace(os.environ.get(WORKSPACE_ENV) if name is None else name)
+
+def set_workspace(name):
+    _workspace.set(check_workspace(name))
+
+@contextmanager
+def workspace(name):
+    token = _workspace.set(check_workspace(name))
+    try:
+        yield
+    finally:
+        _workspace.reset(token)
+
+def list_workspaces():
+    try:
+        names = sorted(entry.name for entry in os.scandir(os.path.join(DATA_DIR, WORKSPACES_DIR))
+                       if entry.is_dir() and _WORKSPACE_NAME.fullmatch(entry.name))
+    except FileNotFoundError:
+        names = []
+    return [DEFAULT_WORKSPACE] + names
+
+def data_dir():
+    name = current_workspace()
+    if name == DEFAULT_WORKSPACE:
+        return DATA_DIR
+    return os.path.join(DATA_DIR, WORKSPACES_DIR, name)
+
 def ensure_data_dir():
-    if not os.path.exists(DATA_DIR):
-        os.makedirs(DATA_DIR)
+    os.makedirs(data_dir(), exist_ok=True)
 
-def save_users(users):
+# Data files may be stored gzip- or zstd-compressed under their usual names. The format
+# is detected from the first bytes on every read, and compression and decompression are
+# streamed, so a file is never held in memory both compressed and uncompressed.
+# PM_COMPRESSION picks the format files are written in; without it, a rewritten file
+# keeps its current format and new files (shards, a restore) take the one compress-store
+# recorded in store.json, or are plain JSON.
+COMPRESSION_ENV = 'PM_COMPRESSION'
+STORE_CONFIG = 'store.json'
+COMPRESSION_FORMATS = ('none', 'gzip', 'zstd')
+COMPRESSION = os.environ.get(COMPRESSION_ENV) or None
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+_GZIP_MAGIC = b'\x1f\x8b'
+_ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+class CompressionError(Exception):
+    pass
+
+def detect_format(head):
+    if head.startswith(_GZIP_MAGIC):
+        return 'gzip'
+    if head.startswith(_ZSTD_MAGIC):
+        return 'zstd'
+    return 'none'
+
+def _require_zstd():
+    if zstandard is None:
+        raise CompressionError("This store uses zstd compression; install the 'zstandard' package to use it.")
+
+@contextmanager
+def _text_reader(raw):
+    # Decoded text stream over an open binary file, which stays open afterwards
+    compression = detect_format(raw.peek(4)[:4])
+    if compression == 'gzip':
+        stream = gzip.GzipFile(fileobj=raw, mode='rb')
+    elif compression == 'zstd':
+        _require_zstd()
+        stream = zstandard.ZstdDecompressor().stream_reader(raw, closefd=False)
+    else:
+        stream = raw
+    text = io.TextIOWrapper(stream)
+    try:
+        yield text
+    finally:
+        text.detach()
+        if stream is not raw:
+            stream.close()
+
+@contextmanager
+def _text_writer(raw, compression):
+    if compression == 'gzip':
+        # mtime=0 so identical data compresses to identical bytes
+        stream = gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=GZIP_LEVEL, mtime=0)
+    elif compression == 'zstd':
+        _require_zstd()
+        stream = zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(raw, closefd=False)
+    elif compression == 'none':
+        stream = raw
+    else:
+        raise CompressionError(f"Unknown compression '{compression}'; use one of {', '.join(COMPRESSION_FORMATS)}.")
+    text = io.TextIOWrapper(stream)
+    try:
+        yield text
+    finally:
+        text.flush()
+        text.detach()
+        if stream is not raw:
+            stream.close()
+
+@contextmanager
+def open_data(path):
+    # Read a data file as text, whatever its compression
+    with open(path, 'rb') as raw, _text_reader(raw) as text:
+        yield text
+
+@contextmanager
+def create_data(path, compression=None):
+    # Write a data file as text, compressed as configured
+    with open(path, 'wb') as raw, _text_writer(raw, compression or COMPRESSION or store_format() or 'none') as text:
+        yield text
+
+def stored_format(path):
+    # Compression of an existing data file, None if there is no such file
+    try:
+        with open(path, 'rb') as f:
+            return detect_format(f.read(4))
+    except FileNotFoundError:
+        return None
+
+def store_format():
+    # The compression compress-store last chose for this store, None if it never ran
+    try:
+        with open(os.path.join(data_dir(), STORE_CONFIG), 'r') as f:
+            return json.load(f).get('compression')
+    except FileNotFoundError:
+        return None
+
+def _write_store_config(config):
+    fd, tmp_path = tempfile.mkstemp(dir=data_dir(), prefix=STORE_CONFIG + '.')
+    with os.fdopen(fd, 'w') as f:
+        json.dump(config, f, indent=2)
+    os.replace(tmp_path, os.path.join(data_dir(), STORE_CONFIG))
+
+# Writers hold an exclusive lock on data/.lock for a whole commit (every file it touches),
+# so a snapshot taking it briefly sees all files as of one commit.
+LOCK_FILE = '.lock'
+
+@contextmanager
+def data_lock(exclusive=True):
     ensure_data_dir()
+    with open(os.path.join(data_dir(), LOCK_FILE), 'a') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        # Closing the file releases the lock
+        yield
+
+def _file_signature(stat_result):
+    return (stat_result.st_mtime_ns, stat_result.st_size, stat_result.st_ino)
+
+def file_signature(filename):
+    return _file_signature(os.stat(os.path.join(data_dir(), filename)))
+
+def _cache_path(filename):
+    # Shard files live in a subdirectory; keep their cache entries flat
+    return os.path.join(data_dir(), CACHE_DIR_NAME, filename.replace('/', '%') + '.cache')
+
+def _load_cache(filename, signature):
+    try:
+        with open(_cache_path(filename), 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                magic, version, trusted, *cached_signature = _CACHE_HEADER.unpack_from(mapped)
+                if magic != _CACHE_MAGIC or version != marshal.version:
+                    return None
+                if tuple(cached_signature) != signature:
+                    return None
+                with memoryview(mapped) as view, view[_CACHE_HEADER.size:] as payload:
+                    return marshal.loads(payload), bool(trusted)
+    except (OSError, ValueError, EOFError, TypeError, struct.error):
+        # Missing, empty, truncated or foreign cache files are just misses
+        return None
+
+def _write_cache(filename, signature, records, trusted=False):
+    cache_dir = os.path.join(data_dir(), CACHE_DIR_NAME)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix=os.path.basename(filename) + '.')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_CACHE_HEADER.pack(_CACHE_MAGIC, marshal.version, trusted, *signature))
+            marshal.dump(records, f)
+        os.replace(tmp_path, _cache_path(filename))
+    except (OSError, ValueError):
+        # A read-only data dir or unmarshallable record just means no cache
+        pass
+
+@contextmanager
+def skip_cache_fill():
+    token = _cache_fill.set(False)
+    try:
+        yield
+    finally:
+        _cache_fill.reset(token)
+
+def _read_records_checked(filename):
+    # Records plus whether they can skip validation when turned into models
+    with open(os.path.join(data_dir(), filename), 'rb') as f:
+        signature = _file_signature(os.fstat(f.fileno()))
+        if CACHE_ENABLED:
+            cached = _load_cache(filename, signature)
+            if cached is not None:
+                records, trusted = cached
+                return records, trusted or TRUSTED_LOAD
+
+        with _text_reader(f) as text:
+            records = json.load(text)
+
+        # Only cache if the file didn't change underneath us while parsing
+        if CACHE_ENABLED and _cache_fill.get() and _file_signature(os.fstat(f.fileno())) == signature:
+            _write_cache(filename, signature, records)
+        return records, TRUSTED_LOAD
+
+def _build(cls, records, trusted):
+    if trusted:
+        return cls.from_trusted_dicts(records)
+    return [cls.from_dict(record) for record in records]
+
+def iter_json_array(f, chunk_size=1 << 16):
+    # Incrementally decode a top-level JSON array from an open file, one element at a time
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+    eof = False
+    started = False
+    first = True
+
+    def refill():
+        nonlocal buffer, pos, eof
+        chunk = f.read(chunk_size)
+        if not chunk:
+            eof = True
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+    while True:
+        while pos < len(buffer) and buffer[pos] in ' \t\r\n':
+            pos += 1
+        if pos >= len(buffer):
+            if eof:
+                raise json.JSONDecodeError("Unterminated array", buffer, pos)
+            refill()
+            continue
+
+        char = buffer[pos]
+        if not started:
+            if char != '[':
+                raise json.JSONDecodeError("Expecting '['", buffer, pos)
+            started = True
+            pos += 1
+            continue
+        if char == ']':
+            return
+        if char == ',' and not first:
+            pos += 1
+            continue
+
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                refill()
+                continue
+            # A number cut off at the chunk boundary still decodes, so make sure there's more input
+            if end == len(buffer) and not eof:
+                refill()
+                continue
+            break
+
+        yield value
+        pos = end
+        first = False
+
+def iter_records(filename):
+    # Stream records from a data file without holding the whole array in memory
+    with open_data(os.path.join(data_dir(), filename)) as f:
+        yield from iter_json_array(f)
+
+def _write_records(filename, records, trusted, compression=None):
+    # Replace rather than rewrite, so readers and snapshots only ever see whole files
+    path = os.path.join(data_dir(), filename)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    compression = compression or COMPRESSION or stored_format(path)
+    try:
+        with create_data(tmp_path, compression) as f:
+            json.dump(records, f, indent=2)
+        signature = _file_signature(os.stat(tmp_path))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    # The rename keeps inode and mtime, so the cache entry matches the new file
+    if CACHE_ENABLED:
+        _write_cache(filename, signature, records, trusted)
+
+def save_records(filename, records, trusted=True):
+    # trusted: the records came from our own models rather than an outside source
+    ensure_data_dir()
+    _write_records(filename, records, trusted)
+
+def compress_store(compression):
+    # Rewrite every user/project/task file in the given format; callers hold data_lock().
+    # Returns (files rewritten, bytes before, bytes after).
+    if compression not in COMPRESSION_FORMATS:
+        raise CompressionError(f"Unknown compression '{compression}'; use one of {', '.join(COMPRESSION_FORMATS)}.")
+    if compression == 'zstd':
+        _require_zstd()
+    ensure_data_dir()
+    # Recorded first, so files created from here on are written the same way
+    _write_store_config({'compression': compression})
+    filenames = ['users.json', 'projects.json'] + [filename for filename in task_files()
+                                                   if not filename.endswith(MANIFEST_FILE)]
+    count = before = after = 0
+    for filename in filenames:
+        path = os.path.join(data_dir(), filename)
+        try:
+            size = os.path.getsize(path)
+            records, trusted = _read_records_checked(filename)
+        except FileNotFoundError:
+            continue
+        _write_records(filename, records, trusted, compression)
+        count += 1
+        before += size
+        after += os.path.getsize(path)
+    return count, before, after
+
+def save_users(users):
     users_data = [user.to_dict() for user in users]
-    with open(os.path.join(DATA_DIR, 'users.json'), 'w') as f:
-        json.dump(users_data, f, indent=2)
+    save_records('users.json', users_data)
 
 def load_users():
     ensure_data_dir()
     try:
-        with open(os.path.join(DATA_DIR, 'users.json'), 'r') as f:
-            users_data = json.load(f)
-            return [User.from_dict(user_data) for user_data in users_data]
+        return _build(User, *_read_records_checked('users.json'))
     except (FileNotFoundError, json.JSONDecodeError):
         return []
 
 def save_projects(projects):
-    ensure_data_dir()
     projects_data = [project.to_dict() for project in projects]
-    with open(os.path.join(DATA_DIR, 'projects.json'), 'w') as f:
-        json.dump(projects_data, f, indent=2)
+    save_records('projects.json', projects_data)
 
 def load_projects():
     ensure_data_dir()
     try:
-        with open(os.path.join(DATA_DIR, 'projects.json'), 'r') as f:
-            projects_data = json.load(f)
-            return [Project.from_dict(project_data) for project_data in projects_data]
+        return _build(Project, *_read_records_checked('projects.json'))
     except (FileNotFoundError, json.JSONDecodeError):
         return []
 
-def save_tasks(tasks):
+# Tasks can instead be partitioned by project_id into tasks/project-<id>.json, with a
+# small tasks/manifest.json listing the shards and the next free task id. Project-scoped
+# commands then read and write a single shard.
+SHARD_DIR = 'tasks'
+MANIFEST_FILE = 'manifest.json'
+SHARD_WORKERS = 8
+NO_PROJECT = 'none'
+
+def is_sharded():
+    return os.path.exists(os.path.join(data_dir(), SHARD_DIR, MANIFEST_FILE))
+
+def _shard_key(project_id):
+    return NO_PROJECT if project_id is None else str(project_id)
+
+def _shard_filename(key):
+    return f"{SHARD_DIR}/project-{key}.json"
+
+def _read_manifest():
+    with open(os.path.join(data_dir(), SHARD_DIR, MANIFEST_FILE), 'r') as f:
+        manifest = json.load(f)
+    # Only some shards may be loaded, so the id sequence has to come from here
+    if manifest.get('next_task_id', 1) > Task._next_id:
+        Task._next_id = manifest['next_task_id']
+    return manifest
+
+def _write_manifest(manifest):
+    shard_dir = os.path.join(data_dir(), SHARD_DIR)
+    os.makedirs(shard_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=shard_dir, prefix=MANIFEST_FILE + '.')
+    with os.fdopen(fd, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, os.path.join(shard_dir, MANIFEST_FILE))
+
+def task_shards():
+    # Project ids (None for tasks without a project) that have a shard
+    return [None if key == NO_PROJECT else int(key) for key in _read_manifest()['shards']]
+
+def _read_shard(key):
+    try:
+        return _read_records_checked(_shard_filename(key))
+    except FileNotFoundError:
+        return [], True
+
+def load_task_records(project_ids=None, with_trust=False):
+    # with_trust also returns whether we wrote the records ourselves, for callers that save them back
+    records, trusted = _load_task_records(project_ids)
+    return (records, trusted) if with_trust else records
+
+def _load_task_records(project_ids=None):
+    # Sharded stores fan out across shards in parallel and merge back into id order.
+    # Returns (records, trusted).
+    if not is_sharded():
+        # The highest ids may have moved to the archive
+        read_archive_manifest()
+        records, trusted = _read_records_checked('tasks.json')
+        if project_ids is not None:
+            wanted = set(project_ids)
+            records = [record for record in records if record['project_id'] in wanted]
+        return records, trusted
+
+    manifest = _read_manifest()
+    keys = list(manifest['shards']) if project_ids is None else [_shard_key(pid) for pid in project_ids]
+    keys = [key for key in keys if key in manifest['shards']]
+    if len(keys) <= 1:
+        return _read_shard(keys[0]) if keys else ([], True)
+
+    with ThreadPoolExecutor(max_workers=min(SHARD_WORKERS, len(keys))) as pool:
+        # Worker threads don't inherit the caller's context, so pass the workspace along
+        futures = [pool.submit(contextvars.copy_context().run, _read_shard, key) for key in keys]
+        shards = [future.result() for future in futures]
+    records = list(heapq.merge(*(records for records, _ in shards), key=lambda record: record['id']))
+    return records, all(trusted for _, trusted in shards)
+
+def save_task_records(records_by_project, replace_all=False, trusted=True):
+    # Write the given shards (project_id -> records). With replace_all, shards that
+    # aren't in records_by_project are removed.
+    manifest = _read_manifest()
+    shards = manifest['shards']
+    changed = False
+
+    for project_id, records in records_by_project.items():
+        key = _shard_key(project_id)
+        if records:
+            save_records(_shard_filename(key), records, trusted)
+            if key not in shards:
+                shards[key] = _shard_filename(key)
+                changed = True
+            highest = max(record['id'] for record in records) + 1
+            if highest > manifest.get('next_task_id', 1):
+                manifest['next_task_id'] = highest
+                changed = True
+        elif key in shards:
+            _remove_shard(key)
+            del shards[key]
+            changed = True
+
+    if replace_all:
+        wanted = {_shard_key(project_id) for project_id in records_by_project}
+        for key in [key for key in shards if key not in wanted]:
+            _remove_shard(key)
+            del shards[key]
+            changed = True
+
+    if changed:
+        _write_manifest(manifest)
+
+def _remove_shard(key):
+    try:
+        os.remove(os.path.join(data_dir(), _shard_filename(key)))
+    except FileNotFoundError:
+        pass
+
+def group_by_project(records):
+    groups = {}
+    for record in records:
+        groups.setdefault(record['project_id'], []).append(record)
+    return groups
+
+def shard_tasks(next_task_id=1):
+    # One-off migration of tasks.json into per-project shards; callers hold data_lock()
     ensure_data_dir()
+    try:
+        records, trusted = _read_records_checked('tasks.json')
+    except FileNotFoundError:
+        records, trusted = [], True
+    next_task_id = max([record['id'] + 1 for record in records] + [next_task_id])
+    _write_manifest({'version': 1, 'partition_key': 'project_id', 'next_task_id': next_task_id, 'shards': {}})
+    groups = group_by_project(records)
+    save_task_records(groups, replace_all=True, trusted=trusted)
+    if os.path.exists(os.path.join(data_dir(), 'tasks.json')):
+        os.remove(os.path.join(data_dir(), 'tasks.json'))
+    return len(groups)
+
+def iter_task_records():
+    # Stream every task record, whichever layout the store uses
+    if not is_sharded():
+        yield from iter_records('tasks.json')
+        return
+    for key in _read_manifest()['shards']:
+        try:
+            yield from iter_records(_shard_filename(key))
+        except FileNotFoundError:
+            continue
+
+def task_files():
+    # Every file making up the task store, relative to the data dir, manifest first
+    if not is_sharded():
+        return ['tasks.json']
+    return [f"{SHARD_DIR}/{MANIFEST_FILE}"] + list(_read_manifest()['shards'].values())
+
+def tasks_signature():
+    # (mtime_ns, size, inode)-style fingerprint of the task store, for derived indexes
+    if not is_sharded():
+        return _file_signature(os.stat(os.path.join(data_dir(), 'tasks.json')))
+    paths = [os.path.join(data_dir(), filename) for filename in task_files()]
+    signatures = [_file_signature(os.stat(path)) for path in paths if os.path.exists(path)]
+    return (max(signature[0] for signature in signatures),
+            sum(signature[1] for signature in signatures),
+            hash(tuple(signatures)) & 0xFFFFFFFFFFFFFFFF)
+
+def save_tasks(tasks, project_ids=None):
     tasks_data = [task.to_dict() for task in tasks]
-    with open(os.path.join(DATA_DIR, 'tasks.json'), 'w') as f:
-        json.dump(tasks_data, f, indent=2)
+    if not is_sharded():
+        save_records('tasks.json', tasks_data)
+        return
+    groups = group_by_project(tasks_data)
+    if project_ids is None:
+        save_task_records(groups, replace_all=True)
+    else:
+        save_task_records({project_id: groups.get(project_id, []) for project_id in project_ids})
 
-def load_tasks():
+def load_tasks(project_ids=None):
     ensure_data_dir()
     try:
-        with open(os.path.join(DATA_DIR, 'tasks.json'), 'r') as f:
-            tasks_data = json.load(f)
-            return [Task.from_dict(task_data) for task_data in tasks_data]
+        return _build(Task, *_load_task_records(project_ids))
     except (FileNotFoundError, json.JSONDecodeError):
-        return []
\ No newline at end of file
+        return []
+
+
+# Closed tasks can be moved to a cold tier: archive.jsonl.gz, an append-only run of gzip
+# members (one per archive pass) with one task record per line, plus a small archive.json
+# manifest. The manifest's size is the committed end of the file, so a torn append is
+# never read and is cut off by the next one.
+ARCHIVE_FILE = 'archive.jsonl.gz'
+ARCHIVE_MANIFEST = 'archive.json'
+
+class _Prefix(io.RawIOBase):
+    # The first `size` bytes of an open binary file, as a stream
+    def __init__(self, raw, size):
+        self._raw = raw
+        self._left = size
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self._raw.read(min(len(buffer), self._left))
+        buffer[:len(data)] = data
+        self._left -= len(data)
+        return len(data)
+
+def read_archive_manifest():
+    # None until something has been archived
+    try:
+        with open(os.path.join(data_dir(), ARCHIVE_MANIFEST), 'r') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    # Archived ids stay taken even once the hot store no longer has the highest one
+    if manifest.get('next_task_id', 1) > Task._next_id:
+        Task._next_id = manifest['next_task_id']
+    return manifest
+
+def write_archive_manifest(manifest):
+    ensure_data_dir()
+    fd, tmp_path = tempfile.mkstemp(dir=data_dir(), prefix=ARCHIVE_MANIFEST + '.')
+    with os.fdopen(fd, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, os.path.join(data_dir(), ARCHIVE_MANIFEST))
+
+def append_archive(records, checked_at=None):
+    # Append records (any iterable) as one gzip member and commit them in the manifest,
+    # along with when the archive policy last ran; callers hold data_lock()
+    manifest = read_archive_manifest() or {'version': 1, 'size': 0, 'count': 0, 'next_task_id': 1}
+    if checked_at is not None:
+        manifest['checked_at'] = checked_at
+    if records:
+        ensure_data_dir()
+        with open(os.path.join(data_dir(), ARCHIVE_FILE), 'ab') as raw:
+            raw.truncate(manifest['size'])
+            with gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=GZIP_LEVEL, mtime=0) as member:
+                for record in records:
+                    member.write(json.dumps(record, separators=(',', ':')).encode() + b'\n')
+                    manifest['count'] += 1
+                    manifest['next_task_id'] = max(manifest['next_task_id'], record['id'] + 1)
+            raw.flush()
+            os.fsync(raw.fileno())
+            manifest['size'] = os.fstat(raw.fileno()).st_size
+    write_archive_manifest(manifest)
+
+def iter_archive_records(path=None, size=None):
+    # Stream archived task records, oldest pass first, without decompressing ahead. A
+    # copy elsewhere (e.g. pinned by a snapshot) needs its committed size.
+    if path is None:
+        manifest = read_archive_manifest()
+        if not manifest:
+            return
+        path, size = os.path.join(data_dir(), ARCHIVE_FILE), manifest['size']
+    if not size:
+        return
+    with open(path, 'rb') as raw:
+        with gzip.GzipFile(fileobj=_Prefix(raw, size), mode='rb') as members:
+            for line in members:
+                yield json.loads(line)
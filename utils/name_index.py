@@ -0,0 +1,123 @@
+# utils/name_index.py
+from bisect import bisect_left
+
+class NameIndex:
+    # Case-insensitive name lookup for prefix and fuzzy matching.
+    #
+    # Names are kept as one sorted array, which is a flattened trie: every trie node
+    # (a prefix) is a contiguous range of the array and its children are found by
+    # bisecting within that range. This keeps the memory of a flat list while
+    # allowing trie-style walks.
+
+    def __init__(self, items, name_of):
+        self._name_of = name_of
+        pairs = sorted(((name_of(item).lower(), item.id), item) for item in items)
+        self._keys = [key for (key, _), _ in pairs]
+        self._ids = [item_id for (_, item_id), _ in pairs]
+        self._items = [item for _, item in pairs]
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, item):
+        key = (self._name_of(item).lower(), item.id)
+        position = self._position(key)
+        self._keys.insert(position, key[0])
+        self._ids.insert(position, key[1])
+        self._items.insert(position, item)
+
+    def remove(self, item, name=None):
+        # Pass the old name if it has already been changed on the item
+        key = ((name or self._name_of(item)).lower(), item.id)
+        position = self._position(key)
+        if position < len(self._keys) and (self._keys[position], self._ids[position]) == key:
+            del self._keys[position]
+            del self._ids[position]
+            del self._items[position]
+            return
+        raise KeyError(item.id)
+
+    def _position(self, key):
+        name, item_id = key
+        low = bisect_left(self._keys, name)
+        while low < len(self._keys) and self._keys[low] == name and self._ids[low] < item_id:
+            low += 1
+        return low
+
+    def _prefix_range(self, prefix, low=0, high=None):
+        high = len(self._keys) if high is None else high
+        start = bisect_left(self._keys, prefix, low, high)
+        if not prefix:
+            return start, high
+        # Smallest string that sorts after every string starting with prefix
+        after = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        return start, bisect_left(self._keys, after, start, high)
+
+    def prefix(self, text, limit=None):
+        start, end = self._prefix_range(text.lower())
+        if limit is not None:
+            end = min(end, start + limit)
+        return self._items[start:end]
+
+    def count_prefix(self, text):
+        start, end = self._prefix_range(text.lower())
+        return end - start
+
+    def fuzzy(self, text, max_distance=None, limit=5):
+        # Names whose beginning is within a small edit distance of text, closest first,
+        # so typos in partial names still find something. Tries distance 1 before 2,
+        # since the tighter walk prunes far more of the trie.
+        query = text.lower()
+        if max_distance is None:
+            max_distance = 1 if len(query) <= 4 else 2
+
+        for distance in range(1, max_distance + 1):
+            suggestions = self._fuzzy_walk(query, distance, limit)
+            if suggestions:
+                return suggestions
+        return []
+
+    def _fuzzy_walk(self, query, max_distance, limit):
+        # Walks the implicit trie carrying one edit-distance row per node (with adjacent
+        # transpositions counting as one edit) and abandons a subtree as soon as every
+        # cell in its row is over the limit. fuzzy() only gets here when nothing closer
+        # matched, so the walk can stop as soon as it has found enough names.
+        keys = self._keys
+        width = len(query) + 1
+        over = max_distance + 1
+        suggestions = []
+
+        def walk(depth, low, high, row, previous_row, previous_char):
+            if row[-1] <= max_distance:
+                # Everything under this node starts with something close to the query
+                suggestions.extend(self._items[low:min(high, low + limit - len(suggestions))])
+                return len(suggestions) >= limit
+
+            # The node's own name, if present, sorts first in its range
+            while low < high and len(keys[low]) == depth:
+                low += 1
+
+            while low < high:
+                char = keys[low][depth]
+                _, end = self._prefix_range(keys[low][:depth + 1], low, high)
+
+                # Only cells within max_distance of the diagonal can stay under the limit
+                next_row = [over] * width
+                next_row[0] = min(depth + 1, over)
+                first = max(1, depth + 1 - max_distance)
+                last = min(width, depth + 2 + max_distance)
+                for column in range(first, last):
+                    best = min(next_row[column - 1] + 1, row[column] + 1,
+                               row[column - 1] + (query[column - 1] != char))
+                    if (column > 1 and previous_row is not None and char == query[column - 2]
+                            and previous_char == query[column - 1]):
+                        best = min(best, previous_row[column - 2] + 1)
+                    next_row[column] = min(best, over)
+
+                if min(next_row) <= max_distance and walk(depth + 1, low, end, next_row, row, char):
+                    return True
+                low = end
+            return False
+
+        walk(0, 0, len(keys), [min(column, over) for column in range(width)], None, None)
+        return suggestions
@@ -0,0 +1,386 @@
+# utils/operations.py
+from datetime import datetime, timedelta
+from operator import attrgetter
+from dateutil import parser
+
+from models.user import User
+from models.project import Project
+from models.task import Task
+from utils import archive, event_log, ordering
+from utils.dependency_graph import CycleError
+from utils.event_log import TASK_CREATED, STATUS_CHANGED, REASSIGNED, PROJECT_ADDED
+from utils.reports import throughput_report
+
+# The business rules behind each CLI command, independent of how results are shown.
+# Every function works on a Repository, marks what it changed as dirty and leaves
+# persisting to the caller (repository.flush() or the async service's writer).
+
+class OperationError(Exception):
+    pass
+
+class OperationWarning(OperationError):
+    # The request was valid but there was nothing to do
+    pass
+
+class AmbiguousMatchError(OperationError):
+    pass
+
+KINDS = {'User': 'users', 'Project': 'projects', 'Task': 'tasks'}
+MAX_CANDIDATES = 5
+
+# --sort-by and --group-by choices for the list commands
+TASK_SORTS = ['title', 'status', 'due-date', 'assignee']
+TASK_GROUPS = ['project', 'assignee', 'status']
+PROJECT_SORTS = ['title', 'due-date', 'owner']
+PROJECT_GROUPS = ['owner']
+
+def _describe(repo, kind, items):
+    return ", ".join(f"{repo.name_of(kind, item)} (ID {item.id})" for item in items)
+
+def _resolve(repo, label, identifier):
+    # Exact ID or name first, then a unique name prefix, then fuzzy suggestions
+    kind = KINDS[label]
+    found = repo.find(kind, identifier)
+    if found:
+        return found
+    try:
+        int(identifier)
+    except ValueError:
+        pass
+    else:
+        # IDs are never matched loosely
+        raise OperationError(f"{label} '{identifier}' not found.")
+
+    matches, total = repo.prefix(kind, identifier, MAX_CANDIDATES)
+    if len(matches) == 1:
+        return matches[0]
+    if matches:
+        message = f"{label} '{identifier}' is ambiguous. Matches: {_describe(repo, kind, matches)}"
+        extra = total - len(matches)
+        if extra > 0:
+            message += f" and {extra} more"
+        raise AmbiguousMatchError(message + ".")
+
+    # Typos are the rare case, so only they pay for the fuzzy index
+    message = f"{label} '{identifier}' not found."
+    suggestions = repo.names(kind).fuzzy(identifier, limit=MAX_CANDIDATES)
+    if suggestions:
+        message += f" Did you mean: {_describe(repo, kind, suggestions)}?"
+    raise OperationError(message)
+
+def resolve_user(repo, identifier):
+    return _resolve(repo, 'User', identifier)
+
+def resolve_project(repo, identifier):
+    return _resolve(repo, 'Project', identifier)
+
+def resolve_task(repo, identifier):
+    return _resolve(repo, 'Task', identifier)
+
+def _check_status(status):
+    if status not in Task.VALID_STATUSES:
+        raise OperationError(f"Invalid status: '{status}'. Valid statuses are: {', '.join(Task.VALID_STATUSES)}.")
+
+def add_user(repo, name, email):
+    # Check if user with the same name already exists
+    if repo.find_by_name('users', name):
+        raise OperationError(f"User with name '{name}' already exists.")
+
+    user = User(name, email)
+    repo.add('users', user)
+    return user
+
+def list_users(repo, user_id=None):
+    users = repo.users
+    if user_id:
+        users = [user for user in users if user.id == user_id]
+    return users
+
+def add_project(repo, user, title, description=None, due_date=None):
+    owner = resolve_user(repo, user)
+
+    # Check if project with the same title already exists
+    if repo.find_by_name('projects', title):
+        raise OperationError(f"Project with title '{title}' already exists.")
+
+    # Parse due date
+    try:
+        parsed_due_date = parser.parse(due_date) if due_date else datetime.now()
+    except (ValueError, OverflowError):
+        raise OperationError(f"Invalid due date format: '{due_date}'.")
+
+    project = Project(title, description or "", parsed_due_date, owner.id)
+    repo.add('projects', project)
+    repo.record_event(PROJECT_ADDED, project.id, event_log.NONE, owner.id)
+
+    # Update user's projects
+    owner.add_project(project.id)
+    repo.mark_dirty('users')
+    return project
+
+def iter_projects(repo, user=None, project_id=None, overdue=False, due_within=None, now=None):
+    projects = repo.projects
+
+    # Date queries are range scans over the due-date index, earliest first
+    if overdue:
+        projects = repo.due_dates.overdue(now)
+    elif due_within is not None:
+        if due_within < 0:
+            raise OperationError("--due-within must be zero or more days.")
+        projects = repo.due_dates.due_within(due_within, now)
+
+    # Filters are lazy, so sorting and grouping only hold what they keep
+    if user:
+        owner = resolve_user(repo, user)
+        projects = (project for project in projects if project.user_id == owner.id)
+
+    if project_id:
+        projects = (project for project in projects if project.id == project_id)
+
+    return projects
+
+def list_projects(repo, user=None, project_id=None, overdue=False, due_within=None, now=None,
+                  sort_by=None, top=None):
+    projects = iter_projects(repo, user, project_id, overdue, due_within, now)
+    return ordering.arrange(projects, project_sort_key(repo, sort_by), _check_top(top))
+
+def group_projects(repo, projects, group_by, sort_by=None, top=None):
+    # [(group label, projects, projects in group)], one pass over projects
+    return _group(projects, _project_grouping(repo, group_by), project_sort_key(repo, sort_by),
+                  _check_top(top))
+
+def _check_dependencies(repo, task, identifiers):
+    # Resolve dependencies and make sure none of them would close a cycle
+    dependencies = [resolve_task(repo, identifier) for identifier in identifiers]
+    for dependency in dependencies:
+        try:
+            repo.dependencies.check_edge(task.id, dependency.id)
+        except CycleError as e:
+            raise OperationError(f"Task '{task.title}' can't depend on '{dependency.title}': that would create a cycle ({e}).")
+    return dependencies
+
+def add_task(repo, project, title, description=None, assign=None, depends_on=None):
+    parent = resolve_project(repo, project)
+
+    # Check if task with the same title already exists in the project
+    for task in repo.project_tasks(parent.id):
+        if task.title.lower() == title.lower():
+            raise OperationError(f"Task with title '{title}' already exists in project '{parent.title}'.")
+
+    # Find the assigned user if provided
+    assigned_user_id = None
+    if assign:
+        assigned_user_id = resolve_user(repo, assign).id
+
+    # A new task has no dependents, so it can't close a cycle
+    dependencies = [resolve_task(repo, identifier) for identifier in depends_on or []]
+
+    task = Task(title, description or "", parent.id, assigned_user_id)
+    for dependency in dependencies:
+        task.add_dependency(dependency.id)
+    repo.add('tasks', task)
+    repo.record_event(TASK_CREATED, task.id, event_log.NONE, parent.id)
+    if assigned_user_id is not None:
+        repo.record_event(REASSIGNED, task.id, event_log.NONE, assigned_user_id)
+
+    # Update project's tasks
+    parent.add_task(task.id)
+    repo.mark_dirty('projects')
+    return task
+
+def iter_tasks(repo, project=None, status=None, ready=False, blocked=False, include_archived=False):
+    project_id = resolve_project(repo, project).id if project else None
+    if project:
+        # Only the project's own shard is read when the store is sharded
+        tasks = repo.project_tasks(project_id)
+    else:
+        tasks = repo.tasks
+
+    if status:
+        _check_status(status)
+        tasks = (task for task in tasks if task.status == status)
+
+    # Answered from the dependency graph's open-dependency counts
+    if ready:
+        tasks = (task for task in tasks if repo.dependencies.is_ready(task))
+    elif blocked:
+        tasks = (task for task in tasks if repo.dependencies.is_blocked(task))
+
+    # Archived tasks are closed, so they are never ready or blocked
+    if include_archived and not (ready or blocked):
+        tasks = with_archived(tasks, project_id, status)
+    return tasks
+
+def with_archived(tasks, project_id=None, status=None):
+    # The given hot tasks, then the archived ones matching the same filters, streamed
+    listed = set()
+    for task in tasks:
+        listed.add(task.id)
+        yield task
+    yield from archive.iter_archived(project_id, status, exclude=listed)
+
+def list_tasks(repo, project=None, status=None, ready=False, blocked=False, sort_by=None, top=None,
+               include_archived=False):
+    tasks = iter_tasks(repo, project, status, ready, blocked, include_archived)
+    return arrange_tasks(repo, tasks, sort_by, top)
+
+def arrange_tasks(repo, tasks, sort_by=None, top=None):
+    # Any stream of tasks (e.g. from the task index) sorted and cut to the first top
+    return ordering.arrange(tasks, task_sort_key(repo, sort_by), _check_top(top))
+
+def group_tasks(repo, tasks, group_by, sort_by=None, top=None):
+    # [(group label, tasks, tasks in group)], one pass over tasks
+    return _group(tasks, _task_grouping(repo, group_by), task_sort_key(repo, sort_by), _check_top(top))
+
+def _check_top(top):
+    if top is not None and top < 1:
+        raise OperationError("--top must be at least 1.")
+    return top
+
+def _status_rank(status):
+    # Workflow order rather than alphabetical; unknown statuses last
+    try:
+        return Task.VALID_STATUSES.index(status)
+    except ValueError:
+        return len(Task.VALID_STATUSES)
+
+def _name_rank(names, user_id):
+    # By name, case-insensitively, with nobody last
+    if user_id is None:
+        return (True, "")
+    return (False, names.get(user_id, f"User {user_id}").lower())
+
+def task_sort_key(repo, sort_by):
+    # Sort keys end in the ID so equal values list in a stable, repeatable order
+    if sort_by is None:
+        return None
+    if sort_by == 'title':
+        return lambda task: (task.title.lower(), task.id)
+    if sort_by == 'status':
+        return lambda task: (_status_rank(task.status), task.id)
+    if sort_by == 'due-date':
+        # Tasks are due when their project is; tasks of unknown projects go last
+        due_dates = {project.id: project.due_date for project in repo.projects}
+        def due_key(task):
+            due_date = due_dates.get(task.project_id)
+            return (due_date is None, due_date or datetime.min, task.id)
+        return due_key
+    if sort_by == 'assignee':
+        names = repo.id_names('users')
+        return lambda task: (_name_rank(names, task.assigned_to), task.id)
+    raise OperationError(f"Can't sort tasks by '{sort_by}'. Choose from: {', '.join(TASK_SORTS)}.")
+
+def project_sort_key(repo, sort_by):
+    if sort_by is None:
+        return None
+    if sort_by == 'title':
+        return lambda project: (project.title.lower(), project.id)
+    if sort_by == 'due-date':
+        return attrgetter('due_date', 'id')
+    if sort_by == 'owner':
+        names = repo.id_names('users')
+        return lambda project: (_name_rank(names, project.user_id), project.id)
+    raise OperationError(f"Can't sort projects by '{sort_by}'. Choose from: {', '.join(PROJECT_SORTS)}.")
+
+def _task_grouping(repo, group_by):
+    # (group of a task, label of a group, order of groups)
+    if group_by == 'project':
+        names = repo.id_names('projects')
+        label = lambda project_id: names.get(project_id, f"Project {project_id}")
+        return attrgetter('project_id'), label, lambda project_id: (label(project_id).lower(), project_id)
+    if group_by == 'assignee':
+        names = repo.id_names('users')
+        label = lambda user_id: names.get(user_id, f"User {user_id}") if user_id else "Unassigned"
+        return attrgetter('assigned_to'), label, lambda user_id: (_name_rank(names, user_id), user_id or 0)
+    if group_by == 'status':
+        return attrgetter('status'), str, lambda status: (_status_rank(status), status)
+    raise OperationError(f"Can't group tasks by '{group_by}'. Choose from: {', '.join(TASK_GROUPS)}.")
+
+def _project_grouping(repo, group_by):
+    if group_by == 'owner':
+        names = repo.id_names('users')
+        label = lambda user_id: names.get(user_id, f"User {user_id}")
+        return attrgetter('user_id'), label, lambda user_id: (_name_rank(names, user_id), user_id)
+    raise OperationError(f"Can't group projects by '{group_by}'. Choose from: {', '.join(PROJECT_GROUPS)}.")
+
+def _group(items, grouping, sort_key, top):
+    group_of, label, order = grouping
+    groups = ordering.group(items, group_of, sort_key, top)
+    return [(label(name), *groups[name]) for name in sorted(groups, key=order)]
+
+def critical_path(repo, project):
+    parent = resolve_project(repo, project)
+    return repo.dependencies.critical_path(repo.project_tasks(parent.id))
+
+def complete_task(repo, task):
+    found = resolve_task(repo, task)
+
+    if found.status == 'completed':
+        raise OperationWarning(f"Task '{found.title}' is already completed.")
+
+    old_status = found.status
+    found.mark_completed()
+    repo.status_changed(found, old_status)
+    repo.record_event(STATUS_CHANGED, found.id, event_log.status_code(old_status), event_log.status_code('completed'))
+    repo.mark_dirty('tasks', found.project_id)
+    return found
+
+def update_task(repo, task, title=None, description=None, status=None, assign=None,
+                depends_on=None, remove_dependencies=None):
+    found = resolve_task(repo, task)
+
+    # Validate everything before changing anything
+    if status:
+        _check_status(status)
+
+    added = _check_dependencies(repo, found, depends_on or [])
+    removed = [resolve_task(repo, identifier) for identifier in remove_dependencies or []]
+
+    assigned_to = found.assigned_to
+    if assign:
+        if assign.lower() == 'none':
+            assigned_to = None
+        else:
+            assigned_to = resolve_user(repo, assign).id
+
+    if title:
+        old_title = found.title
+        found.title = title
+        repo.renamed('tasks', found, old_title)
+
+    if description:
+        found.description = description
+
+    if status and status != found.status:
+        old_status = found.status
+        repo.record_event(STATUS_CHANGED, found.id, event_log.status_code(old_status), event_log.status_code(status))
+        found.status = status
+        repo.status_changed(found, old_status)
+
+    for dependency in removed:
+        repo.dependencies.remove_edge(found, dependency.id)
+    for dependency in added:
+        repo.dependencies.add_edge(found, dependency.id)
+
+    if assigned_to != found.assigned_to:
+        repo.record_event(REASSIGNED, found.id, event_log.user_code(found.assigned_to), event_log.user_code(assigned_to))
+        found.assigned_to = assigned_to
+
+    repo.mark_dirty('tasks', found.project_id)
+    return found
+
+def report(repo, days=30, since=None, until=None):
+    # Window is [since, until); defaults to the last `days` days up to now
+    try:
+        end = parser.parse(until) if until else datetime.now()
+        start = parser.parse(since) if since else end - timedelta(days=days)
+    except (ValueError, OverflowError):
+        raise OperationError(f"Invalid date format: '{since or until}'.")
+    if start >= end:
+        raise OperationError("The report window must start before it ends.")
+
+    def assignee_of(task_id):
+        task = repo.find('tasks', task_id)
+        return task.assigned_to if task else None
+
+    return throughput_report(event_log.iter_events(), start.timestamp(), end.timestamp(), assignee_of)
@@ -0,0 +1,73 @@
+# utils/ordering.py
+import heapq
+from itertools import count, islice
+
+# Sorting, top-k and grouping over a stream of items in one pass. With a limit, only
+# the items that will be shown are ever held: O(k) memory for top-k, O(k) per group
+# when grouping, instead of materializing and sorting the whole stream.
+
+class _Kept:
+    # Heap entry ordered backwards, so the root of a heapq heap is the largest kept rank
+    __slots__ = ('rank', 'item')
+
+    def __init__(self, rank, item):
+        self.rank = rank
+        self.item = item
+
+    def __lt__(self, other):
+        return other.rank < self.rank
+
+class TopK:
+    # The k smallest items pushed so far by key, ties kept in arrival order
+    def __init__(self, k, key):
+        self.k = k
+        self.key = key
+        self._heap = []
+        self._sequence = count()
+
+    def push(self, item):
+        rank = (self.key(item), next(self._sequence))
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, _Kept(rank, item))
+        elif self._heap and rank < self._heap[0].rank:
+            heapq.heapreplace(self._heap, _Kept(rank, item))
+
+    def items(self):
+        return [kept.item for kept in sorted(self._heap, key=lambda kept: kept.rank)]
+
+class _FirstK:
+    # The first k items pushed, or all of them when k is None
+    def __init__(self, k, key=None):
+        self.k = k
+        self.key = key
+        self._items = []
+
+    def push(self, item):
+        if self.k is None or len(self._items) < self.k:
+            self._items.append(item)
+
+    def items(self):
+        return sorted(self._items, key=self.key) if self.key else self._items
+
+def arrange(items, key=None, top=None):
+    # items sorted by key (stable), or in stream order without one, cut to the first top
+    if key is None:
+        return list(items) if top is None else list(islice(items, top))
+    if top is None:
+        return sorted(items, key=key)
+    return heapq.nsmallest(top, items, key=key)
+
+def group(items, group_key, key=None, top=None):
+    # Single pass; returns {group: (arranged items, total in group)} in first-seen order
+    buckets = {}
+    totals = {}
+    for item in items:
+        name = group_key(item)
+        bucket = buckets.get(name)
+        if bucket is None:
+            bucket = TopK(top, key) if key is not None and top is not None else _FirstK(top, key)
+            buckets[name] = bucket
+            totals[name] = 0
+        bucket.push(item)
+        totals[name] += 1
+    return {name: (bucket.items(), totals[name]) for name, bucket in buckets.items()}
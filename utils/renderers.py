@@ -0,0 +1,74 @@
+# utils/renderers.py
+import json
+import sys
+
+OUTPUT_FORMATS = ['table', 'json', 'jsonl']
+
+def _groups(result):
+    # A grouped listing split back into (title, items), one table per group
+    start = 0
+    for group in result.data['groups']:
+        count, total = group['count'], group['total']
+        size = f"{count} of {total}" if count < total else str(total)
+        yield f"{result.kind.capitalize()}: {group['group']} ({size})", result.items[start:start + count]
+        start += count
+
+def render_table(result):
+    # Rich is only imported when something is actually drawn
+    from utils import cli_helpers
+
+    if result.status == 'success':
+        cli_helpers.print_success(result.message)
+    elif result.status == 'warning':
+        cli_helpers.print_warning(result.message)
+    elif result.status == 'error':
+        cli_helpers.print_error(result.message)
+    elif result.kind == 'users':
+        cli_helpers.print_users_table(result.items)
+    elif result.kind == 'projects' and result.data and result.items:
+        for title, projects in _groups(result):
+            cli_helpers.print_projects_table(projects, result.context.get('user_names'), title)
+    elif result.kind == 'projects':
+        cli_helpers.print_projects_table(result.items, result.context.get('user_names'))
+    elif result.kind == 'tasks' and result.data and result.items:
+        for title, tasks in _groups(result):
+            cli_helpers.print_tasks_table(tasks, result.context.get('project_names'),
+                                          result.context.get('user_names'), title)
+    elif result.kind == 'tasks':
+        cli_helpers.print_tasks_table(result.items, result.context.get('project_names'),
+                                      result.context.get('user_names'))
+    elif result.kind == 'report':
+        cli_helpers.print_report(result.data, result.context.get('user_names'))
+    elif result.kind == 'changes':
+        cli_helpers.print_changes(result.data['changes'])
+    elif result.kind == 'validation':
+        cli_helpers.print_validation(result.data)
+    # A listing only carries a message when something went wrong after it, see Result.warn()
+    if result.status == 'ok' and result.message:
+        cli_helpers.print_warning(result.message)
+
+def render_json(result):
+    sys.stdout.write(json.dumps(result.to_dict()) + "\n")
+
+def render_jsonl(result):
+    # Listings and change feeds stream one record per line; messages are a single line
+    write = sys.stdout.write
+    dumps = json.dumps
+    if result.kind == 'changes':
+        for change in result.data['changes']:
+            write(dumps(change) + "\n")
+        return
+    if result.items is None:
+        render_json(result)
+        return
+    for item in result.items:
+        write(dumps(item.to_dict()) + "\n")
+
+RENDERERS = {
+    'table': render_table,
+    'json': render_json,
+    'jsonl': render_jsonl,
+}
+
+def render(result, output='table'):
+    RENDERERS[output](result)
@@ -0,0 +1,57 @@
+# utils/reports.py
+from datetime import datetime
+from models.task import Task
+from utils.event_log import TASK_CREATED, STATUS_CHANGED, REASSIGNED, NONE
+
+COMPLETED = Task.VALID_STATUSES.index('completed')
+PENDING = Task.VALID_STATUSES.index('pending')
+
+def throughput_report(events, start, end, assignee_of=None):
+    # One pass over the event stream. Memory is per task (its current status and
+    # assignee), never per event, so the log can be arbitrarily long.
+    #
+    # events      iterable of (timestamp, task_id, kind, old, new) in log order
+    # start, end  window as POSIX timestamps; only changes inside it are counted
+    # assignee_of fallback for tasks whose assignment predates the log
+    current = {}
+    assignees = {}
+    completions_per_day = {}
+    completions_by_assignee = {}
+    status_time = {}
+
+    for timestamp, task_id, kind, old, new in events:
+        if kind == TASK_CREATED:
+            current[task_id] = (PENDING, timestamp)
+        elif kind == REASSIGNED:
+            assignees[task_id] = None if new == NONE else new
+        elif kind == STATUS_CHANGED:
+            entered = current.get(task_id)
+            current[task_id] = (new, timestamp)
+            if not start <= timestamp < end:
+                continue
+
+            # A stint only counts when we saw both its start and end
+            if entered is not None and entered[0] == old:
+                total, count = status_time.get(old, (0.0, 0))
+                status_time[old] = (total + timestamp - entered[1], count + 1)
+
+            if new == COMPLETED:
+                day = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d")
+                completions_per_day[day] = completions_per_day.get(day, 0) + 1
+                if task_id in assignees:
+                    assignee = assignees[task_id]
+                else:
+                    assignee = assignee_of(task_id) if assignee_of else None
+                completions_by_assignee[assignee] = completions_by_assignee.get(assignee, 0) + 1
+
+    return {
+        'start': datetime.fromtimestamp(start).isoformat(),
+        'end': datetime.fromtimestamp(end).isoformat(),
+        'completions_per_day': dict(sorted(completions_per_day.items())),
+        'average_time_in_status': {
+            Task.VALID_STATUSES[code]: total / count
+            for code, (total, count) in sorted(status_time.items())
+        },
+        'completions_by_assignee': dict(sorted(completions_by_assignee.items(),
+                                               key=lambda item: -item[1])),
+    }
@@ -0,0 +1,345 @@
+# utils/repository.py
+from operator import attrgetter
+from utils import archive, event_log, file_handler
+from utils.dependency_graph import DependencyGraph
+from utils.due_date_index import DueDateIndex
+from utils.name_index import NameIndex
+
+class Repository:
+    # In-memory view of the data directory. Collections are loaded on first use,
+    # indexed by id and lower-cased name, and written back only when marked dirty.
+    # With a sharded task store, project-scoped access loads and writes just the
+    # shards it touches. A repository belongs to one workspace, the one current when
+    # it was created unless given explicitly.
+
+    FILES = {
+        'users': 'users.json',
+        'projects': 'projects.json',
+        'tasks': 'tasks.json',
+    }
+
+    def __init__(self, workspace=None):
+        if workspace is None:
+            workspace = file_handler.current_workspace()
+        self.workspace = file_handler.check_workspace(workspace)
+        self._collections = {}
+        self._by_id = {}
+        self._by_name = {}
+        self._dirty = set()
+        self._due_dates = None
+        self._dependencies = None
+        self._name_indexes = {}
+        # Kinds whose names have been prefix-scanned once, see prefix()
+        self._name_scans = set()
+        self._id_names = {}
+        self._events = []
+        # Project ids whose task shards are loaded, or None once every task is
+        self._task_scope = None
+        self._dirty_task_projects = set()
+        # Store signatures of the files each collection was loaded from, see is_current()
+        self._signatures = {}
+        # With write-behind, flush() leaves changes in memory until commit() (see the shell)
+        self.write_behind = False
+        # Why the automatic archive pass after the last commit failed, see commit()
+        self.archive_error = None
+
+    def _load(self, kind):
+        if kind not in self._collections:
+            with file_handler.workspace(self.workspace):
+                self._signatures[kind] = self.store_signature(kind)
+                loader = getattr(file_handler, f"load_{kind}")
+                self._set_collection(kind, loader())
+        elif kind == 'tasks' and self._task_scope is not None:
+            # Only some shards are loaded; bring in the rest
+            with file_handler.workspace(self.workspace):
+                missing = [project_id for project_id in file_handler.task_shards()
+                           if project_id not in self._task_scope]
+                self._extend('tasks', file_handler.load_tasks(missing))
+            self._collections['tasks'].sort(key=attrgetter('id'))
+            self._task_scope = None
+        return self._collections[kind]
+
+    def _extend(self, kind, items):
+        self._collections[kind].extend(items)
+        self._by_id[kind].update((item.id, item) for item in items)
+        for item in items:
+            self._by_name[kind].setdefault(self.name_of(kind, item).lower(), item)
+            if kind in self._name_indexes:
+                self._name_indexes[kind].add(item)
+            if kind in self._id_names:
+                self._id_names[kind][item.id] = self.name_of(kind, item)
+
+    def _load_shard(self, project_id):
+        # Make sure one project's tasks are in memory, reading only its shard when sharded
+        with file_handler.workspace(self.workspace):
+            if 'tasks' not in self._collections and file_handler.is_sharded():
+                self._signatures['tasks'] = self.store_signature('tasks')
+                self._set_collection('tasks', file_handler.load_tasks([project_id]))
+                self._task_scope = {project_id}
+            elif self._task_scope is not None and project_id not in self._task_scope:
+                self._extend('tasks', file_handler.load_tasks([project_id]))
+                self._task_scope.add(project_id)
+        return self._collections['tasks'] if 'tasks' in self._collections else self._load('tasks')
+
+    def project_tasks(self, project_id):
+        return [task for task in self._load_shard(project_id) if task.project_id == project_id]
+
+    def _set_collection(self, kind, items):
+        self._id_names.pop(kind, None)
+        self._collections[kind] = items
+        self._by_id[kind] = {item.id: item for item in items}
+        names = {}
+        for item in items:
+            # First match wins, like the original linear scans
+            names.setdefault(self.name_of(kind, item).lower(), item)
+        self._by_name[kind] = names
+
+    @staticmethod
+    def name_of(kind, item):
+        return item.name if kind == 'users' else item.title
+
+    @property
+    def users(self):
+        return self._load('users')
+
+    @property
+    def projects(self):
+        return self._load('projects')
+
+    @property
+    def tasks(self):
+        return self._load('tasks')
+
+    @property
+    def due_dates(self):
+        # Built on first use and kept current by add()
+        if self._due_dates is None:
+            self._due_dates = DueDateIndex(self.projects)
+        return self._due_dates
+
+    @property
+    def dependencies(self):
+        # Needs every task, since dependencies may cross projects; kept current by
+        # add() and status_changed()
+        if self._dependencies is None:
+            self._dependencies = DependencyGraph(self.tasks)
+        return self._dependencies
+
+    def names(self, kind):
+        # Prefix/fuzzy index over names, for fuzzy suggestions, completion and repeated
+        # prefix lookups; building it sorts every name, so one-shot lookups scan instead
+        if kind not in self._name_indexes:
+            self._name_indexes[kind] = NameIndex(self._load(kind), lambda item: self.name_of(kind, item))
+        return self._name_indexes[kind]
+
+    def prefix(self, kind, text, limit=None):
+        # Items whose name starts with text, in name order, and how many there are. A
+        # one-shot command scans the names once rather than building the index; the
+        # second lookup (in a shell, say) builds it
+        if kind not in self._name_indexes and kind not in self._name_scans:
+            self._name_scans.add(kind)
+            text = text.lower()
+            name = attrgetter('name' if kind == 'users' else 'title')
+            matches = [item for item in self._load(kind) if name(item).lower().startswith(text)]
+            matches.sort(key=lambda item: (self.name_of(kind, item).lower(), item.id))
+            return matches[:limit], len(matches)
+        names = self.names(kind)
+        return names.prefix(text, limit), names.count_prefix(text)
+
+    def id_names(self, kind):
+        # id -> name map for rendering, built once and kept current by add() and renamed()
+        if kind not in self._id_names:
+            self._id_names[kind] = {item.id: self.name_of(kind, item) for item in self._load(kind)}
+        return self._id_names[kind]
+
+    def load_all(self):
+        for kind in self.FILES:
+            self._load(kind)
+        return self
+
+    def find(self, kind, identifier):
+        self._load(kind)
+        # Try to get by ID, then by name
+        try:
+            return self._by_id[kind].get(int(identifier))
+        except ValueError:
+            return self._by_name[kind].get(identifier.lower())
+
+    def find_by_name(self, kind, name):
+        self._load(kind)
+        return self._by_name[kind].get(name.lower())
+
+    def find_user(self, identifier):
+        return self.find('users', identifier)
+
+    def find_project(self, identifier):
+        return self.find('projects', identifier)
+
+    def find_task(self, identifier):
+        return self.find('tasks', identifier)
+
+    def add(self, kind, item):
+        collection = self._load_shard(item.project_id) if kind == 'tasks' else self._load(kind)
+        collection.append(item)
+        self._by_id[kind][item.id] = item
+        self._by_name[kind].setdefault(self.name_of(kind, item).lower(), item)
+        if kind == 'projects' and self._due_dates is not None:
+            self._due_dates.add(item)
+        if kind == 'tasks' and self._dependencies is not None:
+            self._dependencies.add_task(item)
+        if kind in self._name_indexes:
+            self._name_indexes[kind].add(item)
+        if kind in self._id_names:
+            self._id_names[kind][item.id] = self.name_of(kind, item)
+        if kind == 'tasks':
+            self._dirty_task_projects.add(item.project_id)
+        self._dirty.add(kind)
+
+    def renamed(self, kind, item, old_name):
+        # Keep the name index in step with an in-place title/name change
+        names = self._by_name[kind]
+        if names.get(old_name.lower()) is item:
+            del names[old_name.lower()]
+            for other in self._collections[kind]:
+                if other is not item and self.name_of(kind, other).lower() == old_name.lower():
+                    names[old_name.lower()] = other
+                    break
+        names.setdefault(self.name_of(kind, item).lower(), item)
+        if kind in self._name_indexes:
+            self._name_indexes[kind].remove(item, old_name)
+            self._name_indexes[kind].add(item)
+        if kind in self._id_names:
+            self._id_names[kind][item.id] = self.name_of(kind, item)
+
+    def status_changed(self, task, old_status):
+        # Keep ready/blocked counts in step with an in-place status change
+        if self._dependencies is not None:
+            self._dependencies.status_changed(task, old_status)
+
+    def mark_dirty(self, kind, project_id=None):
+        # For tasks, naming the project keeps a sharded write to that one shard
+        self._dirty.add(kind)
+        if kind == 'tasks':
+            if project_id is None:
+                self._dirty_task_projects.update(task.project_id for task in self._collections.get('tasks', []))
+            else:
+                self._dirty_task_projects.add(project_id)
+
+    def record_event(self, kind, task_id, old, new):
+        # Appended to the event log on the next write, after the collections
+        self._events.append(event_log.make_event(kind, task_id, old, new))
+
+    @property
+    def dirty(self):
+        return bool(self._dirty or self._events)
+
+    def snapshot(self):
+        # Serialize dirty collections to plain records and clear the dirty flags,
+        # so the actual file writes can happen elsewhere (e.g. off the event loop)
+        records = {}
+        with file_handler.workspace(self.workspace):
+            sharded = file_handler.is_sharded()
+        for kind in self.FILES:
+            if kind not in self._dirty:
+                continue
+            if kind == 'tasks' and sharded:
+                records[file_handler.SHARD_DIR] = self._task_shard_records()
+            else:
+                records[self.FILES[kind]] = [item.to_dict() for item in self._collections[kind]]
+        self._dirty_task_projects.clear()
+        if self._events:
+            records[event_log.EVENTS_FILE] = self._events
+            self._events = []
+        self._dirty.clear()
+        return records
+
+    def _task_shard_records(self):
+        shards = {project_id: [] for project_id in self._dirty_task_projects}
+        for task in self._collections['tasks']:
+            if task.project_id in shards:
+                shards[task.project_id].append(task.to_dict())
+        return shards
+
+    def mark_unsaved(self, records):
+        # Undo snapshot() for records that never made it to disk
+        for kind, filename in self.FILES.items():
+            if filename in records:
+                self._dirty.add(kind)
+        if file_handler.SHARD_DIR in records:
+            self._dirty.add('tasks')
+            self._dirty_task_projects.update(records[file_handler.SHARD_DIR])
+        self._events = records.get(event_log.EVENTS_FILE, []) + self._events
+
+    @classmethod
+    def write_snapshot(cls, records, workspace=None):
+        # One commit under the data lock, so snapshots never see half of it. Returns
+        # the new store signatures of the collections it wrote.
+        kinds = {filename: kind for kind, filename in cls.FILES.items()}
+        kinds[file_handler.SHARD_DIR] = 'tasks'
+        with file_handler.workspace(workspace or file_handler.current_workspace()), file_handler.data_lock():
+            for filename, data in records.items():
+                if filename == event_log.EVENTS_FILE:
+                    event_log.append_events(data)
+                elif filename == file_handler.SHARD_DIR:
+                    file_handler.save_task_records(data)
+                else:
+                    file_handler.save_records(filename, data)
+            return {kinds[filename]: cls.store_signature(kinds[filename])
+                    for filename in records if filename in kinds}
+
+    @classmethod
+    def store_signature(cls, kind):
+        # Fingerprint of a collection's files in the current workspace, None if absent
+        try:
+            if kind == 'tasks':
+                return file_handler.tasks_signature()
+            return file_handler.file_signature(cls.FILES[kind])
+        except FileNotFoundError:
+            return None
+
+    def is_current(self):
+        # False once another process has changed a collection this one has loaded
+        with file_handler.workspace(self.workspace):
+            return all(self.store_signature(kind) == signature
+                       for kind, signature in self._signatures.items())
+
+    def flush(self):
+        if not self.write_behind:
+            self.commit()
+
+    def commit(self):
+        records = self.snapshot()
+        try:
+            self._signatures.update(self.write_snapshot(records, self.workspace))
+        except BaseException:
+            # Keep the changes pending so the next commit retries them
+            self.mark_unsaved(records)
+            raise
+        # The changes are saved whatever the archive pass does, so its failure is kept
+        # for the caller to report with its result rather than raised
+        self.archive_error = None
+        try:
+            self.archived(self.archive_pass(records, self.workspace))
+        except (archive.ArchiveError, ValueError, OSError) as e:
+            self.archive_error = e
+
+    @classmethod
+    def archive_pass(cls, records, workspace=None):
+        # The automatic archive policy (see utils/archive.py) runs after commits that wrote
+        # tasks. Returns the ids it archived, or None when no pass was due.
+        if cls.FILES['tasks'] not in records and file_handler.SHARD_DIR not in records:
+            return None
+        with file_handler.workspace(workspace or file_handler.current_workspace()):
+            return archive.auto_archive()
+
+    def archived(self, ids):
+        # Forget tasks an archive pass moved out of the hot store, so a later commit
+        # doesn't write them back into it
+        if not ids or 'tasks' not in self._collections:
+            return
+        self._set_collection('tasks', [task for task in self._collections['tasks'] if task.id not in ids])
+        self._name_indexes.pop('tasks', None)
+        self._name_scans.discard('tasks')
+        self._dependencies = None
+        with file_handler.workspace(self.workspace):
+            self._signatures['tasks'] = self.store_signature('tasks')
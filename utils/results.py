@@ -0,0 +1,71 @@
+# utils/results.py
+class Result:
+    # What a command handler produced, independent of how it will be rendered.
+    # status is 'success', 'warning' or 'error' for messages, or 'ok' for listings.
+
+    def __init__(self, status, message=None, item=None, kind=None, items=None, context=None, data=None):
+        self.status = status
+        self.message = message
+        self.item = item
+        self.kind = kind
+        self.items = items
+        # Plain JSON-able payload for results that aren't model objects (e.g. reports)
+        self.data = data
+        # Extra objects a renderer may need, e.g. users/projects for name columns
+        self.context = context or {}
+
+    @classmethod
+    def success(cls, message, item=None):
+        return cls('success', message, item=item)
+
+    @classmethod
+    def warning(cls, message, item=None):
+        return cls('warning', message, item=item)
+
+    @classmethod
+    def error(cls, message):
+        return cls('error', message)
+
+    @classmethod
+    def listing(cls, kind, items, **context):
+        return cls('ok', kind=kind, items=items, context=context)
+
+    @classmethod
+    def grouped(cls, kind, groups, **context):
+        # groups are (label, items, total in group); items stay one flat list, with each
+        # group's label and size in data so renderers can split it back up
+        items = []
+        summary = []
+        for label, members, total in groups:
+            items.extend(members)
+            summary.append({'group': label, 'count': len(members), 'total': total})
+        return cls('ok', kind=kind, items=items, context=context, data={'groups': summary})
+
+    @classmethod
+    def report(cls, kind, data, **context):
+        return cls('ok', kind=kind, data=data, context=context)
+
+    def warn(self, message):
+        # For trouble after the command itself succeeded, e.g. the automatic archive pass
+        self.message = f"{self.message} {message}" if self.message else message
+        if self.status == 'success':
+            self.status = 'warning'
+        return self
+
+    @property
+    def ok(self):
+        return self.status != 'error'
+
+    def to_dict(self):
+        data = {'status': self.status}
+        if self.message is not None:
+            data['message'] = self.message
+        if self.item is not None:
+            data['item'] = self.item.to_dict()
+        if self.kind is not None:
+            data['kind'] = self.kind
+        if self.items is not None:
+            data['items'] = [item.to_dict() for item in self.items]
+        if self.data is not None:
+            data['data'] = self.data
+        return data
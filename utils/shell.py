@@ -0,0 +1,235 @@
+# utils/shell.py
+import argparse
+import cmd
+import shlex
+import sys
+import threading
+
+from utils import file_handler
+from utils.renderers import render
+from utils.results import Result
+from utils.workspaces import WorkspacePool
+
+# Seconds without a command before pending changes are written
+IDLE_FLUSH = 1.0
+
+# Commands that read or replace the files directly rather than going through the
+# repository, so pending changes are written before they run
+FILE_COMMANDS = {'index-tasks', 'shard-tasks', 'report', 'watch', 'validate', 'snapshot', 'restore',
+                 'compress-store', 'archive'}
+NOT_IN_SHELL = {'shell'}
+
+# Which collection each name-taking option completes from
+NAME_OPTIONS = {
+    '--user': 'users',
+    '--assign': 'users',
+    '--project': 'projects',
+    '--task': 'tasks',
+    '--depends-on': 'tasks',
+    '--remove-dependency': 'tasks',
+}
+COMPLETION_LIMIT = 50
+
+def _split(text):
+    # shlex.split tolerating an unterminated quote at the end; returns (words, open quote)
+    for quote in ('', '"', "'"):
+        try:
+            return shlex.split(text + quote), quote
+        except ValueError:
+            continue
+    return text.split(), ''
+
+class Shell(cmd.Cmd):
+    # Runs CLI commands against repositories that stay loaded between lines, so Rich,
+    # dateutil and the data are only loaded once per session. Lines are parsed by the
+    # same argparse tree as main.py and dispatched to the same handlers.
+    #
+    # Writes are deferred: handlers' flush() only marks changes as pending, and they are
+    # committed once the shell has been idle for IDLE_FLUSH seconds, before a command
+    # that reads the files directly, and on exit. Commands and the idle writer are
+    # serialized by one lock, since a Repository isn't thread-safe.
+
+    intro = "Project Management shell. Type 'help' for commands, 'exit' to quit."
+    prompt = "pm> "
+
+    def __init__(self, parser, handlers, output='table', idle_flush=IDLE_FLUSH, stdin=None, stdout=None,
+                 record=None):
+        super().__init__(stdin=stdin, stdout=stdout)
+        self.parser = parser
+        self.handlers = {name: handler for name, handler in handlers.items() if name not in NOT_IN_SHELL}
+        self.output = output
+        self.idle_flush = idle_flush
+        # Called with the argv of every command run, e.g. main.record_invocation for PM_TRACE
+        self.record = record
+        self.pool = WorkspacePool()
+        self._lock = threading.RLock()
+        self._timer = None
+        self._subparsers = next(action.choices for action in parser._actions
+                                if isinstance(action, argparse._SubParsersAction))
+
+    def repository(self, workspace=None):
+        repo = self.pool.get(workspace)
+        repo.write_behind = True
+        return repo
+
+    def commit(self):
+        # Returns a message if an automatic archive pass failed after the write
+        with self._lock:
+            errors = self.pool.flush()
+        if errors:
+            return "Automatic archiving failed: " + "; ".join(str(e) for e in errors)
+        return None
+
+    def _idle_commit(self):
+        # A failed write leaves the changes pending; the next command or exit retries it
+        try:
+            problem = self.commit()
+        except (OSError, file_handler.CompressionError) as e:
+            render(Result.error(f"Could not save changes, they are still pending: {e}"), self.output)
+            sys.stdout.flush()
+            return
+        if problem:
+            render(Result.warning(problem), self.output)
+            sys.stdout.flush()
+
+    def _schedule_commit(self):
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(self.idle_flush, self._idle_commit)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def run(self):
+        # Returns the final commit's archive problem, if any (see commit())
+        try:
+            while True:
+                try:
+                    self.cmdloop()
+                    break
+                except KeyboardInterrupt:
+                    # Abandon the current line, not the session
+                    self.intro = None
+                    self.stdout.write("\n")
+        finally:
+            if self._timer is not None:
+                self._timer.cancel()
+            problem = self.commit()
+        return problem
+
+    def preloop(self):
+        # Option names and workspace names contain '-' and '.', which readline would
+        # otherwise treat as word breaks
+        try:
+            import readline
+        except ImportError:
+            return
+        readline.set_completer_delims(" \t\n\"'")
+
+    def emptyline(self):
+        pass
+
+    def execute(self, argv):
+        try:
+            args = self.parser.parse_args(argv)
+        except SystemExit:
+            # argparse has already printed the usage error (or the help that was asked for)
+            return None
+        if not any(arg == '--output' or arg.startswith('--output=') for arg in argv):
+            args.output = self.output
+        handler = self.handlers.get(args.command)
+        if handler is None:
+            return Result.error(f"'{args.command}' can't be run from the shell."), args.output
+        if self.record is not None:
+            self.record(argv)
+        try:
+            workspace = file_handler.check_workspace(args.workspace or file_handler.current_workspace())
+        except ValueError as e:
+            return Result.error(str(e)), args.output
+
+        with self._lock, file_handler.workspace(workspace):
+            try:
+                if args.command in FILE_COMMANDS or getattr(args, 'mmap', False):
+                    problem = self.commit()
+                    result = handler(args)
+                    if problem:
+                        result.warn(problem)
+                    return result, args.output
+                repo = self.repository(workspace)
+                result = handler(args, repo)
+            except file_handler.CompressionError as e:
+                return Result.error(str(e)), args.output
+            if repo.dirty:
+                self._schedule_commit()
+        return result, args.output
+
+    def default(self, line):
+        try:
+            argv = shlex.split(line)
+        except ValueError as e:
+            render(Result.error(f"Could not parse the line: {e}."), self.output)
+            return
+        outcome = self.execute(argv)
+        if outcome is not None:
+            render(*outcome)
+            sys.stdout.flush()
+
+    def do_help(self, arg):
+        # 'help COMMAND' is COMMAND --help
+        if arg:
+            self.execute([arg, '--help'])
+        else:
+            self.parser.print_help()
+            print("\nShell commands: help [COMMAND], exit")
+
+    def do_exit(self, arg):
+        return True
+
+    do_quit = do_exit
+
+    def do_EOF(self, arg):
+        self.stdout.write("\n")
+        return True
+
+    def completenames(self, text, *ignored):
+        return [name for name in sorted(self.handlers) + ['exit', 'help']
+                if name.startswith(text)]
+
+    def completedefault(self, text, line, begidx, endidx):
+        words, quote = _split(line[:endidx])
+        if not words:
+            return []
+        if line[:endidx].endswith((' ', '\t')) and not quote:
+            words.append('')
+        current = words[-1]
+        previous = words[-2] if len(words) > 1 else None
+
+        if current.startswith('-') and not quote:
+            subparser = self._subparsers.get(words[0])
+            options = subparser._option_string_actions if subparser else {}
+            return sorted(option for option in options if option.startswith(current))
+
+        if previous == '--workspace':
+            candidates = file_handler.list_workspaces()
+        elif previous in NAME_OPTIONS:
+            kind = NAME_OPTIONS[previous]
+            with self._lock:
+                repo = self.repository()
+                items = repo.names(kind).prefix(current, COMPLETION_LIMIT)
+                candidates = [repo.name_of(kind, item) for item in items]
+        else:
+            return []
+
+        # readline replaces just `text`, the part of the current word after the last
+        # space or quote, so hand back the matching tail of each name
+        offset = len(current) - len(text)
+        matches = []
+        for candidate in candidates:
+            if not candidate.lower().startswith(current.lower()):
+                continue
+            if quote:
+                matches.append(candidate[offset:] + quote)
+            elif ' ' in candidate:
+                matches.append(f'"{candidate}"')
+            else:
+                matches.append(candidate)
+        return matches
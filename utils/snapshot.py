@@ -0,0 +1,291 @@
+# utils/snapshot.py
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import struct
+import tempfile
+import zlib
+from contextlib import ExitStack
+from datetime import datetime
+
+from utils import event_log, file_handler
+
+# A snapshot is one gzip-compressed JSON Lines archive of the whole data directory:
+#
+#   {"format": "pm-snapshot", "version": 1, "created": ..., "sharded": ...}
+#   {"kind": "users", "record": {...}}     one line per user, project and task,
+#   {"kind": "archived", "record": {...}}  per archived task
+#   {"kind": "events", "record": [...]}    and per event log record
+#   {"kind": "end", "counts": {...}, "next_ids": {...}, "sha256": "..."}
+#
+# The checksum covers every line before the trailer, so an archive can be verified
+# in one streaming pass without loading it.
+FORMAT = 'pm-snapshot'
+VERSION = 1
+COLLECTIONS = ('users', 'projects', 'tasks')
+KINDS = COLLECTIONS + ('archived', 'events')
+REQUIRED_FIELDS = {
+    'users': ('id', 'name', 'email', 'projects'),
+    'projects': ('id', 'title', 'description', 'due_date', 'user_id', 'tasks'),
+    'tasks': ('id', 'title', 'description', 'status', 'project_id', 'assigned_to'),
+}
+REQUIRED_FIELDS['archived'] = REQUIRED_FIELDS['tasks']
+
+ARCHIVED_STAGING = 'archived.jsonl'
+
+class SnapshotError(Exception):
+    pass
+
+def _without_empty_archive(counts):
+    # Counts only mention archived tasks when there are some, as before the archive existed
+    return {kind: count for kind, count in counts.items() if count or kind != 'archived'}
+
+def describe_counts(counts):
+    return ", ".join(f"{counts.get(kind, 0)} {kind}" for kind in KINDS
+                     if counts.get(kind) or kind != 'archived')
+
+def default_filename(now=None):
+    return (now or datetime.now()).strftime("snapshot-%Y%m%d-%H%M%S.jsonl.gz")
+
+def _pin(staging):
+    # Hard-link every data file into staging while holding the lock. Writers replace
+    # files instead of rewriting them, so the links keep this exact version after the
+    # lock is released; the event log and archive are appended in place, so their
+    # lengths are noted.
+    with file_handler.data_lock(exclusive=False):
+        sharded = file_handler.is_sharded()
+        filenames = ['users.json', 'projects.json'] + file_handler.task_files()
+        pinned = {}
+        for filename in filenames + [file_handler.ARCHIVE_FILE, event_log.EVENTS_FILE]:
+            source = os.path.join(file_handler.data_dir(), filename)
+            target = os.path.join(staging, filename.replace('/', '%'))
+            try:
+                os.link(source, target)
+            except FileNotFoundError:
+                continue
+            except OSError:
+                # Filesystems without hard links get a copy instead
+                shutil.copyfile(source, target)
+            pinned[filename] = target
+        event_count = event_log.count_events()
+        manifest = file_handler.read_archive_manifest()
+        archive_size = manifest['size'] if manifest else 0
+    return sharded, pinned, event_count, archive_size
+
+def _iter_pinned(path):
+    if path is None:
+        return
+    with file_handler.open_data(path) as f:
+        yield from file_handler.iter_json_array(f)
+
+def create_snapshot(path):
+    file_handler.ensure_data_dir()
+    # Staged inside the data dir so hard links stay on one filesystem
+    staging = tempfile.mkdtemp(prefix='.snapshot-', dir=file_handler.data_dir())
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        sharded, pinned, event_count, archive_size = _pin(staging)
+        counts = dict.fromkeys(KINDS, 0)
+        next_ids = dict.fromkeys(COLLECTIONS, 1)
+        digest = hashlib.sha256()
+
+        with gzip.open(tmp_path, 'wb') as archive:
+            def write(entry):
+                line = json.dumps(entry, separators=(',', ':')).encode() + b'\n'
+                digest.update(line)
+                archive.write(line)
+
+            write({'format': FORMAT, 'version': VERSION,
+                   'created': datetime.now().isoformat(), 'sharded': sharded})
+
+            task_files = [name for name in pinned
+                          if name not in ('users.json', 'projects.json', file_handler.ARCHIVE_FILE, event_log.EVENTS_FILE)]
+            task_ids = set()
+            sources = [('users', ['users.json']), ('projects', ['projects.json']), ('tasks', task_files)]
+            for kind, filenames in sources:
+                for filename in filenames:
+                    if filename.endswith(file_handler.MANIFEST_FILE):
+                        with open(pinned[filename], 'r') as f:
+                            next_ids['tasks'] = max(next_ids['tasks'], json.load(f).get('next_task_id', 1))
+                        continue
+                    for record in _iter_pinned(pinned.get(filename)):
+                        write({'kind': kind, 'record': record})
+                        counts[kind] += 1
+                        next_ids[kind] = max(next_ids[kind], record['id'] + 1)
+                        if kind == 'tasks':
+                            task_ids.add(record['id'])
+
+            # Each task once: an interrupted archive pass can leave a task in both tiers
+            if file_handler.ARCHIVE_FILE in pinned:
+                for record in file_handler.iter_archive_records(pinned[file_handler.ARCHIVE_FILE], archive_size):
+                    if record['id'] in task_ids:
+                        continue
+                    task_ids.add(record['id'])
+                    write({'kind': 'archived', 'record': record})
+                    counts['archived'] += 1
+                    next_ids['tasks'] = max(next_ids['tasks'], record['id'] + 1)
+
+            for event in event_log.iter_events(stop=event_count, path=pinned.get(event_log.EVENTS_FILE)):
+                write({'kind': 'events', 'record': list(event)})
+                counts['events'] += 1
+
+            counts = _without_empty_archive(counts)
+            archive.write(json.dumps({'kind': 'end', 'counts': counts, 'next_ids': next_ids,
+                                      'sha256': digest.hexdigest()}).encode() + b'\n')
+        os.replace(tmp_path, path)
+        return counts
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def _check_record(kind, record, seen):
+    if kind == 'events':
+        if not isinstance(record, list) or len(record) != 5:
+            raise SnapshotError("Malformed event record.")
+        try:
+            event_log.RECORD.pack(*record)
+        except struct.error:
+            raise SnapshotError(f"Malformed event record: {record}.")
+        return
+    if not isinstance(record, dict) or any(field not in record for field in REQUIRED_FIELDS[kind]):
+        raise SnapshotError(f"Malformed {kind} record: {record}.")
+    if not isinstance(record['id'], int):
+        raise SnapshotError(f"Malformed {kind} id: {record['id']!r}.")
+    if record['id'] in seen[kind]:
+        raise SnapshotError(f"Duplicate {kind} id {record['id']}.")
+    seen[kind].add(record['id'])
+
+def read_archive(path):
+    # Yields the header, then (kind, record) pairs, validating as it goes. Raises
+    # SnapshotError if anything is malformed, so consumers must not commit anything
+    # until the generator is exhausted. Returns the trailer.
+    digest = hashlib.sha256()
+    counts = dict.fromkeys(KINDS, 0)
+    seen = {kind: set() for kind in COLLECTIONS + ('archived',)}
+    try:
+        with gzip.open(path, 'rb') as archive:
+            header = None
+            for line in archive:
+                entry = json.loads(line)
+                if header is None:
+                    if not isinstance(entry, dict) or entry.get('format') != FORMAT:
+                        raise SnapshotError(f"{path} is not a snapshot archive.")
+                    if entry.get('version') != VERSION:
+                        raise SnapshotError(f"Unsupported snapshot version: {entry.get('version')}.")
+                    header = entry
+                    digest.update(line)
+                    yield header
+                    continue
+
+                kind = entry.get('kind')
+                if kind == 'end':
+                    if entry.get('sha256') != digest.hexdigest():
+                        raise SnapshotError("Snapshot checksum mismatch; the archive is corrupt.")
+                    if entry.get('counts') != _without_empty_archive(counts):
+                        raise SnapshotError("Snapshot record counts don't match its trailer.")
+                    for collection in COLLECTIONS:
+                        if seen[collection] and max(seen[collection]) >= entry['next_ids'][collection]:
+                            raise SnapshotError(f"Snapshot id sequence for {collection} is behind its records.")
+                    if archive.read(1):
+                        raise SnapshotError("Unexpected data after the snapshot trailer.")
+                    return entry
+                if kind not in KINDS:
+                    raise SnapshotError(f"Unknown record kind: {kind!r}.")
+
+                digest.update(line)
+                _check_record(kind, entry.get('record'), seen)
+                counts[kind] += 1
+                yield kind, entry['record']
+    except FileNotFoundError:
+        raise SnapshotError(f"Snapshot '{path}' not found.")
+    except (OSError, EOFError, zlib.error, ValueError, KeyError, TypeError, AttributeError) as e:
+        raise SnapshotError(f"Snapshot '{path}' is unreadable: {e}")
+    raise SnapshotError("Snapshot is truncated (no trailer).")
+
+def verify_snapshot(path):
+    archive = read_archive(path)
+    try:
+        while True:
+            next(archive)
+    except StopIteration as stop:
+        return stop.value
+
+class _ArrayWriter:
+    # Streams records into a JSON array file in the same layout json.dump(indent=2) uses
+    def __init__(self, path):
+        self._stack = ExitStack()
+        self._file = self._stack.enter_context(file_handler.create_data(path))
+        self._file.write('[')
+        self._first = True
+
+    def write(self, record):
+        separator = '\n  ' if self._first else ',\n  '
+        self._file.write(separator + json.dumps(record, indent=2).replace('\n', '\n  '))
+        self._first = False
+
+    def close(self):
+        self._file.write(']' if self._first else '\n]')
+        self._stack.close()
+
+def _data_files():
+    return [f"{kind}.json" for kind in COLLECTIONS] + [file_handler.SHARD_DIR, file_handler.ARCHIVE_FILE,
+                                                       file_handler.ARCHIVE_MANIFEST, event_log.EVENTS_FILE]
+
+def _has_data():
+    return any(os.path.exists(os.path.join(file_handler.data_dir(), name)) for name in _data_files())
+
+def restore_snapshot(path, force=False):
+    file_handler.ensure_data_dir()
+    if not force and _has_data():
+        raise SnapshotError("The data directory is not empty; use --force to replace it.")
+
+    # Records are streamed into a staging directory and only swapped in once the
+    # whole archive has been validated
+    staging = tempfile.mkdtemp(prefix='.restore-', dir=file_handler.data_dir())
+    try:
+        writers = {kind: _ArrayWriter(os.path.join(staging, f"{kind}.json")) for kind in COLLECTIONS}
+        # Archived tasks are staged as plain lines, then appended to a fresh archive
+        archived_path = os.path.join(staging, ARCHIVED_STAGING)
+        with open(os.path.join(staging, event_log.EVENTS_FILE), 'wb') as events, \
+                open(archived_path, 'w') as archived:
+            archive = read_archive(path)
+            header = next(archive)
+            try:
+                while True:
+                    kind, record = next(archive)
+                    if kind == 'events':
+                        events.write(event_log.RECORD.pack(*record))
+                    elif kind == 'archived':
+                        archived.write(json.dumps(record) + "\n")
+                    else:
+                        writers[kind].write(record)
+            except StopIteration as stop:
+                trailer = stop.value
+            finally:
+                for writer in writers.values():
+                    writer.close()
+
+        with file_handler.data_lock():
+            _clear_data()
+            for filename in os.listdir(staging):
+                if filename != ARCHIVED_STAGING:
+                    os.replace(os.path.join(staging, filename), os.path.join(file_handler.data_dir(), filename))
+            if header.get('sharded'):
+                file_handler.shard_tasks(trailer['next_ids']['tasks'])
+            if trailer['counts'].get('archived'):
+                with open(archived_path, 'r') as archived:
+                    file_handler.append_archive(json.loads(line) for line in archived)
+        return trailer['counts']
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+def _clear_data():
+    for name in _data_files():
+        path = os.path.join(file_handler.data_dir(), name)
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        elif os.path.exists(path):
+            os.remove(path)
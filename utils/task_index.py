@@ -0,0 +1,162 @@
+# utils/task_index.py
+import json
+import mmap
+import os
+import struct
+from models.task import Task
+from utils import file_handler
+
+# Read-only, offset-indexed copy of the task store for querying large stores via mmap.
+#
+# tasks.dat holds one compact JSON record per line, grouped by project.
+# tasks.idx holds a header, then fixed-width entries sorted by (project_id, id),
+# then (id, entry position) pairs sorted by id for point lookups.
+DAT_FILE = 'tasks.dat'
+IDX_FILE = 'tasks.idx'
+
+_MAGIC = b'PMI1'
+_HEADER = struct.Struct('<4sIQQQQ')
+_ENTRY = struct.Struct('<QqQIB3x')
+_ID_ENTRY = struct.Struct('<QQ')
+_VERSION = 1
+_NO_PROJECT = -1
+
+class StaleIndexError(Exception):
+    pass
+
+def build_task_index():
+    file_handler.ensure_data_dir()
+    data_dir = file_handler.data_dir()
+    signature = file_handler.tasks_signature()
+    spill_path = os.path.join(data_dir, DAT_FILE + '.spill')
+    dat_tmp = os.path.join(data_dir, DAT_FILE + '.tmp')
+    idx_tmp = os.path.join(data_dir, IDX_FILE + '.tmp')
+
+    # Stream the tasks once into a scratch file; only the small entries stay in memory
+    entries = []
+    try:
+        with open(spill_path, 'wb') as spill:
+            offset = 0
+            for record in file_handler.iter_task_records():
+                line = (json.dumps(record, separators=(',', ':')) + '\n').encode('utf-8')
+                spill.write(line)
+                project_id = record.get('project_id')
+                entries.append((_NO_PROJECT if project_id is None else project_id, record['id'],
+                                Task.VALID_STATUSES.index(record['status']), offset, len(line)))
+                offset += len(line)
+
+        # Lay out tasks.dat in (project_id, id) order so a project's rows share pages
+        entries.sort()
+        with open(spill_path, 'rb') as spill, open(dat_tmp, 'wb') as dat, open(idx_tmp, 'wb') as idx:
+            idx.write(_HEADER.pack(_MAGIC, _VERSION, len(entries), *signature))
+            offset = 0
+            for project_id, task_id, status_code, spill_offset, length in entries:
+                spill.seek(spill_offset)
+                dat.write(spill.read(length))
+                idx.write(_ENTRY.pack(task_id, project_id, offset, length, status_code))
+                offset += length
+
+            by_id = sorted((entry[1], position) for position, entry in enumerate(entries))
+            for task_id, position in by_id:
+                idx.write(_ID_ENTRY.pack(task_id, position))
+    finally:
+        if os.path.exists(spill_path):
+            os.remove(spill_path)
+
+    os.replace(dat_tmp, os.path.join(data_dir, DAT_FILE))
+    os.replace(idx_tmp, os.path.join(data_dir, IDX_FILE))
+    return len(entries)
+
+class TaskIndex:
+    def __init__(self, check_fresh=True):
+        data_dir = file_handler.data_dir()
+        self._idx_file = open(os.path.join(data_dir, IDX_FILE), 'rb')
+        self._dat_file = open(os.path.join(data_dir, DAT_FILE), 'rb')
+        self._idx = mmap.mmap(self._idx_file.fileno(), 0, access=mmap.ACCESS_READ)
+        # An empty store has an empty tasks.dat, which mmap refuses
+        if os.fstat(self._dat_file.fileno()).st_size:
+            self._dat = mmap.mmap(self._dat_file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._dat = b''
+
+        magic, version, self._count, *signature = _HEADER.unpack_from(self._idx)
+        if magic != _MAGIC or version != _VERSION:
+            self.close()
+            raise ValueError("Not a task index file")
+        if check_fresh and tuple(signature) != file_handler.tasks_signature():
+            self.close()
+            raise StaleIndexError("Tasks changed since the index was built")
+
+        self._entries_start = _HEADER.size
+        self._ids_start = self._entries_start + self._count * _ENTRY.size
+
+    def close(self):
+        if isinstance(self._dat, mmap.mmap):
+            self._dat.close()
+        self._idx.close()
+        self._dat_file.close()
+        self._idx_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def _entry(self, position):
+        return _ENTRY.unpack_from(self._idx, self._entries_start + position * _ENTRY.size)
+
+    def _decode(self, entry):
+        _, _, offset, length, _ = entry
+        return Task.from_trusted_dict(json.loads(self._dat[offset:offset + length]))
+
+    def at(self, position):
+        # Task at a position in (project_id, id) order
+        if not 0 <= position < self._count:
+            raise IndexError("task index out of range")
+        return self._decode(self._entry(position))
+
+    def get(self, task_id):
+        low, high = 0, self._count
+        while low < high:
+            mid = (low + high) // 2
+            mid_id, position = _ID_ENTRY.unpack_from(self._idx, self._ids_start + mid * _ID_ENTRY.size)
+            if mid_id < task_id:
+                low = mid + 1
+            elif mid_id > task_id:
+                high = mid
+            else:
+                return self._decode(self._entry(position))
+        return None
+
+    def _first_position(self, project_id):
+        # Leftmost entry whose project_id is >= the one we want
+        low, high = 0, self._count
+        while low < high:
+            mid = (low + high) // 2
+            if self._entry(mid)[1] < project_id:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def find(self, project_id=None, status=None):
+        status_code = Task.VALID_STATUSES.index(status) if status is not None else None
+
+        if project_id is None:
+            positions = range(self._count)
+        else:
+            start = self._first_position(project_id)
+            end = start
+            while end < self._count and self._entry(end)[1] == project_id:
+                end += 1
+            positions = range(start, end)
+
+        # Status lives in the index entry, so non-matching rows are never decoded
+        for position in positions:
+            entry = self._entry(position)
+            if status_code is None or entry[4] == status_code:
+                yield self._decode(entry)
@@ -0,0 +1,178 @@
+# utils/validation.py
+import json
+from collections import Counter, deque
+from datetime import datetime
+from dateutil import parser
+
+from models.task import Task
+from utils import file_handler
+from utils.snapshot import REQUIRED_FIELDS
+
+# Whole-store consistency check for the `validate` command. Each collection is read
+# straight from its JSON once, then every rule is a single pass over one column with
+# set lookups, so the cost is linear in the size of the store and every violation is
+# collected instead of stopping at the first.
+
+def _violation(kind, record_id, field, problem):
+    return {'kind': kind, 'id': record_id, 'field': field, 'problem': problem}
+
+def _read(kind, records, violations):
+    # Well-formed records only; malformed ones are reported and left out of later rules
+    try:
+        records = list(records)
+    except FileNotFoundError:
+        return []
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        violations.append(_violation(kind, None, None, f"not valid JSON: {e}"))
+        return []
+    except (OSError, EOFError) as e:
+        # e.g. a damaged archive
+        violations.append(_violation(kind, None, None, f"unreadable: {e}"))
+        return []
+
+    kept = []
+    for record in records:
+        if not isinstance(record, dict):
+            violations.append(_violation(kind, None, None, "record is not an object"))
+            continue
+        missing = [field for field in REQUIRED_FIELDS[kind] if field not in record]
+        if missing:
+            violations.append(_violation(kind, record.get('id'), ", ".join(missing), "missing"))
+            continue
+        if type(record['id']) is not int:
+            violations.append(_violation(kind, record['id'], 'id', "not an integer"))
+            continue
+        kept.append(record)
+    return kept
+
+def _unique(kind, ids, violations):
+    for record_id, count in Counter(ids).items():
+        if count > 1:
+            violations.append(_violation(kind, record_id, 'id', f"used by {count} records"))
+
+def _non_empty(kind, ids, values, field, violations):
+    for record_id, value in zip(ids, values):
+        if not value or not isinstance(value, str):
+            violations.append(_violation(kind, record_id, field, "must be a non-empty string"))
+
+def _references(kind, ids, values, field, targets, target_kind, violations, optional=False):
+    for record_id, value in zip(ids, values):
+        if value is None and optional:
+            continue
+        if not isinstance(value, int) or value not in targets:
+            violations.append(_violation(kind, record_id, field, f"unknown {target_kind} {value!r}"))
+
+def _list_references(kind, ids, lists, field, targets, target_kind, violations):
+    for record_id, values in zip(ids, lists):
+        if not isinstance(values, list):
+            violations.append(_violation(kind, record_id, field, "must be a list"))
+            continue
+        for value in values:
+            if not isinstance(value, int) or value not in targets:
+                violations.append(_violation(kind, record_id, field, f"unknown {target_kind} {value!r}"))
+
+def _parse_date(value):
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return parser.parse(value)
+
+def _cycle_members(task_ids, depends_on):
+    # Tasks left after peeling off everything with no open dependency (forwards) and
+    # everything nothing depends on (backwards) are exactly those on a cycle
+    known = set(task_ids)
+    edges = {task_id: [dependency_id for dependency_id in deps if isinstance(dependency_id, int) and dependency_id in known]
+             for task_id, deps in zip(task_ids, depends_on) if isinstance(deps, list)}
+    remaining = set(edges)
+    for forward in (True, False):
+        degree = dict.fromkeys(remaining, 0)
+        followers = {task_id: [] for task_id in remaining}
+        for task_id in remaining:
+            for dependency_id in edges[task_id]:
+                if dependency_id in remaining:
+                    if forward:
+                        degree[task_id] += 1
+                        followers[dependency_id].append(task_id)
+                    else:
+                        degree[dependency_id] += 1
+                        followers[task_id].append(dependency_id)
+        queue = deque(task_id for task_id, count in degree.items() if count == 0)
+        while queue:
+            current = queue.popleft()
+            remaining.discard(current)
+            for follower in followers[current]:
+                degree[follower] -= 1
+                if degree[follower] == 0:
+                    queue.append(follower)
+    return remaining
+
+def validate_store():
+    violations = []
+    users = _read('users', file_handler.iter_records('users.json'), violations)
+    projects = _read('projects', file_handler.iter_records('projects.json'), violations)
+    tasks = _read('tasks', file_handler.iter_task_records(), violations)
+
+    user_ids = [user['id'] for user in users]
+    project_ids = [project['id'] for project in projects]
+    task_ids = [task['id'] for task in tasks]
+    # Archived tasks are no longer checked, but projects and dependencies may still name them
+    archived_records = _read('archived', file_handler.iter_archive_records(), violations)
+    archived = {record['id']: record['project_id'] for record in archived_records}
+    known_users, known_projects, known_tasks = set(user_ids), set(project_ids), set(task_ids) | set(archived)
+
+    # Users
+    _unique('users', user_ids, violations)
+    names = [user['name'] for user in users]
+    _non_empty('users', user_ids, names, 'name', violations)
+    for name, count in Counter(name.lower() for name in names if isinstance(name, str)).items():
+        if count > 1:
+            violations.append(_violation('users', None, 'name', f"'{name}' is used by {count} users"))
+    for user_id, email in zip(user_ids, (user['email'] for user in users)):
+        if not isinstance(email, str) or '@' not in email:
+            violations.append(_violation('users', user_id, 'email', "not a valid email address"))
+    _list_references('users', user_ids, [user['projects'] for user in users], 'projects',
+                     known_projects, 'project', violations)
+
+    # Projects
+    _unique('projects', project_ids, violations)
+    _non_empty('projects', project_ids, [project['title'] for project in projects], 'title', violations)
+    for project_id, due_date in zip(project_ids, (project['due_date'] for project in projects)):
+        try:
+            _parse_date(due_date)
+        except (TypeError, ValueError, OverflowError):
+            violations.append(_violation('projects', project_id, 'due_date', f"invalid date {due_date!r}"))
+    _references('projects', project_ids, [project['user_id'] for project in projects], 'user_id',
+                known_users, 'user', violations)
+    project_of = dict(archived)
+    project_of.update(zip(task_ids, (task['project_id'] for task in tasks)))
+    for project_id, listed in zip(project_ids, (project['tasks'] for project in projects)):
+        if not isinstance(listed, list):
+            violations.append(_violation('projects', project_id, 'tasks', "must be a list"))
+            continue
+        for task_id in listed:
+            if not isinstance(task_id, int) or task_id not in known_tasks:
+                violations.append(_violation('projects', project_id, 'tasks', f"unknown task {task_id!r}"))
+            elif project_of[task_id] != project_id:
+                violations.append(_violation('projects', project_id, 'tasks',
+                                             f"task {task_id} belongs to project {project_of[task_id]}"))
+
+    # Tasks
+    _unique('tasks', task_ids, violations)
+    _non_empty('tasks', task_ids, [task['title'] for task in tasks], 'title', violations)
+    valid_statuses = set(Task.VALID_STATUSES)
+    for task_id, status in zip(task_ids, (task['status'] for task in tasks)):
+        if not isinstance(status, str) or status not in valid_statuses:
+            violations.append(_violation('tasks', task_id, 'status', f"invalid status {status!r}"))
+    _references('tasks', task_ids, [task['project_id'] for task in tasks], 'project_id',
+                known_projects, 'project', violations, optional=True)
+    _references('tasks', task_ids, [task['assigned_to'] for task in tasks], 'assigned_to',
+                known_users, 'user', violations, optional=True)
+    depends_on = [task.get('depends_on', []) for task in tasks]
+    _list_references('tasks', task_ids, depends_on, 'depends_on', known_tasks, 'task', violations)
+    for task_id in sorted(_cycle_members(task_ids, depends_on)):
+        violations.append(_violation('tasks', task_id, 'depends_on', "part of a dependency cycle"))
+
+    checked = {'users': len(users), 'projects': len(projects), 'tasks': len(tasks)}
+    if archived:
+        checked['archived'] = len(archived)
+    return {'checked': checked, 'violations': violations}
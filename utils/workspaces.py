@@ -0,0 +1,75 @@
+# utils/workspaces.py
+import threading
+from collections import OrderedDict
+
+from utils import file_handler
+from utils.repository import Repository
+
+class WorkspacePool:
+    # Bounded LRU of open workspaces for daemons and library use.
+    #
+    # Switching back to a recently used workspace reuses its in-memory Repository
+    # (loaded collections and indexes) instead of re-reading it, unless another process
+    # has changed its files since. When the pool is full the least recently used
+    # workspace is flushed and dropped. The pool itself is thread-safe; a Repository
+    # is not, so callers still serialize work within one workspace.
+
+    def __init__(self, capacity=8):
+        if capacity < 1:
+            raise ValueError("Pool capacity must be at least 1.")
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._open = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._open)
+
+    def __contains__(self, name):
+        return file_handler.check_workspace(name) in self._open
+
+    def get(self, name=None):
+        name = file_handler.check_workspace(name or file_handler.current_workspace())
+        with self._lock:
+            repo = self._open.get(name)
+            # Unsaved changes win over a reload; they'll overwrite on the next flush anyway
+            if repo is not None and (repo.dirty or repo.is_current()):
+                self._open.move_to_end(name)
+                self.hits += 1
+                return repo
+
+            self.misses += 1
+            repo = Repository(name)
+            self._open[name] = repo
+            self._open.move_to_end(name)
+            while len(self._open) > self.capacity:
+                oldest = next(iter(self._open.values()))
+                if oldest.dirty:
+                    oldest.commit()
+                self._open.popitem(last=False)
+            return repo
+
+    def flush(self):
+        # Every workspace gets its write; the first failure is raised afterwards. Returns
+        # the errors of automatic archive passes, which don't fail a write.
+        error = None
+        archive_errors = []
+        with self._lock:
+            for repo in self._open.values():
+                if repo.dirty:
+                    try:
+                        repo.commit()
+                    except Exception as e:
+                        error = error or e
+                    else:
+                        if repo.archive_error is not None:
+                            archive_errors.append(repo.archive_error)
+        if error is not None:
+            raise error
+        return archive_errors
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._open.clear()